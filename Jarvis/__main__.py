@@ -0,0 +1,7 @@
+"""Allow running Jarvis with python -m Jarvis."""
+
+from .jarvis import main
+
+
+if __name__ == "__main__":
+    main()
@@ -2,167 +2,447 @@
 
 import os
 import json
-from typing import List, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterator, Optional, Set
 from datetime import datetime
+from .cancellation import CancellationToken, OperationCancelled
 from .config import config
-from .utils import load_json, save_json
+from .database import get_database
+from .journal import Journal
+from .providers import (
+    CircuitBreaker, GeminiProvider, LocalProvider, OpenAIProvider, ProviderError, ProviderPool, TokenBucket
+)
+from .response_cache import create_response_cache
+from .tracing import tracer
+from .utils import load_json, save_json, iter_sentences, LazyObject
+
+SYSTEM_PROMPT = 'You are Jarvis, a helpful and friendly AI voice assistant. Provide concise, natural responses suitable for voice interaction. Keep responses brief (2-3 sentences) unless more detail is requested.'
+SUMMARY_PROMPT = 'Summarize the conversation below between a user and Jarvis, their voice assistant, in a few sentences. Start from the existing summary if there is one. Keep names, facts, preferences and unfinished requests; drop small talk.'
+
+# llama.cpp's llama-server; used in offline mode when no local server is configured
+DEFAULT_LOCAL_URL = 'http://127.0.0.1:8080/v1'
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, otherwise estimate them."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
 
 
 class AIEngine:
     """Manages AI-powered conversations."""
     
-    HISTORY_FILE = os.path.join(os.path.dirname(__file__), "data", "conversation_history.json")
-    MAX_HISTORY = 10  # Keep last 10 exchanges for context
+    HISTORY_FILE = os.path.join(os.path.dirname(__file__), "data", "conversation_history.jsonl")
+    LEGACY_HISTORY_FILE = os.path.join(os.path.dirname(__file__), "data", "conversation_history.json")
+    SUMMARY_FILE = os.path.join(os.path.dirname(__file__), "data", "conversation_summary.json")
+    MAX_HISTORY = 50  # Most exchanges read back at startup; the token budget decides what is sent
+    MESSAGE_OVERHEAD_TOKENS = 4  # Role and separators per chat message
+    # Settings baked into the provider clients; the rest are read per request
+    PROVIDER_SETTINGS = {
+        'providers', 'model', 'gemini_model', 'openai_base_url', 'gemini_endpoint', 'local_base_url',
+        'local_model', 'local_timeout', 'request_timeout', 'hedge_after_seconds', 'breaker_failures',
+        'breaker_reset_seconds', 'requests_per_minute', 'rate_burst'
+    }
     
     def __init__(self):
         """Initialize AI engine."""
+        database = get_database()
+        if database is not None:
+            self.history_journal = database.turns(keep_records=self.MAX_HISTORY * 4)
+        else:
+            self.history_journal = Journal(self.HISTORY_FILE, keep_records=self.MAX_HISTORY * 4)
+        # Running summary of turns that no longer fit the context budget
+        self.summary = load_json(self.SUMMARY_FILE, {'text': '', 'until': ''})
         self.conversation_history = self._load_history()
-        self.ai_client = None
-        self.ai_type = None
+        self._pending_summary: List[Dict[str, str]] = []
+        self._summary_lock = threading.Lock()
+        self._summarizing = False
+        self._history_epoch = 0  # Bumped by clear_history to discard summaries in flight
+        self.response_cache = create_response_cache()
+        self.providers: Optional[ProviderPool] = None
         self._initialize_ai()
+        self._fit_context()
+        config.subscribe(self._on_config_change, 'ai_settings', 'features.offline_mode', 'api_keys',
+                         'response_cache')
+    
+    def _on_config_change(self, changed: Set[str]):
+        """Rebuild the provider clients or the response cache if their settings changed.
+        
+        Requests already in flight finish on the old clients.
+        """
+        if any(key.startswith('response_cache.') for key in changed):
+            self.response_cache = create_response_cache()
+        if any(self._affects_providers(key) for key in changed):
+            self._initialize_ai()
+    
+    def _affects_providers(self, key: str) -> bool:
+        """Check if a changed config key requires new provider clients."""
+        section, _, name = key.partition('.')
+        if section == 'ai_settings':
+            return name.split('.')[0] in self.PROVIDER_SETTINGS
+        return section in ('features', 'api_keys')
     
     def _initialize_ai(self):
-        """Initialize AI client based on available API keys."""
-        # Try OpenAI first
-        if config.has_api_key('openai'):
-            try:
-                from openai import OpenAI
-                self.ai_client = OpenAI(api_key=config.get_api_key('openai'))
-                self.ai_type = 'openai'
-                return
-            except ImportError:
-                print("OpenAI library not installed. Install with: pip install openai")
+        """Create a client for every usable provider, in preference order.
         
-        # Try Google Gemini
-        if config.has_api_key('gemini'):
+        In offline mode only the local server is used; otherwise it is the
+        last resort when the cloud providers are unreachable, and only if
+        ai_settings.local_base_url is set.
+        """
+        timeout = config.get('ai_settings.request_timeout', 20)
+        names = config.get('ai_settings.providers', ['openai', 'gemini', 'local'])
+        local_url = config.get('ai_settings.local_base_url', '')
+        if config.get('features.offline_mode', False):
+            names = ['local']
+            local_url = local_url or DEFAULT_LOCAL_URL
+        
+        providers = []
+        for name in names:
+            if name == 'local':
+                if not local_url:
+                    continue
+            elif not config.has_api_key(name):
+                continue
+            breaker = CircuitBreaker(
+                failure_threshold=config.get('ai_settings.breaker_failures', 3),
+                reset_timeout=config.get('ai_settings.breaker_reset_seconds', 30)
+            )
             try:
-                import google.generativeai as genai
-                genai.configure(api_key=config.get_api_key('gemini'))
-                self.ai_client = genai.GenerativeModel('gemini-pro')
-                self.ai_type = 'gemini'
-                return
+                if name == 'openai':
+                    provider = OpenAIProvider(
+                        config.get_api_key('openai'),
+                        model=config.get('ai_settings.model', 'gpt-3.5-turbo'),
+                        base_url=config.get('ai_settings.openai_base_url', ''),
+                        timeout=timeout, breaker=breaker
+                    )
+                elif name == 'local':
+                    provider = LocalProvider(
+                        base_url=local_url,
+                        model=config.get('ai_settings.local_model', 'local'),
+                        timeout=config.get('ai_settings.local_timeout', 60),
+                        breaker=breaker
+                    )
+                elif name == 'gemini':
+                    provider = GeminiProvider(
+                        config.get_api_key('gemini'),
+                        model=config.get('ai_settings.gemini_model', 'gemini-pro'),
+                        endpoint=config.get('ai_settings.gemini_endpoint', ''),
+                        timeout=timeout, breaker=breaker
+                    )
+                else:
+                    continue
             except ImportError:
-                print("Google Generative AI library not installed. Install with: pip install google-generativeai")
+                if name in ('openai', 'local'):
+                    print("OpenAI library not installed. Install with: pip install openai")
+                else:
+                    print("Google Generative AI library not installed. Install with: pip install google-generativeai")
+                continue
+            
+            per_minute = config.get('ai_settings.requests_per_minute', {}).get(name)
+            if per_minute:
+                provider.limiter = TokenBucket(per_minute / 60, config.get('ai_settings.rate_burst', 5))
+            providers.append(provider)
         
-        print("No AI API keys configured. AI features will be limited.")
+        if providers:
+            self.providers = ProviderPool(providers, hedge_after=config.get('ai_settings.hedge_after_seconds'))
+        else:
+            self.providers = None
+            print("No AI API keys configured. AI features will be limited.")
     
-    def _load_history(self) -> List[Dict[str, str]]:
-        """Load conversation history."""
-        history = load_json(self.HISTORY_FILE, [])
-        return history[-self.MAX_HISTORY:] if history else []
+    @property
+    def ai_type(self) -> Optional[str]:
+        """Name of the provider currently preferred."""
+        primary = self.providers.primary if self.providers else None
+        return primary.name if primary else None
     
-    def _save_history(self):
-        """Save conversation history."""
-        save_json(self.HISTORY_FILE, self.conversation_history)
+    def _load_history(self) -> List[Dict[str, str]]:
+        """Load the most recent conversation history."""
+        if os.path.exists(self.LEGACY_HISTORY_FILE) and not os.path.exists(self.HISTORY_FILE):
+            # One-time migration from the old rewrite-everything JSON file
+            legacy = load_json(self.LEGACY_HISTORY_FILE, [])
+            if not legacy or self.history_journal.append(*legacy):
+                os.remove(self.LEGACY_HISTORY_FILE)
+        until = self.summary.get('until', '')
+        return [msg for msg in self.history_journal.tail(self.MAX_HISTORY * 2)
+                if msg.get('timestamp', '') > until]
     
     def add_to_history(self, role: str, content: str):
         """Add message to conversation history."""
-        self.conversation_history.append({
-            'role': role,
-            'content': content,
-            'timestamp': datetime.now().isoformat()
-        })
-        # Keep only last MAX_HISTORY exchanges
-        if len(self.conversation_history) > self.MAX_HISTORY * 2:
-            self.conversation_history = self.conversation_history[-self.MAX_HISTORY * 2:]
-        self._save_history()
+        self.add_messages({'role': role, 'content': content})
+    
+    def add_exchange(self, user_input: str, response: str):
+        """Add a user message and the assistant's reply with a single append."""
+        self.add_messages({'role': 'user', 'content': user_input},
+                          {'role': 'assistant', 'content': response})
+    
+    def add_messages(self, *messages: Dict[str, str]):
+        """Append messages to the history journal and the in-memory context."""
+        timestamp = datetime.now().isoformat()
+        messages = [dict(message, timestamp=timestamp) for message in messages]
+        self.conversation_history.extend(messages)
+        self.history_journal.append(*messages)
+        self._fit_context()
     
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
-        self._save_history()
+        with self._summary_lock:
+            self.conversation_history = []
+            self._pending_summary = []
+            self._history_epoch += 1
+            self.summary = {'text': '', 'until': ''}
+        self.history_journal.clear()
+        save_json(self.SUMMARY_FILE, self.summary, compact=True)
+    
+    def _message_tokens(self, message: Dict[str, str]) -> int:
+        """Tokens a history message adds to the prompt."""
+        return count_tokens(message['content']) + self.MESSAGE_OVERHEAD_TOKENS
     
-    def get_ai_response(self, user_input: str, use_history: bool = True) -> Optional[str]:
-        """Get AI-generated response."""
-        if not self.ai_client or not config.get('features.ai_enabled', True):
+    def _fit_context(self):
+        """Move the oldest turns out of the context until it fits the token budget.
+        
+        The budget (ai_settings.context_tokens) covers the running summary and
+        the verbatim history. Turns that are moved out are folded into the
+        summary in the background; the latest exchange is always kept.
+        """
+        budget = config.get('ai_settings.context_tokens', 1000) - count_tokens(self.summary.get('text', ''))
+        history = self.conversation_history
+        total = sum(self._message_tokens(msg) for msg in history)
+        overflow = []
+        while len(history) > 2 and total > budget:
+            # Messages of one exchange share a timestamp and leave together
+            timestamp = history[0].get('timestamp')
+            while len(history) > 2 and history[0].get('timestamp') == timestamp:
+                message = history.pop(0)
+                total -= self._message_tokens(message)
+                overflow.append(message)
+        
+        if overflow and self.providers:
+            with self._summary_lock:
+                self._pending_summary.extend(overflow)
+                if self._summarizing:
+                    return
+                self._summarizing = True
+            threading.Thread(target=self._update_summary, name="jarvis-summary", daemon=True).start()
+    
+    def _update_summary(self):
+        """Fold pending turns into the running summary until none are left.
+        
+        If the summary cannot be made, the turns stay pending and are retried
+        with the next ones that leave the context.
+        """
+        while True:
+            with self._summary_lock:
+                pending = self._pending_summary
+                self._pending_summary = []
+                if not pending:
+                    self._summarizing = False
+                    return
+                previous = self.summary.get('text', '')
+                epoch = self._history_epoch
+            
+            transcript = "\n".join(
+                f"{'User' if msg['role'] == 'user' else 'Jarvis'}: {msg['content']}" for msg in pending
+            )
+            if previous:
+                transcript = f"Existing summary: {previous}\n\n{transcript}"
+            try:
+                with tracer.span('ai.summary'):
+                    text = self._complete(SUMMARY_PROMPT, transcript,
+                                          config.get('ai_settings.summary_tokens', 150))
+            except Exception as e:
+                print(f"Error summarizing conversation: {e}")
+                text = None
+            
+            with self._summary_lock:
+                if epoch != self._history_epoch:
+                    # History was cleared meanwhile
+                    continue
+                if not text:
+                    self._pending_summary = pending + self._pending_summary
+                    self._summarizing = False
+                    return
+                self.summary = {'text': text.strip(), 'until': pending[-1].get('timestamp', '')}
+                save_json(self.SUMMARY_FILE, self.summary, compact=True)
+    
+    def _complete(self, instructions: str, text: str, max_tokens: int) -> Optional[str]:
+        """Run a one-off completion without conversation context."""
+        messages = [{'role': 'system', 'content': instructions}, {'role': 'user', 'content': text}]
+        _, response = self.providers.complete(messages, max_tokens, 0.3)
+        return response
+    
+    def get_ai_response(self, user_input: str, use_history: bool = True,
+                        token: Optional[CancellationToken] = None) -> Optional[str]:
+        """Get AI-generated response.
+        
+        Raises OperationCancelled if token is cancelled before the answer
+        arrives; the query is then left out of the history.
+        """
+        if not self.is_available():
             return None
         
+        cached = self._get_cached_response(user_input)
+        if cached:
+            return cached
+        
+        settings = config.snapshot.ai_settings
         try:
-            if self.ai_type == 'openai':
-                return self._get_openai_response(user_input, use_history)
-            elif self.ai_type == 'gemini':
-                return self._get_gemini_response(user_input, use_history)
-        except Exception as e:
+            with tracer.span('ai.response'):
+                _, response = self.providers.complete(
+                    self._build_messages(user_input, use_history),
+                    settings.max_tokens,
+                    settings.temperature,
+                    token=token
+                )
+        except ProviderError as e:
             print(f"Error getting AI response: {e}")
             return None
+        
+        if response:
+            self.add_exchange(user_input, response)
+        if response and self.response_cache and self.response_cache.is_cacheable(user_input):
+            self.response_cache.set(user_input, response)
+        return response
     
-    def _get_openai_response(self, user_input: str, use_history: bool) -> Optional[str]:
-        """Get response from OpenAI GPT."""
-        try:
-            messages = []
-            
-            # Add system message
-            messages.append({
-                'role': 'system',
-                'content': 'You are Jarvis, a helpful and friendly AI voice assistant. Provide concise, natural responses suitable for voice interaction. Keep responses brief (2-3 sentences) unless more detail is requested.'
-            })
-            
-            # Add conversation history if enabled
-            if use_history:
-                for msg in self.conversation_history:
-                    if msg['role'] in ['user', 'assistant']:
-                        messages.append({
-                            'role': msg['role'],
-                            'content': msg['content']
-                        })
-            
-            # Add current user input
-            messages.append({
-                'role': 'user',
-                'content': user_input
-            })
-            
-            # Get response from OpenAI (v1.x API)
-            response = self.ai_client.chat.completions.create(
-                model=config.get('ai_settings.model', 'gpt-3.5-turbo'),
-                messages=messages,
-                max_tokens=config.get('ai_settings.max_tokens', 150),
-                temperature=config.get('ai_settings.temperature', 0.7)
-            )
-            
-            ai_response = response.choices[0].message.content.strip()
-            
-            # Add to history
-            self.add_to_history('user', user_input)
-            self.add_to_history('assistant', ai_response)
-            
-            return ai_response
-        except Exception as e:
-            print(f"OpenAI error: {e}")
+    def _get_cached_response(self, user_input: str) -> Optional[str]:
+        """Answer from the response cache, recording the exchange in the history."""
+        if not self.response_cache or not self.response_cache.is_cacheable(user_input):
             return None
+        with tracer.span('ai.cache'):
+            cached = self.response_cache.get(user_input)
+        if cached:
+            self.add_exchange(user_input, cached)
+        return cached
     
-    def _get_gemini_response(self, user_input: str, use_history: bool) -> Optional[str]:
-        """Get response from Google Gemini."""
+    def stream_ai_response(self, user_input: str, use_history: bool = True,
+                           token: Optional[CancellationToken] = None) -> Iterator[str]:
+        """Yield the AI response one complete sentence at a time as it is generated.
+        
+        The full response is added to the history once the stream ends. A
+        provider error ends the stream early; nothing is yielded if it fails
+        before the first sentence. Cancelling token closes the stream and
+        raises OperationCancelled, leaving the exchange out of the history.
+        """
+        if not self.is_available():
+            return
+        
+        cached = self._get_cached_response(user_input)
+        if cached:
+            yield from iter_sentences([cached])
+            return
+        
+        settings = config.snapshot.ai_settings
+        chunks = self.providers.stream(
+            self._build_messages(user_input, use_history),
+            settings.max_tokens,
+            settings.temperature,
+            token=token
+        )
+        
+        sentences = []
+        complete = False
+        start = time.perf_counter()
         try:
-            # Build prompt with context
-            prompt = "You are Jarvis, a helpful and friendly AI voice assistant. Provide concise, natural responses suitable for voice interaction. Keep responses brief (2-3 sentences) unless more detail is requested.\n\n"
-            
-            # Add conversation history if enabled
-            if use_history:
-                for msg in self.conversation_history:
-                    role = "User" if msg['role'] == 'user' else "Assistant"
-                    prompt += f"{role}: {msg['content']}\n"
-            
-            # Add current user input
-            prompt += f"User: {user_input}\nAssistant:"
-            
-            # Get response from Gemini
-            response = self.ai_client.generate_content(prompt)
-            ai_response = response.text.strip()
-            
-            # Add to history
-            self.add_to_history('user', user_input)
-            self.add_to_history('assistant', ai_response)
-            
-            return ai_response
+            for sentence in iter_sentences(chunks):
+                if not sentences:
+                    tracer.record('ai.first_sentence', time.perf_counter() - start)
+                if token:
+                    token.raise_if_cancelled()
+                sentences.append(sentence)
+                yield sentence
+            complete = True
+        except OperationCancelled:
+            raise
         except Exception as e:
-            print(f"Gemini error: {e}")
-            return None
+            print(f"Error streaming AI response: {e}")
+        finally:
+            tracer.record('ai.response', time.perf_counter() - start)
+        
+        if sentences:
+            response = " ".join(sentences)
+            self.add_exchange(user_input, response)
+            # A response cut short by an error is not worth repeating
+            if complete and self.response_cache and self.response_cache.is_cacheable(user_input):
+                self.response_cache.set(user_input, response)
+    
+    def get_bulk_responses(self, prompts: List[str], max_workers: Optional[int] = None,
+                           token: Optional[CancellationToken] = None) -> List[Dict[str, Optional[str]]]:
+        """Answer many independent prompts concurrently.
+        
+        Prompts are sent without the conversation history and their answers
+        are neither recorded nor cached. Requests go through the same
+        failover and per-provider rate limits as interactive queries.
+        Returns one {'prompt', 'response', 'error'} dict per prompt, in
+        order; a failed prompt has response None and the error message.
+        """
+        if not self.is_available():
+            return [{'prompt': prompt, 'response': None, 'error': 'AI is not available'} for prompt in prompts]
+        
+        settings = config.snapshot.ai_settings
+        max_tokens, temperature = settings.max_tokens, settings.temperature
+        
+        def answer(prompt: str) -> Dict[str, Optional[str]]:
+            try:
+                _, response = self.providers.complete(
+                    self._build_messages(prompt, use_history=False), max_tokens, temperature, token=token
+                )
+                return {'prompt': prompt, 'response': response, 'error': None}
+            except OperationCancelled:
+                return {'prompt': prompt, 'response': None, 'error': 'cancelled'}
+            except Exception as e:
+                return {'prompt': prompt, 'response': None, 'error': str(e) or type(e).__name__}
+        
+        workers = max_workers or config.get('ai_settings.bulk_concurrency', 8)
+        with tracer.span('ai.bulk'), ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jarvis-bulk") as executor:
+            return list(executor.map(answer, prompts))
+    
+    def _build_messages(self, user_input: str, use_history: bool) -> List[Dict[str, str]]:
+        """Build the chat message list sent to every provider."""
+        messages = []
+        
+        # Add system message
+        messages.append({
+            'role': 'system',
+            'content': SYSTEM_PROMPT
+        })
+        
+        # Add conversation history if enabled
+        if use_history:
+            if self.summary.get('text'):
+                messages.append({
+                    'role': 'system',
+                    'content': f"Summary of the earlier conversation: {self.summary['text']}"
+                })
+            for msg in list(self.conversation_history):
+                if msg['role'] in ['user', 'assistant']:
+                    messages.append({
+                        'role': msg['role'],
+                        'content': msg['content']
+                    })
+        
+        # Add current user input
+        messages.append({
+            'role': 'user',
+            'content': user_input
+        })
+        return messages
     
     def is_available(self) -> bool:
         """Check if AI is available."""
-        return self.ai_client is not None and config.get('features.ai_enabled', True)
+        return self.providers is not None and config.get('features.ai_enabled', True)
 
 
-# Global AI engine instance
-ai_engine = AIEngine()
+# Global AI engine instance (client is created on first use)
+ai_engine = LazyObject(AIEngine)
@@ -0,0 +1,210 @@
+"""Continuous microphone capture with adaptive noise-floor tracking."""
+
+import array
+import collections
+import operator
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Optional
+import speech_recognition as sr
+
+_TYPECODES = {1: 'b', 2: 'h', 4: 'i'}
+
+
+def rms(buffer: bytes, sample_width: int) -> int:
+    """Root mean square of signed little-endian PCM samples, like audioop.rms.
+    
+    audioop is deprecated and gone in Python 3.13, so the samples are
+    unpacked with the array module instead.
+    """
+    usable = len(buffer) - len(buffer) % sample_width
+    if not usable:
+        return 0
+    typecode = _TYPECODES.get(sample_width)
+    if typecode is None:
+        # 24-bit audio has no array type
+        samples = [int.from_bytes(buffer[i:i + sample_width], 'little', signed=True)
+                   for i in range(0, usable, sample_width)]
+    else:
+        samples = array.array(typecode, buffer[:usable])
+        if sys.byteorder == 'big':
+            samples.byteswap()
+    return int((sum(map(operator.mul, samples, samples)) / len(samples)) ** 0.5)
+
+
+class ContinuousListener:
+    """Keeps one microphone stream open and segments it into phrases.
+
+    The stream is calibrated once at start. After that, unless the
+    recognizer's dynamic_energy_threshold is off, every buffer that is not
+    part of a phrase updates its energy threshold, so the noise floor
+    follows the room without the fixed dead time of calling
+    adjust_for_ambient_noise before each command.
+
+    on_speech_start, if set, is called from the capture thread once a
+    phrase has had phrase_threshold seconds of speech, i.e. as soon as the
+    user is clearly talking and well before the phrase is complete.
+
+    There is no echo cancellation, so on loudspeakers the microphone hears
+    Jarvis's own voice. While is_playing() returns True the threshold is
+    multiplied by playback_factor and the noise floor is left alone: only
+    speech clearly louder than the playback starts a phrase.
+
+    If reading the stream fails the capture thread ends, keeping the
+    exception in error; get_audio() then returns None and is_running() is
+    False, so callers can fall back to opening the microphone per command.
+    """
+
+    def __init__(self, recognizer: sr.Recognizer, pause_threshold: float = 1.0,
+                 phrase_time_limit: float = 10, calibration_duration: float = 1.0,
+                 max_pending: int = 2, on_speech_start: Optional[Callable[[], None]] = None,
+                 is_playing: Optional[Callable[[], bool]] = None, playback_factor: float = 3.0):
+        """Initialize listener (the microphone is opened by start())."""
+        self.recognizer = recognizer
+        self.pause_threshold = pause_threshold
+        self.phrase_time_limit = phrase_time_limit
+        self.calibration_duration = calibration_duration
+        self.phrases = queue.Queue(maxsize=max_pending)
+        self.on_speech_start = on_speech_start
+        self.is_playing = is_playing
+        self.playback_factor = playback_factor
+        self.error: Optional[Exception] = None
+        self._microphone = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def energy_threshold(self) -> float:
+        """Current calibrated energy threshold."""
+        return self.recognizer.energy_threshold
+
+    def is_running(self) -> bool:
+        """Check if the capture thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Open the microphone, calibrate once and start capturing."""
+        if self.is_running():
+            return
+        microphone = sr.Microphone()
+        source = microphone.__enter__()
+        try:
+            self.recognizer.adjust_for_ambient_noise(source, duration=self.calibration_duration)
+        except Exception:
+            microphone.__exit__(None, None, None)
+            raise
+        self._microphone = microphone
+        self.error = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._capture_loop, args=(source,),
+                                        name="jarvis-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop capturing and close the microphone."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._microphone:
+            self._microphone.__exit__(None, None, None)
+            self._microphone = None
+
+    def get_audio(self, timeout: Optional[float] = None) -> Optional[sr.AudioData]:
+        """Return the next captured phrase, or None if nothing arrives in time.
+        
+        Returns early once the capture thread has stopped.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = 0.5 if deadline is None else max(0.0, min(0.5, deadline - time.monotonic()))
+            try:
+                return self.phrases.get(timeout=wait)
+            except queue.Empty:
+                if not self.is_running() or (deadline is not None and time.monotonic() >= deadline):
+                    return None
+
+    def discard_pending(self):
+        """Drop phrases captured earlier (e.g. while Jarvis was speaking)."""
+        while True:
+            try:
+                self.phrases.get_nowait()
+            except queue.Empty:
+                return
+
+    def _capture_loop(self, source):
+        """Read buffers, track the noise floor and emit complete phrases."""
+        recognizer = self.recognizer
+        seconds_per_buffer = float(source.CHUNK) / source.SAMPLE_RATE
+        pause_buffers = int(self.pause_threshold / seconds_per_buffer) + 1
+        phrase_buffers = int(recognizer.phrase_threshold / seconds_per_buffer) + 1
+        limit_buffers = int(self.phrase_time_limit / seconds_per_buffer) if self.phrase_time_limit else None
+        # Keep a little audio from before the onset so first syllables aren't clipped
+        preroll = collections.deque(maxlen=int(recognizer.non_speaking_duration / seconds_per_buffer) + 1)
+        damping = recognizer.dynamic_energy_adjustment_damping ** seconds_per_buffer
+
+        frames = None
+        pause_count = 0
+        voiced_count = 0
+        while not self._stop.is_set():
+            try:
+                buffer = source.stream.read(source.CHUNK)
+            except Exception as e:
+                if not self._stop.is_set():
+                    # Microphone unplugged, driver error...
+                    self.error = e
+                    print(f"Error reading microphone: {e}")
+                return
+            if not buffer:
+                continue
+            energy = rms(buffer, source.SAMPLE_WIDTH)
+            playing = self.is_playing is not None and self.is_playing()
+            threshold = recognizer.energy_threshold * (self.playback_factor if playing else 1)
+
+            if frames is None:
+                if energy > threshold:
+                    frames = list(preroll)
+                    frames.append(buffer)
+                    pause_count = 0
+                    voiced_count = 1
+                    preroll.clear()
+                else:
+                    preroll.append(buffer)
+                    if playing or not recognizer.dynamic_energy_threshold:
+                        # Fixed threshold, or our own voice, which is not room noise
+                        continue
+                    # Same exponential update SpeechRecognition applies while waiting
+                    target = energy * recognizer.dynamic_energy_ratio
+                    recognizer.energy_threshold = recognizer.energy_threshold * damping + target * (1 - damping)
+                continue
+
+            frames.append(buffer)
+            if energy > threshold:
+                pause_count = 0
+                voiced_count += 1
+                # Report the onset once, after enough speech to rule out clicks and bumps
+                if voiced_count == phrase_buffers and self.on_speech_start:
+                    try:
+                        self.on_speech_start()
+                    except Exception as e:
+                        print(f"Error in speech onset callback: {e}")
+            else:
+                pause_count += 1
+            if pause_count > pause_buffers or (limit_buffers and len(frames) >= limit_buffers):
+                if len(frames) - pause_count >= phrase_buffers:
+                    self._emit(sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH))
+                frames = None
+
+    def _emit(self, audio: sr.AudioData):
+        """Queue a phrase, dropping the oldest one if nobody is consuming."""
+        while True:
+            try:
+                self.phrases.put_nowait(audio)
+                return
+            except queue.Full:
+                try:
+                    self.phrases.get_nowait()
+                except queue.Empty:
+                    pass
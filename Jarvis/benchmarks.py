@@ -0,0 +1,512 @@
+"""
+Benchmark script for Jarvis modules - measures hot-path performance
+"""
+
+import sys
+import os
+import random
+import statistics
+import subprocess
+import time
+
+# Add Jarvis directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+# ...and its parent, for benchmarks that import the Jarvis package
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+SAMPLE_QUERIES = [
+    "what time is it", "what's the date today", "search wikipedia for alan turing",
+    "google python decorators", "open youtube", "open github please",
+    "play some music", "play despacito song on youtube", "tell me a joke",
+    "what's my battery status", "how is the cpu doing", "check ram usage",
+    "is the internet working", "increase volume", "set brightness to 50%",
+    "open notepad", "launch chrome", "close chrome", "get me the latest news",
+    "technology news", "remind me to call mom at 3 pm", "list my reminders",
+    "change your voice", "take a screenshot", "shutdown in 10 minutes",
+    "restart the computer", "put the system to sleep", "lock the screen",
+    "calculate 25 times 4", "what is 12 plus 7", "what's the weather in paris",
+    "goodbye", "what time is the news on", "tell me about quantum computing",
+    "who wrote pride and prejudice", "how far away is the moon",
+    "explain the theory of relativity simply", "what should i cook tonight",
+    "recommend a good book", "how do airplanes stay in the air",
+]
+
+FILLERS = ["", "jarvis ", "hey jarvis ", "please ", "can you ", "could you please "]
+SUFFIXES = ["", " please", " now", " for me", " right away"]
+
+
+def build_corpus(size: int = 5000, seed: int = 42):
+    """Build a reproducible corpus of utterances."""
+    rng = random.Random(seed)
+    return [
+        rng.choice(FILLERS) + rng.choice(SAMPLE_QUERIES) + rng.choice(SUFFIXES)
+        for _ in range(size)
+    ]
+
+
+def _legacy_route(query: str):
+    """Reference implementation of the original if/elif routing chain."""
+    if "time" in query:
+        return "time"
+    elif "date" in query:
+        return "date"
+    elif "wikipedia" in query:
+        return "wikipedia"
+    elif "google" in query or "search" in query:
+        return "web_search"
+    elif "open youtube" in query or "open google" in query or "open" in query and any(site in query for site in ["youtube", "google", "github", "facebook", "twitter"]):
+        return "website"
+    elif "play" in query and ("music" in query or "song" in query or "youtube" in query):
+        return "music"
+    elif "joke" in query:
+        return "joke"
+    elif "battery" in query:
+        return "battery"
+    elif "cpu" in query:
+        return "cpu"
+    elif "memory" in query or "ram" in query:
+        return "memory"
+    elif "internet" in query:
+        return "internet"
+    elif "volume" in query:
+        return "volume"
+    elif "brightness" in query:
+        return "brightness"
+    elif ("open" in query or "launch" in query or "start" in query) and not any(x in query for x in ["youtube", "google", "website"]):
+        return "open_app"
+    elif "close" in query or "exit" in query:
+        return "close_app"
+    elif "news" in query:
+        return "news"
+    elif "remind me" in query or "reminder" in query or "set reminder" in query:
+        return "reminder"
+    elif "list reminder" in query or "my reminders" in query:
+        return "list_reminders"
+    elif "change voice" in query or "change your voice" in query:
+        return "voice_change"
+    elif "screenshot" in query or "screen shot" in query:
+        return "screenshot"
+    elif "shutdown" in query:
+        return "shutdown"
+    elif "restart" in query:
+        return "restart"
+    elif "sleep" in query and ("system" in query or "computer" in query):
+        return "sleep"
+    elif "lock" in query:
+        return "lock"
+    elif any(word in query for word in ["calculate", "compute", "what is", "what's"]) and any(c in query for c in ['+', '-', '*', '/', 'plus', 'minus', 'times', 'divided']):
+        return "calculation"
+    elif "weather" in query:
+        return "weather"
+    elif any(word in query for word in ["offline", "exit", "quit", "goodbye", "bye"]):
+        return "exit"
+    return None
+
+
+def _time_per_query(func, corpus, repeat: int) -> float:
+    """Return the best mean time per query in microseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in corpus:
+            func(query)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+    return best / len(corpus) * 1e6
+
+
+def bench_intent_routing(size: int = 5000, repeat: int = 5):
+    """Measure routing cost per query for the compiled intent router."""
+    print("Benchmarking intent routing...")
+
+    from intent_router import IntentRouter, DEFAULT_INTENTS
+
+    start = time.perf_counter()
+    router = IntentRouter(DEFAULT_INTENTS)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    corpus = build_corpus(size)
+    unmatched = [q for q in corpus if router.route(q) is None]
+    matched = [q for q in corpus if router.route(q) is not None]
+
+    router_us = _time_per_query(router.route, corpus, repeat)
+    legacy_us = _time_per_query(_legacy_route, corpus, repeat)
+    router_hit_us = _time_per_query(router.route, matched, repeat) if matched else 0.0
+    legacy_hit_us = _time_per_query(_legacy_route, matched, repeat) if matched else 0.0
+    router_miss_us = _time_per_query(router.route, unmatched, repeat) if unmatched else 0.0
+    legacy_miss_us = _time_per_query(_legacy_route, unmatched, repeat) if unmatched else 0.0
+
+    changed = 0
+    for query in corpus:
+        intent = router.route(query)
+        if (intent.name if intent else None) != _legacy_route(query):
+            changed += 1
+
+    print(f"  Corpus: {len(corpus)} utterances ({len(unmatched)} fall through to AI)")
+    print(f"  Router compile time: {compile_ms:.2f} ms")
+    print(f"  Compiled router:     {router_us:.2f} µs/query "
+          f"(matched: {router_hit_us:.2f} µs, unmatched: {router_miss_us:.2f} µs)")
+    print(f"  Legacy if/elif:      {legacy_us:.2f} µs/query "
+          f"(matched: {legacy_hit_us:.2f} µs, unmatched: {legacy_miss_us:.2f} µs)")
+    print(f"  Routes changed by explicit priorities/word boundaries: {changed}")
+    return router_us
+
+
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+from Jarvis.jarvis import JarvisAssistant
+assistant = JarvisAssistant(speech_sink=lambda text: None, command_source=lambda: "")
+if {eager}:
+    # Force every component the way the pre-lazy code built them at import
+    import importlib
+    for name, attr in [('voice_manager', 'voices'), ('ai_engine', 'ai_type'),
+                       ('system_control', 'platform'), ('whatsapp_handler', 'open_chat'),
+                       ('news_handler', 'api_key'), ('weather_handler', 'api_key')]:
+        try:
+            getattr(getattr(importlib.import_module('Jarvis.' + name), name), attr)
+        except Exception:
+            pass
+    for module in ['wikipedia', 'pyautogui', 'pyjokes', 'requests', 'psutil', 'pywhatkit',
+                   'apscheduler.schedulers.background', 'Jarvis.skills.system', 'Jarvis.skills.news',
+                   'Jarvis.skills.weather', 'Jarvis.skills.calculator', 'Jarvis.skills.reminders',
+                   'Jarvis.skills.whatsapp']:
+        try:
+            __import__(module)
+        except Exception:
+            pass
+elapsed = time.perf_counter() - start
+assistant.shutdown()
+print(elapsed)
+"""
+
+
+def _measure_startup(eager: bool, runs: int) -> list:
+    """Measure time-to-first-prompt in fresh interpreters."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_SNIPPET.format(eager=eager)],
+            cwd=repo_root, capture_output=True, text=True
+        )
+        lines = result.stdout.strip().splitlines()
+        if result.returncode != 0 or not lines:
+            print(f"  Startup run failed: {result.stderr.strip().splitlines()[-1:]}")
+            return []
+        samples.append(float(lines[-1]))
+    return samples
+
+
+def bench_startup(runs: int = 5):
+    """Compare time-to-first-prompt with lazy and eagerly built components."""
+    print("\nBenchmarking startup...")
+
+    lazy = _measure_startup(eager=False, runs=runs)
+    eager = _measure_startup(eager=True, runs=runs)
+    if not lazy or not eager:
+        return None
+
+    lazy_ms = statistics.median(lazy) * 1000
+    eager_ms = statistics.median(eager) * 1000
+    print(f"  Lazy components (time to first prompt):  {lazy_ms:.1f} ms median of {runs}")
+    print(f"  Eager components (time to first prompt): {eager_ms:.1f} ms median of {runs}")
+    print(f"  Saved at startup: {eager_ms - lazy_ms:.1f} ms")
+    return lazy_ms
+
+
+def _first_vs_steady(connect, request, warm=None, runs: int = 5, steady: int = 10):
+    """Median latency of the first request on a new connection and of later ones.
+
+    connect() returns a fresh client, request(client) makes one request and
+    warm(client), if given, runs before the first timed request.
+    """
+    first, later = [], []
+    for _ in range(runs):
+        client = connect()
+        if warm:
+            warm(client)
+        start = time.perf_counter()
+        request(client)
+        first.append(time.perf_counter() - start)
+        for _ in range(steady):
+            start = time.perf_counter()
+            request(client)
+            later.append(time.perf_counter() - start)
+    return statistics.median(first) * 1000, statistics.median(later) * 1000
+
+
+def bench_connection_warmup(url: str = "", runs: int = 5):
+    """Compare first-request latency with and without connection warm-up.
+    
+    HTTP requests go to url when given (e.g. https://api.openai.com/v1/models,
+    whose 401 answer is fine for timing) and to a local stub server otherwise,
+    which shows the client-side setup cost but not DNS or TLS. AI requests
+    always go to a local stub server.
+    """
+    print("\nBenchmarking connection warm-up...")
+
+    try:
+        import requests
+        from Jarvis.stub_servers import StubAIServer
+    except ImportError as e:
+        print(f"  Skipped ({e})")
+        return None
+
+    results = {}
+    with StubAIServer(reply="Warm.") as server:
+        target = url or server.url + "/v1/models/stub"
+
+        def warm_session(session):
+            # The same cheap request open_connection() makes on the shared session
+            session.head(target, timeout=5)
+
+        cold_ms, steady_ms = _first_vs_steady(requests.Session, lambda session: session.get(target, timeout=10),
+                                              runs=runs)
+        warm_ms, _ = _first_vs_steady(requests.Session, lambda session: session.get(target, timeout=10),
+                                      warm=warm_session, runs=runs)
+        results['http'] = (cold_ms, warm_ms, steady_ms)
+
+        try:
+            from Jarvis.providers import LocalProvider
+            messages = [{'role': 'user', 'content': 'hello'}]
+
+            def connect():
+                return LocalProvider(base_url=server.openai_base_url)
+
+            def ask(provider):
+                provider.complete(messages, 20, 0.0)
+
+            cold_ms, steady_ms = _first_vs_steady(connect, ask, runs=runs)
+            warm_ms, _ = _first_vs_steady(connect, ask, warm=lambda provider: provider.warm_up(), runs=runs)
+            results['ai'] = (cold_ms, warm_ms, steady_ms)
+        except ImportError:
+            print("  AI: skipped (openai not installed)")
+
+    print(f"  {'target':<8}{'cold first ms':>15}{'warmed first ms':>17}{'steady ms':>11}")
+    for name, (cold_ms, warm_ms, steady_ms) in results.items():
+        print(f"  {name:<8}{cold_ms:>15.2f}{warm_ms:>17.2f}{steady_ms:>11.2f}")
+    return results
+
+
+def bench_storage_backends(count: int = 5000, changes: int = 200):
+    """Compare saving one changed reminder with the JSON file and SQLite backends."""
+    print("\nBenchmarking storage backends...")
+
+    import tempfile
+    from Jarvis.database import Database
+    from Jarvis.utils import save_json
+
+    reminders = [{'id': str(i), 'message': f'reminder {i}', 'time': f'2030-01-01T{i % 24:02d}:{i % 60:02d}:00',
+                  'recurring': False, 'active': True, 'created_at': '2026-01-01T00:00:00'} for i in range(count)]
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, "reminders.json")
+        start = time.perf_counter()
+        for i in range(changes):
+            reminders[i]['active'] = False
+            save_json(path, reminders, durable=True)
+        json_ms = (time.perf_counter() - start) / changes * 1000
+
+        database = Database(os.path.join(data_dir, "jarvis.db"))
+        with database.transaction() as conn:
+            conn.executemany("INSERT INTO reminders (id, time, active, data) VALUES (?, ?, ?, ?)",
+                             [database._reminder_row(reminder) for reminder in reminders])
+        start = time.perf_counter()
+        for i in range(changes):
+            reminders[i]['active'] = True
+            database.save_reminder(reminders[i])
+        sqlite_ms = (time.perf_counter() - start) / changes * 1000
+        database.close()
+
+    print(f"  {count} reminders, one changed per save")
+    print(f"  JSON file rewrite: {json_ms:.3f} ms per change")
+    print(f"  SQLite row update: {sqlite_ms:.3f} ms per change")
+    return json_ms, sqlite_ms
+
+
+def _legacy_reminder_ops(reminders, ids, next_count):
+    """Reminder operations as list scans, the way ReminderManager used to do them."""
+    timings = {}
+    items = []
+    start = time.perf_counter()
+    for reminder in reminders:
+        items.append(reminder)
+    timings['add'] = time.perf_counter() - start
+
+    def get(reminder_id):
+        for reminder in items:
+            if reminder['id'] == reminder_id:
+                return reminder
+        return None
+
+    start = time.perf_counter()
+    for reminder_id in ids:
+        get(reminder_id)
+    timings['lookup'] = (time.perf_counter() - start) / len(ids)
+
+    start = time.perf_counter()
+    active = [r for r in items if r.get('active', True)]
+    sorted(active, key=lambda r: r['time'])[:next_count]
+    timings['next'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for reminder_id in ids:
+        # _trigger_reminder looked the reminder up, then deactivate_reminder scanned again
+        get(reminder_id)
+        for reminder in items:
+            if reminder['id'] == reminder_id:
+                reminder['active'] = False
+                break
+    timings['fire'] = (time.perf_counter() - start) / len(ids)
+    return timings
+
+
+def _store_reminder_ops(reminders, ids, next_count):
+    """The same operations on a ReminderStore."""
+    from Jarvis.reminder_manager import ReminderStore
+
+    timings = {}
+    store = ReminderStore()
+    start = time.perf_counter()
+    for reminder in reminders:
+        store.add(reminder)
+    timings['add'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for reminder_id in ids:
+        store.get(reminder_id)
+    timings['lookup'] = (time.perf_counter() - start) / len(ids)
+
+    start = time.perf_counter()
+    store.next_due(next_count)
+    timings['next'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for reminder_id in ids:
+        store.get(reminder_id)
+        store.set_active(reminder_id, False)
+    timings['fire'] = (time.perf_counter() - start) / len(ids)
+    assert len(store.next_due(next_count)) == next_count
+    return timings
+
+
+def bench_reminder_store(count: int = 100_000, lookups: int = 200, next_count: int = 10, seed: int = 42):
+    """Compare list scans with the indexed ReminderStore at count reminders."""
+    print("\nBenchmarking reminder store...")
+
+    rng = random.Random(seed)
+
+    def make_reminders():
+        return [{'id': f"{i:08d}", 'message': f"reminder {i}",
+                 'time': f"2030-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T"
+                         f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+                 'recurring': False, 'active': True, 'created_at': '2026-01-01T00:00:00'}
+                for i in range(count)]
+
+    reminders = make_reminders()
+    # Fire the reminders due soonest, as the scheduler would
+    ids = [r['id'] for r in sorted(reminders, key=lambda r: r['time'])[:lookups]]
+    rng.seed(seed)
+    legacy = _legacy_reminder_ops(make_reminders(), ids, next_count)
+    rng.seed(seed)
+    indexed = _store_reminder_ops(make_reminders(), ids, next_count)
+
+    rows = [("add all", 'add', 1000, "ms"), ("lookup by id", 'lookup', 1e6, "us"),
+            (f"next {next_count} due", 'next', 1000, "ms"), ("fire (lookup + deactivate)", 'fire', 1e6, "us")]
+    print(f"  {count} reminders")
+    print(f"  {'operation':<28}{'list scan':>12}{'indexed':>12}")
+    for label, key, scale, unit in rows:
+        print(f"  {label:<28}{legacy[key] * scale:>9.2f} {unit}{indexed[key] * scale:>9.2f} {unit}")
+    return legacy, indexed
+
+
+def bench_recognizers(wav_dir: str, backends=("google", "vosk", "whisper_cpp"), **options):
+    """Measure word error rate and real-time factor per speech backend.
+    
+    wav_dir holds WAV files with a reference transcript next to each one
+    (command.wav + command.txt).
+    """
+    print("\nBenchmarking speech recognizers...")
+
+    import speech_recognition as sr
+    from speech_backends import create_backend, word_error_rate
+
+    samples = []
+    for filename in sorted(os.listdir(wav_dir)):
+        if not filename.lower().endswith(".wav"):
+            continue
+        transcript = os.path.join(wav_dir, os.path.splitext(filename)[0] + ".txt")
+        if not os.path.exists(transcript):
+            continue
+        with sr.AudioFile(os.path.join(wav_dir, filename)) as source:
+            audio = sr.Recognizer().record(source)
+        with open(transcript, 'r', encoding='utf-8') as f:
+            reference = f.read().strip()
+        duration = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        samples.append((filename, audio, reference, duration))
+
+    if not samples:
+        print(f"  No WAV files with matching .txt transcripts in {wav_dir}")
+        return {}
+
+    results = {}
+    print(f"  {'backend':<14}{'files':>7}{'WER':>9}{'RTF':>9}{'errors':>8}")
+    for name in backends:
+        backend = create_backend(name, sr.Recognizer(), **options)
+        errors = 0
+        wers = []
+        processing = 0.0
+        audio_seconds = 0.0
+        for _, audio, reference, duration in samples:
+            start = time.perf_counter()
+            try:
+                hypothesis = backend.recognize(audio)
+            except sr.UnknownValueError:
+                hypothesis = ""
+            except sr.RequestError as e:
+                print(f"  {name}: unavailable ({e})")
+                errors = len(samples)
+                break
+            processing += time.perf_counter() - start
+            audio_seconds += duration
+            wers.append(word_error_rate(reference, hypothesis))
+
+        if not wers:
+            continue
+        wer = sum(wers) / len(wers)
+        rtf = processing / audio_seconds if audio_seconds else 0.0
+        results[name] = {'wer': wer, 'rtf': rtf}
+        print(f"  {name:<14}{len(wers):>7}{wer:>9.1%}{rtf:>9.3f}{errors:>8}")
+    return results
+
+
+def main():
+    """Run all benchmarks."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Jarvis benchmarks")
+    parser.add_argument("--wav-dir", help="directory of WAV files with .txt transcripts for recognizer benchmarks")
+    parser.add_argument("--backends", default="google,vosk,whisper_cpp", help="comma-separated speech backends")
+    parser.add_argument("--vosk-model", default="", help="path to a Vosk model directory")
+    parser.add_argument("--whisper-model", default="base.en", help="whisper.cpp model name or path")
+    parser.add_argument("--warmup-url", default="", help="remote URL for the connection warm-up benchmark")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("    JARVIS AI ASSISTANT - Benchmarks")
+    print("=" * 60 + "\n")
+
+    bench_intent_routing()
+    bench_startup()
+    bench_connection_warmup(args.warmup_url)
+    bench_storage_backends()
+    bench_reminder_store()
+    if args.wav_dir:
+        bench_recognizers(args.wav_dir, args.backends.split(","),
+                          vosk_model_path=args.vosk_model, whisper_model=args.whisper_model)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Persistent caching for Jarvis AI Assistant."""
+
+import atexit
+import threading
+import time
+from collections import OrderedDict
+import os
+from typing import Any, Optional
+from .utils import load_json, save_json
+
+
+class PersistentCache:
+    """LRU cache with per-entry expiry, persisted as JSON under Jarvis/data.
+
+    Values must be JSON-serializable. The file is read once on first use.
+    Changes made within SAVE_DELAY seconds of each other are written
+    together by a background timer, since every write rewrites the whole
+    file; flush() writes them at once and runs at interpreter exit. Changes
+    from the last SAVE_DELAY seconds are lost if the process is killed.
+    """
+
+    SAVE_DELAY = 1.0  # Seconds to collect changes before rewriting the file
+
+    def __init__(self, filepath: str, max_entries: int = 500, ttl: Optional[float] = None):
+        """Initialize cache; ttl is in seconds (None never expires)."""
+        self.filepath = filepath
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[OrderedDict] = None
+        self._lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
+        atexit.register(self.flush)
+
+    def _load(self) -> OrderedDict:
+        """Read entries from disk, oldest first, dropping anything expired."""
+        if self._entries is None:
+            stored = load_json(self.filepath, {})
+            now = time.time()
+            entries = sorted(stored.items(), key=lambda item: item[1].get('used', 0))
+            self._entries = OrderedDict(
+                (key, entry) for key, entry in entries
+                if isinstance(entry, dict) and not self._expired(entry, now)
+            )
+        return self._entries
+
+    def _expired(self, entry: dict, now: float) -> bool:
+        """Check if an entry is past its TTL."""
+        return self.ttl is not None and now - entry.get('created', 0) > self.ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value, or default if missing or expired."""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            now = time.time()
+            if entry is None or self._expired(entry, now):
+                if entry is not None:
+                    del entries[key]
+                self.misses += 1
+                return default
+            entry['used'] = now
+            entries.move_to_end(key)
+            self.hits += 1
+            return entry['value']
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Get a cached value without counting a hit or refreshing its recency."""
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None or self._expired(entry, time.time()):
+                return default
+            return entry['value']
+
+    def keys(self) -> list:
+        """Keys currently stored, least recently used first."""
+        with self._lock:
+            return list(self._load().keys())
+
+    def set(self, key: str, value: Any):
+        """Store a value and evict the least recently used entries over the limit."""
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            entries[key] = {'value': value, 'created': now, 'used': now}
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._schedule_save()
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry."""
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is None:
+                return False
+            self._schedule_save()
+            return True
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries = OrderedDict()
+            self._schedule_save()
+
+    def _schedule_save(self):
+        """Write within SAVE_DELAY seconds, together with other changes (lock must be held)."""
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> bool:
+        """Write pending changes to the file now."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+            saved = save_json(self.filepath, dict(self._entries), compact=True)
+            self._dirty = not saved
+            return saved
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+
+def open_cache(filepath: str, max_entries: int = 500, ttl: Optional[float] = None):
+    """PersistentCache at filepath, or its table in the SQLite database if enabled."""
+    from .database import get_database
+
+    database = get_database()
+    if database is not None:
+        namespace = os.path.splitext(os.path.basename(filepath))[0]
+        return database.cache(namespace, max_entries=max_entries, ttl=ttl)
+    return PersistentCache(filepath, max_entries=max_entries, ttl=ttl)
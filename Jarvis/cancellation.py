@@ -0,0 +1,103 @@
+"""Cancellation tokens for interrupting work in progress.
+
+A token is created for each command Jarvis handles and passed down to the
+AI engine, network handlers and speech output. When the user starts
+talking over Jarvis (barge-in) the token is cancelled: pending requests
+are abandoned, open response streams are closed and playback stops.
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+
+class OperationCancelled(Exception):
+    """Raised when work is abandoned because its token was cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe, one-shot cancellation flag with callbacks."""
+
+    def __init__(self):
+        """Initialize token in the not-cancelled state."""
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if cancel() has been called."""
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancel the token and run its callbacks (only the first call has an effect)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancellation callback: {e}")
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run callback when the token is cancelled (at once if it already is).
+
+        Returns a function that unregisters the callback.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]):
+        """Unregister a callback."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        """Raise OperationCancelled if the token has been cancelled."""
+        if self._event.is_set():
+            raise OperationCancelled()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or timeout; returns whether the token is cancelled."""
+        return self._event.wait(timeout)
+
+
+def run_cancellable(func: Callable, *args, token: Optional[CancellationToken] = None, **kwargs):
+    """Call a blocking function, returning early with OperationCancelled on cancel.
+
+    Without a token the function is simply called. With one it runs on a
+    daemon thread; a cancelled call is abandoned and finishes (or times out)
+    in the background with its result discarded.
+    """
+    if token is None:
+        return func(*args, **kwargs)
+    token.raise_if_cancelled()
+
+    outcome = {}
+    finished = threading.Event()
+
+    def target():
+        try:
+            outcome['result'] = func(*args, **kwargs)
+        except BaseException as e:
+            outcome['error'] = e
+        finished.set()
+
+    unregister = token.on_cancel(finished.set)
+    try:
+        threading.Thread(target=target, name="jarvis-cancellable", daemon=True).start()
+        finished.wait()
+    finally:
+        unregister()
+    if 'error' in outcome:
+        raise outcome['error']
+    if 'result' not in outcome:
+        raise OperationCancelled()
+    return outcome['result']
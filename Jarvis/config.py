@@ -1,18 +1,107 @@
 """Configuration management for Jarvis AI Assistant."""
 
+import atexit
+import copy
 import json
 import os
-from typing import Dict, Any
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 
+class ConfigSection:
+    """Read-only config section with one slot per setting.
+    
+    Subclasses are generated per set of keys by section_type(); snapshots
+    are rebuilt on every change instead of being modified.
+    """
+    
+    __slots__ = ()
+    
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Config snapshots are read-only; use config.set()")
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict of the section's values."""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+@lru_cache(maxsize=None)
+def section_type(name: str, keys: Tuple[str, ...]) -> type:
+    """Slotted ConfigSection subclass for a section with the given keys."""
+    return type(name, (ConfigSection,), {'__slots__': keys})
+
+
+def _coerce(key: str, default: Any, value: Any) -> Any:
+    """Give value the type of its default, falling back to the default if it can't."""
+    if default is None or value is None or isinstance(value, type(default)):
+        return value
+    if isinstance(default, float) and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(default, (dict, list)) or isinstance(value, (dict, list)):
+        print(f"Invalid config value for {key}, using the default")
+        return copy.deepcopy(default)
+    print(f"Config value for {key} should be a {type(default).__name__}, using the default")
+    return default
+
+
+def diff_configs(old: Dict[str, Any], new: Dict[str, Any], prefix: str = "") -> Set[str]:
+    """Dotted keys whose values differ between two config dicts."""
+    changed = set()
+    for key in old.keys() | new.keys():
+        before, after = old.get(key), new.get(key)
+        if isinstance(before, dict) and isinstance(after, dict):
+            changed |= diff_configs(before, after, prefix + key + ".")
+        elif key not in old or key not in new or before != after:
+            changed.add(prefix + key)
+    return changed
+
+
+def build_snapshot(values: Dict[str, Any], defaults: Dict[str, Any], name: str = "ConfigSnapshot",
+                   prefix: str = "") -> ConfigSection:
+    """Build a snapshot of a config dict, typed after the defaults.
+    
+    Top-level dicts become nested sections (snapshot.voice.rate); dicts
+    deeper down are copied as plain dicts. Keys that are not identifiers
+    are only reachable through Config.get().
+    """
+    keys = tuple(key for key in values if key.isidentifier())
+    section = object.__new__(section_type(name, keys))
+    for key in keys:
+        value = values[key]
+        default = defaults.get(key) if isinstance(defaults, dict) else None
+        if not prefix and isinstance(value, dict):
+            value = build_snapshot(value, default or {}, key.title().replace('_', '') + "Settings", key + ".")
+        else:
+            value = copy.deepcopy(_coerce(prefix + key, default, value))
+        object.__setattr__(section, key, value)
+    return section
+
+
 class Config:
-    """Manages configuration settings for Jarvis."""
+    """Manages configuration settings for Jarvis.
+    
+    set() changes the in-memory config at once and writes the file behind:
+    changes made within SAVE_DELAY seconds of each other are saved together
+    by a background timer. flush() writes pending changes immediately and
+    runs at interpreter exit.
+    
+    Hot paths read the typed snapshot (config.snapshot.voice.rate) instead
+    of get(), and components that cache settings subscribe() to changes.
+    Edits to the file by other programs are picked up by reload(), which
+    watch() runs whenever the file changes.
+    """
     
     CONFIG_FILE = os.path.join(os.path.dirname(__file__), "data", "config.json")
+    SAVE_DELAY = 1.0  # Seconds to collect changes before writing the file
     
     DEFAULT_CONFIG = {
         "assistant_name": "Jarvis",
@@ -22,16 +111,79 @@ class Config:
             "volume": 1.0,
             "language": "en"
         },
+        "speech": {
+            "continuous_listening": True,
+            "calibration_duration": 1.0,
+            "pause_threshold": 1.0,
+            "phrase_time_limit": 10,
+            "barge_in": False,
+            "headset": False,
+            "barge_in_echo_factor": 3.0,
+            "recognizer": "google",
+            "offline_recognizer": "vosk",
+            "language": "en-in",
+            "vosk_model_path": "",
+            "whisper_model": "base.en"
+        },
         "features": {
             "ai_enabled": True,
             "wake_word_enabled": False,
             "conversation_mode": False,
             "offline_mode": False
         },
+        "handlers": {
+            "plugins": []
+        },
+        "response_cache": {
+            "enabled": True,
+            "similarity_threshold": 0.8,
+            "ttl_hours": 24,
+            "max_entries": 1000
+        },
+        "wikipedia": {
+            "sentences": 2,
+            "cache_size": 500,
+            "cache_ttl_hours": 168
+        },
+        "config_reload": {
+            "enabled": True,
+            "poll_seconds": 2
+        },
+        "network": {
+            "warmup": True,
+            "keepalive_seconds": 45
+        },
+        "storage": {
+            "backend": "json",
+            "database_file": "",
+            "fsync": "durable",
+            "fast_json": True
+        },
+        "tracing": {
+            "enabled": True,
+            "window": 500
+        },
         "ai_settings": {
             "model": "gpt-3.5-turbo",
             "max_tokens": 150,
-            "temperature": 0.7
+            "temperature": 0.7,
+            "stream": True,
+            "context_tokens": 1000,
+            "summary_tokens": 150,
+            "providers": ["openai", "gemini", "local"],
+            "gemini_model": "gemini-pro",
+            "openai_base_url": "",
+            "gemini_endpoint": "",
+            "local_base_url": "",
+            "local_model": "local",
+            "local_timeout": 60,
+            "request_timeout": 20,
+            "hedge_after_seconds": None,
+            "breaker_failures": 3,
+            "breaker_reset_seconds": 30,
+            "requests_per_minute": {"openai": 60, "gemini": 60},
+            "rate_burst": 5,
+            "bulk_concurrency": 8
         },
         "preferences": {
             "news_category": "technology",
@@ -51,7 +203,55 @@ class Config:
     
     def __init__(self):
         """Initialize configuration."""
+        self._lock = threading.RLock()
+        self._save_timer = None
+        self._dirty = False
+        self._saved_signature = None
+        self._subscribers: List[Tuple[Callable[[Set[str]], None], Tuple[str, ...]]] = []
         self.config = self._load_config()
+        self._saved_signature = self._file_signature()
+        self._snapshot = build_snapshot(self.config, self.DEFAULT_CONFIG)
+        atexit.register(self.flush)
+    
+    @property
+    def snapshot(self) -> ConfigSection:
+        """Current settings as a read-only object with attribute access.
+        
+        A new snapshot replaces the old one on every change, so values read
+        from one snapshot are always consistent with each other.
+        """
+        return self._snapshot
+    
+    def subscribe(self, callback: Callable[[Set[str]], None], *prefixes: str) -> Callable[[], None]:
+        """Call callback(changed_keys) after keys under any of prefixes change.
+        
+        With no prefixes every change is reported. Returns a function that
+        unsubscribes.
+        """
+        entry = (callback, prefixes)
+        with self._lock:
+            self._subscribers.append(entry)
+        
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+    
+    def _notify(self, changed: Iterable[str]):
+        """Rebuild the snapshot and tell subscribers which keys changed."""
+        changed = set(changed)
+        with self._lock:
+            self._snapshot = build_snapshot(self.config, self.DEFAULT_CONFIG)
+            subscribers = list(self._subscribers)
+        for callback, prefixes in subscribers:
+            keys = {key for key in changed
+                    if not prefixes or any(key == prefix or key.startswith(prefix + '.') for prefix in prefixes)}
+            if keys:
+                try:
+                    callback(keys)
+                except Exception as e:
+                    print(f"Error in config subscriber: {e}")
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default."""
@@ -60,16 +260,16 @@ class Config:
                 with open(self.CONFIG_FILE, 'r') as f:
                     config = json.load(f)
                 # Merge with default config to ensure all keys exist
-                return self._merge_configs(self.DEFAULT_CONFIG.copy(), config)
+                return self._merge_configs(copy.deepcopy(self.DEFAULT_CONFIG), config)
             else:
                 # Create data directory if it doesn't exist
                 os.makedirs(os.path.dirname(self.CONFIG_FILE), exist_ok=True)
                 # Save default config
                 self.save_config(self.DEFAULT_CONFIG)
-                return self.DEFAULT_CONFIG.copy()
+                return copy.deepcopy(self.DEFAULT_CONFIG)
         except Exception as e:
             print(f"Error loading config: {e}")
-            return self.DEFAULT_CONFIG.copy()
+            return copy.deepcopy(self.DEFAULT_CONFIG)
     
     def _merge_configs(self, default: Dict, user: Dict) -> Dict:
         """Merge user config with default config."""
@@ -82,24 +282,96 @@ class Config:
         return default
     
     def save_config(self, config: Dict[str, Any] = None) -> bool:
-        """Save configuration to file."""
+        """Save configuration to file now.
+        
+        The file is replaced atomically through the storage layer, so a
+        crash mid-write leaves the previous config intact.
+        """
+        from .storage import write_atomic
+        
         try:
-            if config is None:
-                config = self.config
-            
-            # Don't save API keys to config file (use .env instead)
-            config_to_save = config.copy()
-            if "api_keys" in config_to_save:
-                config_to_save["api_keys"] = {key: "" for key in config_to_save["api_keys"]}
-            
-            os.makedirs(os.path.dirname(self.CONFIG_FILE), exist_ok=True)
-            with open(self.CONFIG_FILE, 'w') as f:
-                json.dump(config_to_save, f, indent=4)
+            with self._lock:
+                current = config is None
+                if current:
+                    config = self.config
+                
+                # Don't save API keys to config file (use .env instead)
+                config_to_save = config.copy()
+                if "api_keys" in config_to_save:
+                    config_to_save["api_keys"] = {key: "" for key in config_to_save["api_keys"]}
+                
+                text = json.dumps(config_to_save, indent=4)
+                write_atomic(self.CONFIG_FILE, text.encode('utf-8'), durable=True)
+                self._saved_signature = self._file_signature()
+                if current:
+                    self._dirty = False
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
             return False
     
+    def _file_signature(self):
+        """Modification time and size of the config file, or None if it is missing."""
+        try:
+            stat = os.stat(self.CONFIG_FILE)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def reload(self) -> Set[str]:
+        """Re-read the config file and notify subscribers of the keys that changed.
+        
+        Returns the changed keys. The current config is kept if the file
+        can't be parsed, and local changes not yet written take precedence
+        over the file (they are saved over it shortly).
+        """
+        with self._lock:
+            if self._dirty or self._file_signature() == self._saved_signature:
+                # Nothing new, or our own write
+                return set()
+            try:
+                with open(self.CONFIG_FILE, 'r') as f:
+                    loaded = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reloading config: {e}")
+                return set()
+            self._saved_signature = self._file_signature()
+            
+            new_config = self._merge_configs(copy.deepcopy(self.DEFAULT_CONFIG), loaded)
+            # API keys are never written to the file, so keep the ones in memory
+            new_config['api_keys'] = self.config.get('api_keys', {})
+            changed = diff_configs(self.config, new_config)
+            if not changed:
+                return changed
+            self.config = new_config
+        self._notify(changed)
+        return changed
+    
+    def watch(self, poll_interval: float = 2.0):
+        """Reload the config whenever its file changes; returns the started FileWatcher."""
+        from .file_watcher import FileWatcher
+        
+        return FileWatcher(self.CONFIG_FILE, self.reload, poll_interval=poll_interval).start()
+    
+    def _schedule_save(self):
+        """Save within SAVE_DELAY seconds, together with any other changes made meanwhile."""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self) -> bool:
+        """Write pending changes to the file now."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+            return self.save_config()
+    
     def get(self, key: str, default=None) -> Any:
         """Get a configuration value."""
         keys = key.split('.')
@@ -112,16 +384,21 @@ class Config:
         return value
     
     def set(self, key: str, value: Any) -> bool:
-        """Set a configuration value."""
+        """Set a configuration value; the file is updated shortly after (see flush())."""
         try:
-            keys = key.split('.')
-            config = self.config
-            for k in keys[:-1]:
-                if k not in config:
-                    config[k] = {}
-                config = config[k]
-            config[keys[-1]] = value
-            return self.save_config()
+            with self._lock:
+                keys = key.split('.')
+                config = self.config
+                for k in keys[:-1]:
+                    if k not in config:
+                        config[k] = {}
+                    config = config[k]
+                if keys[-1] in config and config[keys[-1]] == value:
+                    return True
+                config[keys[-1]] = value
+                self._schedule_save()
+            self._notify([key])
+            return True
         except Exception as e:
             print(f"Error setting config: {e}")
             return False
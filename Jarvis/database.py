@@ -0,0 +1,375 @@
+"""SQLite storage for Jarvis AI Assistant.
+
+With storage.backend set to "sqlite", reminders, conversation turns and the
+response and Wikipedia caches live in one database in WAL mode instead of
+separate JSON files that are read whole and rewritten on every change.
+Changes touch only the affected rows and lookups use indexes. The first
+time the database is opened, the existing JSON files are imported and
+renamed with a .migrated suffix.
+
+config.json stays a JSON file: people edit it by hand and it is reloaded
+when it changes on disk.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from .config import config
+from .storage import dumps, loads, read_json
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DATABASE_FILE = os.path.join(DATA_DIR, "jarvis.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS reminders (
+    id TEXT PRIMARY KEY,
+    time TEXT NOT NULL,
+    active INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reminders_due ON reminders (active, time);
+
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_timestamp ON turns (timestamp);
+
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entries_used ON cache_entries (namespace, used);
+"""
+
+# storage.fsync policy -> PRAGMA synchronous (WAL with NORMAL survives
+# application crashes; FULL also survives power loss)
+SYNCHRONOUS = {'always': 'FULL', 'durable': 'NORMAL', 'never': 'OFF'}
+
+
+def _encode(value: Any) -> str:
+    """Compact JSON text for a column."""
+    return dumps(value, compact=True).decode('utf-8')
+
+
+class Database:
+    """One SQLite connection shared by all threads, serialized by a lock."""
+
+    def __init__(self, path: str, synchronous: str = 'NORMAL'):
+        """Open (creating if needed) the database at path."""
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.RLock()
+        # Autocommit; multi-statement changes use transaction()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements atomically, rolling back if the block raises."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        """Run one statement in its own transaction."""
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def query(self, sql: str, params=()) -> List[tuple]:
+        """Run a query and fetch every row."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a value from the meta table."""
+        rows = self.query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def close(self):
+        """Close the connection."""
+        with self._lock:
+            self._conn.close()
+
+    # Reminders
+
+    def load_reminders(self) -> List[Dict]:
+        """Every reminder, in the order they were added."""
+        return [loads(data) for data, in self.query("SELECT data FROM reminders ORDER BY rowid")]
+
+    def has_active_reminders(self) -> bool:
+        """Check for a pending reminder using the (active, time) index."""
+        return bool(self.query("SELECT 1 FROM reminders WHERE active = 1 LIMIT 1"))
+
+    def save_reminder(self, reminder: Dict):
+        """Insert or update one reminder."""
+        self.execute(
+            "INSERT INTO reminders (id, time, active, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET time = excluded.time, active = excluded.active, data = excluded.data",
+            self._reminder_row(reminder)
+        )
+
+    def delete_reminder(self, reminder_id: str):
+        """Delete one reminder."""
+        self.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+
+    @staticmethod
+    def _reminder_row(reminder: Dict) -> tuple:
+        """Column values for a reminder."""
+        return (str(reminder['id']), reminder.get('time', ''), int(bool(reminder.get('active', True))),
+                _encode(reminder))
+
+    # Conversation turns and caches
+
+    def turns(self, keep_records: int = 200) -> "TurnLog":
+        """Conversation history table, with the same interface as Journal."""
+        return TurnLog(self, keep_records)
+
+    def cache(self, namespace: str, max_entries: int = 500, ttl: Optional[float] = None) -> "SQLiteCache":
+        """A cache table partition, with the same interface as PersistentCache."""
+        return SQLiteCache(self, namespace, max_entries, ttl)
+
+    # Migration
+
+    def migrate_json(self, data_dir: str = DATA_DIR) -> Dict[str, int]:
+        """Import the JSON files in data_dir once; returns rows imported per table.
+
+        Imported files are renamed to *.migrated rather than deleted.
+        """
+        if self.get_meta('json_migrated'):
+            return {}
+
+        sources = []
+
+        def source(name: str, default: Any) -> Any:
+            path = os.path.join(data_dir, name)
+            if not os.path.exists(path):
+                return default
+            sources.append(path)
+            try:
+                return read_json(path, cached=False)
+            except (OSError, ValueError) as e:
+                print(f"Skipping {path} during migration: {e}")
+                return default
+
+        reminders = [r for r in source("reminders.json", []) if isinstance(r, dict) and 'id' in r]
+        turns = source("conversation_history.json", [])
+        journal = os.path.join(data_dir, "conversation_history.jsonl")
+        if os.path.exists(journal):
+            sources.append(journal)
+            turns += self._read_journal(journal)
+        caches = {name: source(f"{name}.json", {}) for name in ("response_cache", "wikipedia_cache")}
+        caches = {name: entries for name, entries in caches.items() if isinstance(entries, dict)}
+
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO reminders (id, time, active, data) VALUES (?, ?, ?, ?)",
+                [self._reminder_row(reminder) for reminder in reminders]
+            )
+            conn.executemany(
+                "INSERT INTO turns (timestamp, data) VALUES (?, ?)",
+                [(turn.get('timestamp', ''), _encode(turn)) for turn in turns if isinstance(turn, dict)]
+            )
+            cache_rows = 0
+            for namespace, entries in caches.items():
+                rows = [(namespace, key, _encode(entry['value']), entry.get('created', 0), entry.get('used', 0))
+                        for key, entry in entries.items() if isinstance(entry, dict) and 'value' in entry]
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created, used) "
+                    "VALUES (?, ?, ?, ?, ?)", rows
+                )
+                cache_rows += len(rows)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                         (str(time.time()),))
+
+        for path in sources:
+            try:
+                os.replace(path, path + ".migrated")
+            except OSError as e:
+                print(f"Could not rename {path} after migration: {e}")
+        return {'reminders': len(reminders), 'turns': len(turns), 'cache_entries': cache_rows}
+
+    @staticmethod
+    def _read_journal(path: str) -> List[Dict]:
+        """Every complete record of a JSON Lines journal."""
+        records = []
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    records.append(loads(line))
+                except ValueError:
+                    # A torn line from an interrupted write
+                    continue
+        return records
+
+
+class TurnLog:
+    """Conversation turns stored as rows; drop-in for Journal."""
+
+    def __init__(self, database: Database, keep_records: int = 200):
+        """Initialize log; only the newest keep_records rows are kept."""
+        self.database = database
+        self.keep_records = keep_records
+
+    def append(self, *records: Dict[str, Any]) -> bool:
+        """Insert records and prune the oldest past keep_records."""
+        try:
+            with self.database.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO turns (timestamp, data) VALUES (?, ?)",
+                    [(record.get('timestamp', ''), _encode(record)) for record in records]
+                )
+                last_id = conn.execute("SELECT max(id) FROM turns").fetchone()[0] or 0
+                conn.execute("DELETE FROM turns WHERE id <= ?", (last_id - self.keep_records,))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving conversation turns: {e}")
+            return False
+
+    def tail(self, count: int) -> List[Dict[str, Any]]:
+        """Return the last count records, oldest first."""
+        if count <= 0:
+            return []
+        rows = self.database.query("SELECT data FROM turns ORDER BY id DESC LIMIT ?", (count,))
+        return [loads(data) for data, in reversed(rows)]
+
+    def compact(self):
+        """Nothing to do: old rows are pruned on every append."""
+
+    def clear(self):
+        """Remove all records."""
+        self.database.execute("DELETE FROM turns")
+
+
+class SQLiteCache:
+    """LRU cache with per-entry expiry in one namespace of the cache table.
+
+    Drop-in for PersistentCache: a lookup reads one row and a change writes
+    one row, however many entries the cache holds.
+    """
+
+    def __init__(self, database: Database, namespace: str, max_entries: int = 500,
+                 ttl: Optional[float] = None):
+        """Initialize cache; ttl is in seconds (None never expires)."""
+        self.database = database
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, created: float, now: float) -> bool:
+        """Check if an entry is past its TTL."""
+        return self.ttl is not None and now - created > self.ttl
+
+    def _row(self, key: str) -> Optional[tuple]:
+        """The value and creation time of an entry."""
+        rows = self.database.query(
+            "SELECT value, created FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+        )
+        return rows[0] if rows else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value, or default if missing or expired."""
+        row = self._row(key)
+        now = time.time()
+        if row is None or self._expired(row[1], now):
+            if row is not None:
+                self.delete(key)
+            self.misses += 1
+            return default
+        self.database.execute("UPDATE cache_entries SET used = ? WHERE namespace = ? AND key = ?",
+                              (now, self.namespace, key))
+        self.hits += 1
+        return loads(row[0])
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Get a cached value without counting a hit or refreshing its recency."""
+        row = self._row(key)
+        if row is None or self._expired(row[1], time.time()):
+            return default
+        return loads(row[0])
+
+    def keys(self) -> list:
+        """Keys currently stored, least recently used first."""
+        rows = self.database.query("SELECT key, created FROM cache_entries WHERE namespace = ? ORDER BY used",
+                                   (self.namespace,))
+        now = time.time()
+        return [key for key, created in rows if not self._expired(created, now)]
+
+    def set(self, key: str, value: Any):
+        """Store a value and evict the least recently used entries over the limit."""
+        now = time.time()
+        with self.database.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO cache_entries (namespace, key, value, created, used) "
+                         "VALUES (?, ?, ?, ?, ?)", (self.namespace, key, _encode(value), now, now))
+            excess = conn.execute("SELECT count(*) FROM cache_entries WHERE namespace = ?",
+                                  (self.namespace,)).fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key IN "
+                    "(SELECT key FROM cache_entries WHERE namespace = ? ORDER BY used LIMIT ?)",
+                    (self.namespace, self.namespace, excess)
+                )
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry."""
+        cursor = self.database.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                                       (self.namespace, key))
+        return cursor.rowcount > 0
+
+    def clear(self):
+        """Remove every entry."""
+        self.database.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def flush(self) -> bool:
+        """Nothing to do: every change is written when it is made."""
+        return True
+
+    def __len__(self) -> int:
+        return self.database.query("SELECT count(*) FROM cache_entries WHERE namespace = ?",
+                                   (self.namespace,))[0][0]
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def get_database() -> Optional[Database]:
+    """Shared database, or None unless storage.backend is "sqlite".
+
+    The first call opens it and imports the old JSON files.
+    """
+    global _database
+    if config.get('storage.backend', 'json') != 'sqlite':
+        return None
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                synchronous = SYNCHRONOUS.get(config.get('storage.fsync', 'durable'), 'NORMAL')
+                database = Database(config.get('storage.database_file', '') or DATABASE_FILE, synchronous)
+                counts = database.migrate_json(DATA_DIR)
+                if any(counts.values()):
+                    print(f"Imported JSON data into {database.path}: {counts}")
+                _database = database
+    return _database
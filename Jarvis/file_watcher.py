@@ -0,0 +1,147 @@
+"""File change notification for Jarvis AI Assistant.
+
+On Linux the watcher uses inotify (through ctypes, no extra package) on the
+file's directory, which also catches editors and deploy tools that replace
+the file by renaming a new one over it. Elsewhere, or if inotify cannot be
+set up, it polls the file's modification time and size.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from typing import Callable, Optional, Tuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _inotify_watch(directory: str) -> Optional[Tuple[ctypes.CDLL, int]]:
+    """Open an inotify descriptor watching directory, or None if unavailable."""
+    if not hasattr(os, 'O_CLOEXEC'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return libc, fd
+
+
+class FileWatcher:
+    """Calls a function on a background thread whenever a file changes.
+
+    Bursts of events (write, then rename) are coalesced: the callback runs
+    once the file has been quiet for settle seconds.
+    """
+
+    def __init__(self, path: str, callback: Callable[[], None], poll_interval: float = 2.0,
+                 settle: float = 0.2, use_inotify: bool = True):
+        """Initialize watcher (it starts watching once start() is called)."""
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.use_inotify = use_inotify
+        self.mode = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "FileWatcher":
+        """Start watching on a daemon thread."""
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        watch = _inotify_watch(os.path.dirname(self.path)) if self.use_inotify else None
+        if watch:
+            self.mode = "inotify"
+            target, args = self._inotify_loop, (watch[1],)
+        else:
+            self.mode = "polling"
+            target, args = self._poll_loop, ()
+        self._thread = threading.Thread(target=target, args=args, name="jarvis-file-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop watching."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _fire(self):
+        """Run the callback, keeping the watcher alive if it fails."""
+        try:
+            self.callback()
+        except Exception as e:
+            print(f"Error handling change to {self.path}: {e}")
+
+    def _inotify_loop(self, fd: int):
+        """Wait for inotify events naming the watched file."""
+        name = os.fsencode(os.path.basename(self.path))
+        try:
+            while not self._stop.is_set():
+                if not self._wait_readable(fd, 0.5):
+                    continue
+                if not self._read_events(fd, name):
+                    continue
+                # Let the writer finish (e.g. write temp file, then rename)
+                while self._wait_readable(fd, self.settle) and not self._stop.is_set():
+                    self._read_events(fd, name)
+                if not self._stop.is_set():
+                    self._fire()
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _wait_readable(fd: int, timeout: float) -> bool:
+        """Check if events are waiting, blocking up to timeout seconds."""
+        readable, _, _ = select.select([fd], [], [], timeout)
+        return bool(readable)
+
+    @staticmethod
+    def _read_events(fd: int, name: bytes) -> bool:
+        """Drain pending events; returns whether any concerned the watched file."""
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        matched = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            if data[offset:offset + length].rstrip(b"\0") == name:
+                matched = True
+            offset += length
+        return matched
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the file, or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _poll_loop(self):
+        """Compare the file's modification time and size every poll_interval seconds."""
+        last = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            current = self._signature()
+            if current != last:
+                last = current
+                self._fire()
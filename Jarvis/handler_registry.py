@@ -0,0 +1,133 @@
+"""Handler registry for Jarvis AI Assistant.
+
+Each capability declares its intents up front, but its code is only
+imported the first time one of those intents is routed to. An intent's
+handler is either the name of a JarvisAssistant method (built-in commands)
+or a ``"module:function"`` target, where relative modules are resolved
+against the Jarvis package. Target functions take the assistant as their
+first argument, followed by the query when the intent has pass_query set.
+
+Third-party handlers can register themselves by calling
+``registry.register(...)``, by listing a module with a ``register(registry)``
+function under ``handlers.plugins`` in the config, or by exposing such a
+function through the ``jarvis.handlers`` entry point group.
+"""
+
+import functools
+import importlib
+import sys
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+from .intent_router import Intent, IntentRouter, DEFAULT_INTENTS
+from .utils import ColorText
+
+ENTRY_POINT_GROUP = "jarvis.handlers"
+
+
+class HandlerRegistry:
+    """Holds the intent table and imports handler modules on first use."""
+
+    def __init__(self, intents: Iterable[Intent] = ()):
+        """Initialize registry with an initial intent table."""
+        self._intents: Dict[str, Intent] = {}
+        self._targets: Dict[str, Callable] = {}
+        self._router: Optional[IntentRouter] = None
+        self._plugins_loaded = False
+        self._lock = threading.Lock()
+        for intent in intents:
+            self.register(intent)
+
+    def register(self, intent: Intent, replace: bool = False):
+        """Add an intent; its handler module is not imported until it is routed to."""
+        with self._lock:
+            if intent.name in self._intents and not replace:
+                raise ValueError(f"Intent '{intent.name}' is already registered")
+            self._intents[intent.name] = intent
+            self._router = None
+
+    def unregister(self, name: str):
+        """Remove an intent by name."""
+        with self._lock:
+            if self._intents.pop(name, None) is not None:
+                self._router = None
+
+    @property
+    def intents(self) -> List[Intent]:
+        """Registered intents in registration order."""
+        return list(self._intents.values())
+
+    @property
+    def router(self) -> IntentRouter:
+        """Router compiled from the current intent table (rebuilt after changes)."""
+        router = self._router
+        if router is None:
+            with self._lock:
+                if self._router is None:
+                    self._router = IntentRouter(self._intents.values())
+                router = self._router
+        return router
+
+    def route(self, query: str) -> Optional[Intent]:
+        """Return the best matching intent for a query, or None."""
+        return self.router.route(query)
+
+    def get_handler(self, intent: Intent, assistant) -> Callable:
+        """Return a callable for the intent bound to the assistant."""
+        if ':' not in intent.handler:
+            return getattr(assistant, intent.handler)
+        return functools.partial(self._resolve(intent.handler), assistant)
+
+    def _resolve(self, target: str) -> Callable:
+        """Import a "module:function" target once and cache the function."""
+        func = self._targets.get(target)
+        if func is None:
+            module_name, _, attribute = target.partition(':')
+            module = importlib.import_module(module_name, package=__package__)
+            func = self._targets[target] = getattr(module, attribute)
+        return func
+
+    def loaded_modules(self) -> List[str]:
+        """Names of handler modules that have been imported so far."""
+        modules = set()
+        for intent in self.intents:
+            if ':' in intent.handler:
+                module_name = intent.handler.partition(':')[0]
+                if module_name.startswith('.'):
+                    module_name = __package__ + module_name
+                if module_name in sys.modules:
+                    modules.add(module_name)
+        return sorted(modules)
+
+    def load_plugins(self, modules: Iterable[str] = ()):
+        """Let third-party modules and entry points register their handlers (once)."""
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+
+        for module_name in modules:
+            try:
+                importlib.import_module(module_name).register(self)
+            except Exception as e:
+                ColorText.warning(f"Could not load handler plugin {module_name}: {e}")
+
+        for entry_point in _entry_points(ENTRY_POINT_GROUP):
+            try:
+                entry_point.load()(self)
+            except Exception as e:
+                ColorText.warning(f"Could not load handler plugin {entry_point.name}: {e}")
+
+
+def _entry_points(group: str) -> list:
+    """Installed entry points in a group (empty before Python 3.8)."""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return list(eps.select(group=group))
+    return list(eps.get(group, []))
+
+
+# Global handler registry
+registry = HandlerRegistry(DEFAULT_INTENTS)
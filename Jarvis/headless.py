@@ -0,0 +1,100 @@
+"""Headless text/batch driver for Jarvis AI Assistant."""
+
+import sys
+import time
+from typing import Dict, Iterable, List
+from .utils import ColorText, percentile
+
+
+class HeadlessDriver:
+    """Feeds text queries to JarvisAssistant and records handler latency."""
+
+    def __init__(self, lines: Iterable[str], echo: bool = True):
+        """Initialize driver with an iterable of query lines."""
+        self._lines = iter(lines)
+        self.echo = echo
+        self.responses: List[str] = []
+        self.latencies: Dict[str, List[float]] = {}
+        self.total_queries = 0
+        self.elapsed = 0.0
+
+    def next_command(self) -> str:
+        """Return the next non-empty, non-comment line, or '' when exhausted."""
+        for line in self._lines:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                return line
+        return ""
+
+    def sink(self, text: str) -> None:
+        """Collect speech output instead of sending it to the TTS engine."""
+        self.responses.append(text)
+        if self.echo:
+            print(f"🤖 {text}")
+
+    def run(self, assistant) -> None:
+        """Process every query until the input is exhausted or Jarvis exits."""
+        start = time.perf_counter()
+        try:
+            while assistant.running:
+                query = assistant.take_command()
+                if not query:
+                    break
+                if self.echo:
+                    ColorText.print_colored(f"👤 You: {query}", ColorText.CYAN)
+
+                t0 = time.perf_counter()
+                handler = assistant.process_command(query)
+                duration = time.perf_counter() - t0
+
+                self.latencies.setdefault(handler, []).append(duration)
+                self.total_queries += 1
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+    def report(self) -> str:
+        """Format per-handler latency percentiles and overall throughput."""
+        lines = [
+            "",
+            f"{'handler':<16}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+            "-" * 63,
+        ]
+        for handler, samples in sorted(self.latencies.items(), key=lambda item: -len(item[1])):
+            ms = [s * 1000 for s in samples]
+            lines.append(
+                f"{handler:<16}{len(ms):>7}{percentile(ms, 50):>10.2f}"
+                f"{percentile(ms, 90):>10.2f}{percentile(ms, 99):>10.2f}{max(ms):>10.2f}"
+            )
+        qps = self.total_queries / self.elapsed if self.elapsed > 0 else 0.0
+        lines.append("-" * 63)
+        lines.append(f"{self.total_queries} queries in {self.elapsed:.2f}s ({qps:.1f} queries/sec)")
+        return "\n".join(lines)
+
+
+def run_script(path: str, echo: bool = True, assistant_factory=None) -> int:
+    """Run queries from a file (or stdin for '-') and print a throughput report."""
+    if assistant_factory is None:
+        from .jarvis import JarvisAssistant
+        assistant_factory = JarvisAssistant
+
+    try:
+        stream = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8')
+    except OSError as e:
+        ColorText.error(f"Cannot read script {path}: {e}")
+        return 1
+
+    driver = HeadlessDriver(stream, echo=echo)
+    assistant = None
+    try:
+        assistant = assistant_factory(speech_sink=driver.sink, command_source=driver.next_command)
+        driver.run(assistant)
+    except KeyboardInterrupt:
+        ColorText.warning("\nKeyboard interrupt received")
+    finally:
+        if assistant is not None:
+            assistant.shutdown()
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(driver.report())
+    return 0
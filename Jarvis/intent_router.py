@@ -0,0 +1,183 @@
+"""Keyword-indexed intent routing for Jarvis AI Assistant."""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class Intent:
+    """A declarative routing rule mapping keywords to a handler."""
+
+    __slots__ = ('name', 'handler', 'keywords', 'require', 'exclude', 'priority', 'pass_query')
+
+    def __init__(self, name: str, handler: str, keywords: Sequence[str],
+                 require: Sequence[Sequence[str]] = (), exclude: Sequence[str] = (),
+                 priority: int = 0, pass_query: bool = True):
+        """Create an intent.
+
+        An intent matches when at least one of ``keywords`` occurs in the query,
+        every group in ``require`` has at least one keyword present and none of
+        ``exclude`` occur. When several intents match, the highest ``priority``
+        wins; ties go to the intent declared first.
+        """
+        self.name = name
+        self.handler = handler
+        self.keywords = tuple(keywords)
+        self.require = tuple(tuple(group) for group in require)
+        self.exclude = tuple(exclude)
+        self.priority = priority
+        self.pass_query = pass_query
+
+    def __repr__(self) -> str:
+        return f"Intent({self.name!r}, priority={self.priority})"
+
+
+_TOKEN_PATTERN = re.compile(r"[\w']+|[^\w\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into word and symbol tokens."""
+    return _TOKEN_PATTERN.findall(text)
+
+
+class KeywordIndex:
+    """Finds every keyword phrase in a query with set lookups.
+
+    Single-word keywords are intersected with the query's tokens; phrases are
+    indexed by their first token and only checked, as space-delimited
+    substrings, when that token occurs.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """Index keyword phrases by their tokens."""
+        self._words: Set[str] = set()
+        self._phrases: Dict[str, List[Tuple[str, str]]] = {}
+        for keyword in set(keywords):
+            tokens = tokenize(keyword)
+            if len(tokens) == 1:
+                self._words.add(tokens[0])
+            elif tokens:
+                pattern = " " + " ".join(tokens) + " "
+                self._phrases.setdefault(tokens[0], []).append((pattern, keyword))
+        self._phrase_starts = frozenset(self._phrases)
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords occurring in text as whole words."""
+        # Words and apostrophes between single spaces split exactly as tokenize() would
+        if text.replace(" ", "").replace("'", "").isalnum():
+            tokens = text.split()
+        else:
+            tokens = tokenize(text)
+        found = self._words.intersection(tokens)
+        if not self._phrase_starts.isdisjoint(tokens):
+            padded = " " + " ".join(tokens) + " "
+            for start in self._phrase_starts.intersection(tokens):
+                for pattern, keyword in self._phrases[start]:
+                    if pattern in padded:
+                        found.add(keyword)
+        return found
+
+
+class IntentRouter:
+    """Routes queries to intents using a precompiled keyword index."""
+
+    MAX_DECISIONS = 1024  # Remembered keyword combinations before starting over
+
+    def __init__(self, intents: Iterable[Intent]):
+        """Compile the intent table into a keyword index."""
+        # Order once by priority so the first satisfied candidate wins
+        indexed = list(enumerate(intents))
+        indexed.sort(key=lambda item: (-item[1].priority, item[0]))
+        self.intents: List[Intent] = [intent for _, intent in indexed]
+
+        # keyword -> [(rank, intent, exclude set, require sets)], precomputed for route()
+        self._by_keyword: Dict[str, List[Tuple]] = {}
+        vocabulary = set()
+        for rank, intent in enumerate(self.intents):
+            entry = (rank, intent, frozenset(intent.exclude),
+                     tuple(frozenset(group) for group in intent.require))
+            for keyword in intent.keywords:
+                self._by_keyword.setdefault(keyword, []).append(entry)
+            vocabulary.update(intent.keywords)
+            vocabulary.update(intent.exclude)
+            for group in intent.require:
+                vocabulary.update(group)
+        self._index = KeywordIndex(vocabulary)
+        # The winner depends only on which keywords were found, and few combinations occur
+        self._decisions: Dict[frozenset, Optional[Intent]] = {}
+
+    def route(self, query: str) -> Optional[Intent]:
+        """Return the best matching intent for a query, or None."""
+        if not query:
+            return None
+        found = self._index.find(query)
+        if not found:
+            return None
+
+        key = frozenset(found)
+        try:
+            return self._decisions[key]
+        except KeyError:
+            pass
+        best = self._decide(found)
+        if len(self._decisions) >= self.MAX_DECISIONS:
+            self._decisions.clear()
+        self._decisions[key] = best
+        return best
+
+    def _decide(self, found: Set[str]) -> Optional[Intent]:
+        """Pick the highest ranked intent satisfied by the found keywords."""
+        best = None
+        best_rank = len(self.intents)
+        for keyword in found:
+            for rank, intent, exclude, require in self._by_keyword.get(keyword, ()):
+                if rank >= best_rank:
+                    continue
+                if exclude and not found.isdisjoint(exclude):
+                    continue
+                if all(not found.isdisjoint(group) for group in require):
+                    best, best_rank = intent, rank
+        return best
+
+
+WEBSITES = ["youtube", "google", "github", "facebook", "twitter"]
+MATH_OPERATORS = ['+', '-', '*', '/', 'plus', 'minus', 'times', 'divided']
+
+# Routing table for JarvisAssistant. Handlers name methods on the assistant or
+# "module:function" targets in the skills package, which the handler registry
+# imports on first use. Higher priorities are checked first so specific phrases
+# beat generic words.
+DEFAULT_INTENTS = [
+    Intent('latency_report', 'handle_latency_report', ["latency report", "performance report"],
+           priority=96, pass_query=False),
+    Intent('list_reminders', '.skills.reminders:handle_list_reminders', ["list reminder", "list reminders", "my reminders"],
+           priority=95, pass_query=False),
+    Intent('calculation', '.skills.calculator:handle_calculation', ["calculate", "compute", "what is", "what's"],
+           require=[MATH_OPERATORS], priority=92),
+    Intent('news', '.skills.news:handle_news', ["news"], priority=91),
+    Intent('time', 'handle_time', ["time"], priority=90, pass_query=False),
+    Intent('date', 'handle_date', ["date"], priority=85, pass_query=False),
+    Intent('wikipedia', 'handle_wikipedia', ["wikipedia"], priority=80),
+    Intent('website', 'handle_website', ["open"], require=[WEBSITES], priority=76),
+    Intent('web_search', 'handle_web_search', ["google", "search"], priority=75),
+    Intent('music', 'handle_music', ["play"], require=[["music", "song", "youtube"]], priority=70),
+    Intent('joke', 'handle_joke', ["joke"], priority=65, pass_query=False),
+    Intent('battery', '.skills.system:handle_battery', ["battery"], priority=60, pass_query=False),
+    Intent('cpu', '.skills.system:handle_cpu', ["cpu"], priority=59, pass_query=False),
+    Intent('memory', '.skills.system:handle_memory', ["memory", "ram"], priority=58, pass_query=False),
+    Intent('internet', '.skills.system:handle_internet', ["internet"], priority=57, pass_query=False),
+    Intent('volume', '.skills.system:handle_volume', ["volume"], priority=55),
+    Intent('brightness', '.skills.system:handle_brightness', ["brightness"], priority=54),
+    Intent('open_app', '.skills.system:handle_open_app', ["open", "launch", "start"],
+           exclude=["youtube", "google", "website"], priority=50),
+    Intent('close_app', '.skills.system:handle_close_app', ["close", "exit"], priority=49),
+    Intent('whatsapp', '.skills.whatsapp:handle_whatsapp', ["whatsapp"], priority=45),
+    Intent('reminder', '.skills.reminders:handle_reminder', ["remind me", "reminder", "set reminder"], priority=40),
+    Intent('voice_change', 'handle_voice_change', ["change voice", "change your voice"], priority=35),
+    Intent('screenshot', 'handle_screenshot', ["screenshot", "screen shot"], priority=30),
+    Intent('shutdown', '.skills.system:handle_shutdown', ["shutdown"], priority=25),
+    Intent('restart', '.skills.system:handle_restart', ["restart"], priority=24),
+    Intent('sleep', '.skills.system:handle_sleep', ["sleep"], require=[["system", "computer"]], priority=23, pass_query=False),
+    Intent('lock', '.skills.system:handle_lock', ["lock"], priority=22, pass_query=False),
+    Intent('weather', '.skills.weather:handle_weather', ["weather"], priority=15),
+    Intent('exit', 'handle_exit', ["offline", "exit", "quit", "goodbye", "bye"], priority=10, pass_query=False),
+]
@@ -16,30 +16,30 @@ Features:
 
 import os
 import sys
-import datetime
 import speech_recognition as sr
-import wikipedia
 import webbrowser as wb
 import random
-import pyautogui
-import pyjokes
 import re
+import signal
+import time
+from typing import Callable, Optional
+
+if __package__ in (None, ""):
+    # Allow running as a script (python jarvis.py) as well as python -m Jarvis
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
 
 # Import new modules
 try:
-    from config import config
-    from voice_manager import voice_manager
-    from ai_engine import ai_engine
-    from system_control import system_control
-    from whatsapp_handler import whatsapp_handler
-    from news_handler import news_handler
-    from reminder_manager import init_reminder_manager
-    from calculator import calculator
-    from weather_handler import weather_handler
-    from utils import (
+    from .cancellation import CancellationToken, OperationCancelled
+    from .config import config
+    from .voice_manager import voice_manager
+    from .ai_engine import ai_engine
+    from .handler_registry import registry
+    from .tracing import tracer
+    from .utils import (
         get_greeting, format_time, format_date,
-        extract_number, extract_percentage,
-        ColorText, sanitize_filename
+        iter_in_background, ColorText, sanitize_filename
     )
 except ImportError as e:
     print(f"Import error: {e}")
@@ -50,22 +50,72 @@ except ImportError as e:
 class JarvisAssistant:
     """Main Jarvis AI Assistant class."""
     
-    def __init__(self):
-        """Initialize Jarvis assistant."""
+    # Shared intent table; capability modules are imported on first use
+    registry = registry
+    
+    def __init__(self, speech_sink: Optional[Callable[[str], None]] = None,
+                 command_source: Optional[Callable[[], str]] = None):
+        """Initialize Jarvis assistant.
+        
+        speech_sink replaces printing and text-to-speech for everything the
+        assistant says, and command_source replaces the microphone. Both are
+        used by the headless driver.
+        """
         self.recognizer = sr.Recognizer()
         self.assistant_name = config.get('assistant_name', 'Jarvis')
         self.running = True
-        
-        # Initialize reminder manager with voice callback
-        self.reminder_manager = init_reminder_manager(voice_callback=self.speak)
+        self.speech_sink = speech_sink
+        self.command_source = command_source
+        self.audio_input = None
+        self._audio_input_failed = False
+        # Cancelled when the user talks over the command being handled
+        self.cancel_token: Optional[CancellationToken] = None
+        self._interrupted = False
+        self.speech_backend, self.fallback_backend = self._load_speech_backends()
+        self.registry.load_plugins(config.get('handlers.plugins', []))
+        # Connect to the AI and web services while the greeting plays
+        from .network import start_warmup
+        self.warmer = start_warmup()
+        # Pick up edits to data/config.json without a restart
+        self.config_watcher = None
+        if config.get('config_reload.enabled', True):
+            self.config_watcher = config.watch(config.get('config_reload.poll_seconds', 2))
+        
+        # Reminders saved by an earlier session must still fire, so only defer
+        # the scheduler when there is nothing pending
+        self._reminder_manager = None
+        from .reminder_manager import ReminderManager
+        if ReminderManager.has_active_reminders():
+            self.reminder_manager
         
         ColorText.info(f"Initializing {self.assistant_name}...")
         self.wishme()
     
     def speak(self, text: str) -> None:
-        """Speak the given text."""
+        """Speak the given text (nothing more is said once the command is interrupted)."""
+        token = self.cancel_token
+        if token and token.cancelled:
+            return
+        if self.speech_sink:
+            self.speech_sink(text)
+            return
         print(f"🤖 {self.assistant_name}: {text}")
-        voice_manager.speak(text)
+        voice_manager.speak(text, token)
+    
+    def barge_in(self) -> None:
+        """Interrupt the command being handled: abort its requests and stop speaking."""
+        token = self.cancel_token
+        if token and not token.cancelled:
+            self._interrupted = True
+            token.cancel()
+    
+    @property
+    def reminder_manager(self):
+        """Reminder manager, started on first use."""
+        if self._reminder_manager is None:
+            from .reminder_manager import init_reminder_manager
+            self._reminder_manager = init_reminder_manager(voice_callback=self.speak)
+        return self._reminder_manager
     
     def wishme(self) -> None:
         """Greet the user based on time of day."""
@@ -75,42 +125,176 @@ class JarvisAssistant:
     
     def take_command(self) -> str:
         """Take microphone input and return as text."""
+        # Answering a follow-up question must not count as interrupting it
+        token, self.cancel_token = self.cancel_token, None
+        try:
+            if self.command_source:
+                return self.command_source().strip().lower()
+            
+            # Anything captured while Jarvis was talking is not a new command,
+            # unless it interrupted Jarvis
+            if self.audio_input and not self._interrupted:
+                self.audio_input.discard_pending()
+            self._interrupted = False
+            
+            audio = self.listen()
+            if audio is None:
+                return ""
+            return self.recognize(audio)
+        finally:
+            self.cancel_token = token
+    
+    def _load_speech_backends(self):
+        """Create the configured recognizer and an offline fallback for it."""
+        from .speech_backends import create_backend, BACKENDS
+        
+        options = {
+            'language': config.get('speech.language', 'en-in'),
+            'vosk_model_path': config.get('speech.vosk_model_path', ''),
+            'whisper_model': config.get('speech.whisper_model', 'base.en'),
+        }
+        name = config.get('speech.recognizer', 'google')
+        offline_name = config.get('speech.offline_recognizer', 'vosk')
+        if name not in BACKENDS:
+            ColorText.warning(f"Unknown speech recognizer '{name}', using google")
+            name = 'google'
+        if offline_name not in BACKENDS or not BACKENDS[offline_name].offline:
+            ColorText.warning(f"Unknown offline speech recognizer '{offline_name}', using vosk")
+            offline_name = 'vosk'
+        
+        if config.get('features.offline_mode', False) and not BACKENDS[name].offline:
+            name = offline_name
+        
+        backend = create_backend(name, self.recognizer, **options)
+        if not backend.is_configured():
+            # Every command would fail the same way; say it once here instead
+            ColorText.warning(f"Speech recognizer '{name}' is not configured (speech.vosk_model_path); "
+                              f"voice commands will not be recognized")
+        fallback = None
+        if not backend.offline and offline_name in BACKENDS and offline_name != name:
+            fallback = create_backend(offline_name, self.recognizer, **options)
+            if not fallback.is_configured():
+                fallback = None
+        return backend, fallback
+    
+    def _get_audio_input(self):
+        """Start the persistent microphone stream on first use.
+        
+        Returns None, and stays on per-command capture, if the stream
+        cannot be opened or its capture thread has died.
+        """
+        if self.audio_input is not None and not self.audio_input.is_running():
+            ColorText.warning(f"Continuous listening stopped ({self.audio_input.error}), calibrating per command")
+            self.audio_input.stop()
+            self.audio_input = None
+            self._audio_input_failed = True
+        if self.audio_input is None and not self._audio_input_failed:
+            if not config.get('speech.continuous_listening', True):
+                self._audio_input_failed = True
+                return None
+            try:
+                from .audio_input import ContinuousListener
+                
+                listener = ContinuousListener(
+                    self.recognizer,
+                    pause_threshold=config.get('speech.pause_threshold', 1.0),
+                    phrase_time_limit=config.get('speech.phrase_time_limit', 10),
+                    calibration_duration=config.get('speech.calibration_duration', 1.0),
+                    on_speech_start=self.barge_in if config.get('speech.barge_in', False) else None,
+                    # A headset keeps Jarvis's voice out of the microphone
+                    is_playing=None if config.get('speech.headset', False) else lambda: voice_manager.is_speaking,
+                    playback_factor=config.get('speech.barge_in_echo_factor', 3.0)
+                )
+                listener.start()
+                self.audio_input = listener
+            except Exception as e:
+                ColorText.warning(f"Continuous listening unavailable ({e}), calibrating per command")
+                self._audio_input_failed = True
+        return self.audio_input
+    
+    def listen(self) -> Optional[sr.AudioData]:
+        """Capture a single utterance from the microphone."""
+        with tracer.span('stage.listen'):
+            return self._listen()
+    
+    def _listen(self) -> Optional[sr.AudioData]:
+        """Capture audio from the persistent stream or a fresh microphone."""
+        audio_input = self._get_audio_input()
+        if audio_input:
+            ColorText.info("Listening...")
+            # Wait for a phrase to start (5s) and finish (phrase limit)
+            audio = audio_input.get_audio(timeout=5 + config.get('speech.phrase_time_limit', 10))
+            if audio is not None or audio_input.error is None:
+                return audio
+            # The stream died while waiting: report it and listen on a fresh microphone instead
+            self._get_audio_input()
+        
         with sr.Microphone() as source:
             ColorText.info("Listening...")
             self.recognizer.pause_threshold = 1
             self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
             
             try:
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
-                ColorText.info("Recognizing...")
-                
-                query = self.recognizer.recognize_google(audio, language="en-in")
-                ColorText.print_colored(f"👤 You: {query}", ColorText.CYAN)
-                return query.lower()
-            
+                return self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
             except sr.WaitTimeoutError:
-                return ""
-            except sr.UnknownValueError:
-                return ""
-            except sr.RequestError:
-                ColorText.error("Speech recognition service unavailable")
-                return ""
+                return None
             except Exception as e:
                 ColorText.error(f"Error: {e}")
-                return ""
+                return None
+    
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Convert captured audio to lower-case text."""
+        with tracer.span('stage.recognize'):
+            return self._recognize(audio)
+    
+    def _recognize(self, audio: sr.AudioData) -> str:
+        """Run the configured speech backend."""
+        try:
+            ColorText.info("Recognizing...")
+            try:
+                query = self.speech_backend.recognize(audio)
+            except sr.RequestError:
+                # Cloud recognizer unreachable: try the local engine instead
+                if not self.fallback_backend:
+                    raise
+                query = self.fallback_backend.recognize(audio)
+            ColorText.print_colored(f"👤 You: {query}", ColorText.CYAN)
+            return query.lower()
+        
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            # An unconfigured backend was already reported at startup
+            if self.speech_backend.is_configured():
+                ColorText.error(f"Speech recognition service unavailable: {e}")
+            return ""
+        except Exception as e:
+            ColorText.error(f"Error: {e}")
+            return ""
     
     def get_ai_response(self, query: str) -> bool:
         """Get AI-powered response if available."""
-        if ai_engine.is_available():
-            response = ai_engine.get_ai_response(query)
-            if response:
-                self.speak(response)
-                return True
+        if not ai_engine.is_available():
+            return False
+        
+        if config.snapshot.ai_settings.stream:
+            # Generation continues in the background while earlier sentences are spoken
+            spoken = False
+            token = self.cancel_token
+            for sentence in iter_in_background(ai_engine.stream_ai_response(query, token=token), token=token):
+                self.speak(sentence)
+                spoken = True
+            return spoken
+        
+        response = ai_engine.get_ai_response(query, token=self.cancel_token)
+        if response:
+            self.speak(response)
+            return True
         return False
     
     def handle_time(self):
         """Tell current time."""
-        current_time = format_time(config.get('preferences.time_format', '12h'))
+        current_time = format_time(config.snapshot.preferences.time_format)
         self.speak(f"The current time is {current_time}")
     
     def handle_date(self):
@@ -126,13 +310,17 @@ class JarvisAssistant:
             search_query = self.take_command()
         
         if search_query:
-            try:
-                self.speak("Searching Wikipedia...")
-                result = wikipedia.summary(search_query, sentences=2)
-                self.speak(result)
-            except wikipedia.exceptions.DisambiguationError as e:
+            from .wikipedia_handler import wikipedia_handler
+            
+            self.speak("Searching Wikipedia...")
+            result = wikipedia_handler.get_summary(search_query, token=self.cancel_token)
+            if result['type'] == 'summary':
+                self.speak(result['text'])
+            elif result['type'] == 'disambiguation':
                 self.speak("Multiple results found. Please be more specific.")
-            except Exception:
+                if result['options']:
+                    self.speak(f"For example: {', '.join(result['options'][:3])}")
+            else:
                 self.speak("I couldn't find anything on Wikipedia.")
     
     def handle_web_search(self, query: str):
@@ -182,6 +370,8 @@ class JarvisAssistant:
                 filename = sanitize_filename(parts[1].strip()) + ".png"
         
         try:
+            import pyautogui
+            
             img = pyautogui.screenshot()
             img_path = os.path.expanduser(f"~\\Pictures\\{filename}")
             img.save(img_path)
@@ -193,218 +383,20 @@ class JarvisAssistant:
     
     def handle_joke(self):
         """Tell a joke."""
+        import pyjokes
+        
         joke = pyjokes.get_joke()
         self.speak(joke)
     
-    def handle_battery(self):
-        """Check battery status."""
-        battery = system_control.get_battery_status()
-        if battery:
-            percentage = battery['percentage']
-            charging = "charging" if battery['charging'] else "not charging"
-            self.speak(f"Battery is at {percentage}% and {charging}")
-            
-            if battery['time_remaining']:
-                hours = battery['time_remaining'] // 3600
-                minutes = (battery['time_remaining'] % 3600) // 60
-                if hours > 0:
-                    self.speak(f"Approximately {hours} hours and {minutes} minutes remaining")
-                else:
-                    self.speak(f"Approximately {minutes} minutes remaining")
-        else:
-            self.speak("Unable to get battery information")
-    
-    def handle_cpu(self):
-        """Check CPU usage."""
-        cpu = system_control.get_cpu_usage()
-        if cpu:
-            self.speak(f"CPU usage is at {cpu['total']}%")
-            self.speak(f"Your system has {cpu['cores']} cores and {cpu['threads']} threads")
-    
-    def handle_memory(self):
-        """Check RAM usage."""
-        memory = system_control.get_memory_usage()
-        if memory:
-            self.speak(f"RAM usage is at {memory['percentage']}%")
-            self.speak(f"{memory['used']} used out of {memory['total']} total memory")
-    
-    def handle_internet(self):
-        """Check internet connection."""
-        if system_control.check_internet_connection():
-            self.speak("Internet connection is active")
-        else:
-            self.speak("No internet connection detected")
-    
-    def handle_volume(self, query: str):
-        """Control system volume."""
-        try:
-            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-            from comtypes import CLSCTX_ALL
-            
-            devices = AudioUtilities.GetSpeakers()
-            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            volume = interface.QueryInterface(IAudioEndpointVolume)
-            
-            if "mute" in query:
-                volume.SetMute(1, None)
-                self.speak("Volume muted")
-            elif "unmute" in query:
-                volume.SetMute(0, None)
-                self.speak("Volume unmuted")
-            elif "set" in query or "to" in query:
-                level = extract_percentage(query)
-                if level is not None:
-                    volume.SetMasterVolumeLevelScalar(level / 100, None)
-                    self.speak(f"Volume set to {level}%")
-            elif "increase" in query or "up" in query:
-                current = volume.GetMasterVolumeLevelScalar() * 100
-                new_level = min(100, current + 10)
-                volume.SetMasterVolumeLevelScalar(new_level / 100, None)
-                self.speak(f"Volume increased to {int(new_level)}%")
-            elif "decrease" in query or "down" in query:
-                current = volume.GetMasterVolumeLevelScalar() * 100
-                new_level = max(0, current - 10)
-                volume.SetMasterVolumeLevelScalar(new_level / 100, None)
-                self.speak(f"Volume decreased to {int(new_level)}%")
-            else:
-                current = int(volume.GetMasterVolumeLevelScalar() * 100)
-                self.speak(f"Current volume is {current}%")
-        except Exception as e:
-            ColorText.error(f"Error controlling volume: {e}")
-            self.speak("Unable to control volume")
-    
-    def handle_brightness(self, query: str):
-        """Control screen brightness."""
-        try:
-            import screen_brightness_control as sbc
-            
-            if "set" in query or "to" in query:
-                level = extract_percentage(query)
-                if level is not None:
-                    sbc.set_brightness(level)
-                    self.speak(f"Brightness set to {level}%")
-            elif "increase" in query or "up" in query:
-                current = sbc.get_brightness()[0]
-                new_level = min(100, current + 10)
-                sbc.set_brightness(new_level)
-                self.speak(f"Brightness increased to {int(new_level)}%")
-            elif "decrease" in query or "down" in query:
-                current = sbc.get_brightness()[0]
-                new_level = max(0, current - 10)
-                sbc.set_brightness(new_level)
-                self.speak(f"Brightness decreased to {int(new_level)}%")
-            else:
-                current = int(sbc.get_brightness()[0])
-                self.speak(f"Current brightness is {current}%")
-        except Exception as e:
-            ColorText.error(f"Error controlling brightness: {e}")
-            self.speak("Unable to control brightness")
-    
-    def handle_open_app(self, query: str):
-        """Open an application."""
-        app_name = query.replace("open", "").replace("launch", "").replace("start", "").strip()
-        if app_name:
-            if system_control.open_application(app_name):
-                self.speak(f"Opening {app_name}")
-            else:
-                self.speak(f"Unable to open {app_name}")
-    
-    def handle_close_app(self, query: str):
-        """Close an application."""
-        app_name = query.replace("close", "").replace("exit", "").replace("quit", "").strip()
-        if app_name:
-            if system_control.close_application(app_name):
-                self.speak(f"Closing {app_name}")
-            else:
-                self.speak(f"Unable to close {app_name}")
-    
-    def handle_news(self, query: str):
-        """Get news updates."""
-        if not news_handler.is_available():
-            self.speak("News API key not configured. Please add your NewsAPI key to the .env file")
-            return
-        
-        category = None
-        if "technology" in query:
-            category = "technology"
-        elif "sports" in query:
-            category = "sports"
-        elif "business" in query:
-            category = "business"
-        elif "health" in query:
-            category = "health"
-        elif "science" in query:
-            category = "science"
-        elif "entertainment" in query:
-            category = "entertainment"
-        
-        self.speak("Fetching latest news...")
-        articles = news_handler.get_top_headlines(category=category, max_results=5)
-        
-        if articles:
-            news_text = news_handler.format_news(articles, max_articles=3)
-            self.speak("Here are the top headlines:")
-            self.speak(news_text)
-        else:
-            self.speak("Unable to fetch news at the moment")
-    
-    def handle_reminder(self, query: str):
-        """Set a reminder."""
-        # Extract reminder message and time
-        if "to" in query:
-            parts = query.split("to", 1)
-            if len(parts) > 1:
-                remainder = parts[1].strip()
-                
-                # Try to split by time indicators
-                time_indicators = ["at", "in", "tomorrow"]
-                message = remainder
-                time_str = ""
-                
-                for indicator in time_indicators:
-                    if indicator in remainder:
-                        parts = remainder.split(indicator, 1)
-                        message = parts[0].strip()
-                        time_str = indicator + " " + parts[1].strip()
-                        break
-                
-                if not time_str:
-                    # Default to 1 hour if no time specified
-                    time_str = "in 1 hour"
-                
-                reminder_time = self.reminder_manager.parse_reminder_time(time_str)
-                if reminder_time:
-                    reminder_id = self.reminder_manager.add_reminder(message, reminder_time)
-                    if reminder_id:
-                        time_desc = reminder_time.strftime("%I:%M %p on %B %d")
-                        self.speak(f"Reminder set: {message} at {time_desc}")
-                        ColorText.success(f"Reminder created: {reminder_id}")
-                    else:
-                        self.speak("Failed to set reminder")
-                else:
-                    self.speak("I couldn't understand the time. Please try again")
-        else:
-            self.speak("Please tell me what you want to be reminded about and when")
-    
-    def handle_list_reminders(self):
-        """List all active reminders."""
-        reminders = self.reminder_manager.list_reminders(active_only=True)
-        if reminders:
-            self.speak(f"You have {len(reminders)} active reminders:")
-            for i, reminder in enumerate(reminders[:5], 1):
-                time = datetime.datetime.fromisoformat(reminder['time'])
-                self.speak(f"{i}. {reminder['message']} at {time.strftime('%I:%M %p')}")
-        else:
-            self.speak("You have no active reminders")
-    
     def handle_voice_change(self, query: str):
         """Change voice settings."""
-        if "male" in query:
-            voice_manager.set_voice_by_gender("male")
-            self.speak("Voice changed to male")
-        elif "female" in query:
+        # "female" first, since it contains "male"
+        if "female" in query:
             voice_manager.set_voice_by_gender("female")
             self.speak("Voice changed to female")
+        elif "male" in query:
+            voice_manager.set_voice_by_gender("male")
+            self.speak("Voice changed to male")
         elif "next" in query or "change" in query:
             voice_id = voice_manager.cycle_voice()
             voice_info = voice_manager.get_current_voice_info()
@@ -413,39 +405,6 @@ class JarvisAssistant:
             voices = voice_manager.get_available_voices()
             self.speak(f"There are {len(voices)} voices available. Say 'male voice' or 'female voice' to change")
     
-    def handle_shutdown(self, query: str):
-        """Shutdown the system."""
-        delay = extract_number(query)
-        if delay:
-            self.speak(f"Shutting down in {delay} minutes")
-            system_control.shutdown(delay * 60)
-        else:
-            self.speak("Shutting down now. Goodbye!")
-            system_control.shutdown(5)
-        self.running = False
-    
-    def handle_restart(self, query: str):
-        """Restart the system."""
-        delay = extract_number(query)
-        if delay:
-            self.speak(f"Restarting in {delay} minutes")
-            system_control.restart(delay * 60)
-        else:
-            self.speak("Restarting now. See you soon!")
-            system_control.restart(5)
-        self.running = False
-    
-    def handle_sleep(self):
-        """Put system to sleep."""
-        self.speak("Putting system to sleep. Goodbye!")
-        system_control.sleep()
-        self.running = False
-    
-    def handle_lock(self):
-        """Lock the screen."""
-        self.speak("Locking screen")
-        system_control.lock_screen()
-    
     def handle_website(self, query: str):
         """Open a website."""
         sites = {
@@ -469,162 +428,139 @@ class JarvisAssistant:
         
         self.speak("Which website would you like to open?")
     
-    def handle_calculation(self, query: str):
-        """Perform calculations."""
-        result = calculator.parse_calculation(query)
-        if result:
-            self.speak(f"The answer is {result}")
-        else:
-            self.speak("I couldn't understand that calculation. Please try again.")
+    def handle_latency_report(self):
+        """Print latency histograms for every traced stage and handler."""
+        tracer.dump()
+        self.speak("I've printed the latency report")
     
-    def handle_weather(self, query: str):
-        """Get weather information."""
-        if not weather_handler.is_available():
-            self.speak("Weather API key not configured. Please add your OpenWeatherMap API key to the .env file")
-            return
-        
-        # Extract city name
-        city = query.replace("weather", "").replace("in", "").replace("at", "").replace("for", "").strip()
-        
-        if not city:
-            city = "London"  # Default city
-        
-        self.speak(f"Checking weather for {city}")
-        weather = weather_handler.get_current_weather(city)
-        
-        if weather:
-            weather_text = weather_handler.format_weather(weather)
-            self.speak(weather_text)
-        else:
-            self.speak(f"Unable to fetch weather information for {city}")
-
+    def handle_exit(self):
+        """Go offline and stop the main loop."""
+        self.speak("Going offline. Have a great day!")
+        self.running = False
     
-    def process_command(self, query: str):
-        """Process voice command."""
+    def process_command(self, query: str) -> Optional[str]:
+        """Process voice command and return the name of the handler used."""
         if not query:
-            return
-        
-        # Time and date
-        if "time" in query:
-            self.handle_time()
-        
-        elif "date" in query:
-            self.handle_date()
-        
-        # Web and search
-        elif "wikipedia" in query:
-            self.handle_wikipedia(query)
-        
-        elif "google" in query or "search" in query:
-            self.handle_web_search(query)
-        
-        elif "open youtube" in query or "open google" in query or "open" in query and any(site in query for site in ["youtube", "google", "github", "facebook", "twitter"]):
-            self.handle_website(query)
-        
-        # Music and entertainment
-        elif "play" in query and ("music" in query or "song" in query or "youtube" in query):
-            self.handle_music(query)
-        
-        elif "joke" in query:
-            self.handle_joke()
-        
-        # System monitoring
-        elif "battery" in query:
-            self.handle_battery()
-        
-        elif "cpu" in query:
-            self.handle_cpu()
-        
-        elif "memory" in query or "ram" in query:
-            self.handle_memory()
-        
-        elif "internet" in query:
-            self.handle_internet()
-        
-        # System control
-        elif "volume" in query:
-            self.handle_volume(query)
-        
-        elif "brightness" in query:
-            self.handle_brightness(query)
-        
-        elif ("open" in query or "launch" in query or "start" in query) and not any(x in query for x in ["youtube", "google", "website"]):
-            self.handle_open_app(query)
+            return None
         
-        elif "close" in query or "exit" in query:
-            self.handle_close_app(query)
-        
-        # News
-        elif "news" in query:
-            self.handle_news(query)
-        
-        # Reminders
-        elif "remind me" in query or "reminder" in query or "set reminder" in query:
-            self.handle_reminder(query)
-        
-        elif "list reminder" in query or "my reminders" in query:
-            self.handle_list_reminders()
-        
-        # Voice control
-        elif "change voice" in query or "change your voice" in query:
-            self.handle_voice_change(query)
-        
-        # Screenshots
-        elif "screenshot" in query or "screen shot" in query:
-            self.handle_screenshot(query)
-        
-        # Power control
-        elif "shutdown" in query:
-            self.handle_shutdown(query)
-        
-        elif "restart" in query:
-            self.handle_restart(query)
-        
-        elif "sleep" in query and ("system" in query or "computer" in query):
-            self.handle_sleep()
-        
-        elif "lock" in query:
-            self.handle_lock()
-        
-        # Calculator
-        elif any(word in query for word in ["calculate", "compute", "what is", "what's"]) and any(c in query for c in ['+', '-', '*', '/', 'plus', 'minus', 'times', 'divided']):
-            self.handle_calculation(query)
-        
-        # Weather
-        elif "weather" in query:
-            self.handle_weather(query)
-        
-        # Exit commands
-        elif any(word in query for word in ["offline", "exit", "quit", "goodbye", "bye"]):
-            self.speak("Going offline. Have a great day!")
-            self.running = False
+        self.cancel_token = CancellationToken()
+        try:
+            return self._dispatch(query)
+        except OperationCancelled:
+            ColorText.info("Interrupted")
+            return "cancelled"
+        finally:
+            self.cancel_token = None
+    
+    def _dispatch(self, query: str) -> str:
+        """Run the handler for a query."""
+        with tracer.span('stage.route'):
+            intent = self.registry.route(query)
+        if intent:
+            handler = self.registry.get_handler(intent, self)
+            with tracer.span(f'handler.{intent.name}'):
+                if intent.pass_query:
+                    handler(query)
+                else:
+                    handler()
+            return intent.name
         
         # Try AI response for unmatched queries
-        else:
-            if not self.get_ai_response(query):
-                self.speak("I'm not sure how to help with that. Please try rephrasing your request.")
+        with tracer.span('handler.ai'):
+            if self.get_ai_response(query):
+                return "ai"
+            self.speak("I'm not sure how to help with that. Please try rephrasing your request.")
+        return "unknown"
     
     def run(self):
         """Main run loop."""
         try:
             while self.running:
+                start = time.perf_counter()
                 query = self.take_command()
                 if query:
                     self.process_command(query)
+                    tracer.record('turn', time.perf_counter() - start)
         
         except KeyboardInterrupt:
             ColorText.warning("\nKeyboard interrupt received")
             self.speak("Shutting down")
         
         finally:
-            # Cleanup
-            if self.reminder_manager:
-                self.reminder_manager.shutdown()
+            self.shutdown()
             ColorText.success("Goodbye!")
+    
+    def run_pipelined(self):
+        """Run with listening, recognition, dispatch and speech overlapped."""
+        import asyncio
+        from .pipeline import VoicePipeline
+        
+        try:
+            asyncio.run(VoicePipeline(self).run())
+        
+        except KeyboardInterrupt:
+            ColorText.warning("\nKeyboard interrupt received")
+            self.speak("Shutting down")
+        
+        finally:
+            self.shutdown()
+            ColorText.success("Goodbye!")
+    
+    def shutdown(self):
+        """Release background resources."""
+        if self.warmer:
+            self.warmer.stop()
+            self.warmer = None
+        if self.config_watcher:
+            self.config_watcher.stop()
+            self.config_watcher = None
+        if self.audio_input:
+            self.audio_input.stop()
+            self.audio_input = None
+        if self._reminder_manager:
+            self._reminder_manager.shutdown()
+            self._reminder_manager = None
+        config.flush()
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="python -m Jarvis", description="Jarvis AI Assistant")
+    parser.add_argument(
+        "--script", metavar="FILE",
+        help="run headless, reading one query per line from FILE ('-' for stdin)"
+    )
+    parser.add_argument(
+        "--pipeline", action="store_true",
+        help="overlap listening, recognition and speech so the next command is captured while Jarvis talks"
+    )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="print per-stage and per-handler latency histograms on exit"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="with --script, don't echo queries and responses"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main entry point."""
+    args = parse_args(argv)
+    if args.trace:
+        import atexit
+        atexit.register(tracer.dump)
+    if hasattr(signal, 'SIGUSR1'):
+        # kill -USR1 <pid> prints the latency report without stopping Jarvis
+        signal.signal(signal.SIGUSR1, lambda signum, frame: tracer.dump())
+    
+    if args.script:
+        from .headless import run_script
+        sys.exit(run_script(args.script, echo=not args.quiet))
+    
     try:
         # Print banner
         print("\n" + "=" * 60)
@@ -633,7 +569,10 @@ def main():
         
         # Initialize and run assistant
         assistant = JarvisAssistant()
-        assistant.run()
+        if args.pipeline:
+            assistant.run_pipelined()
+        else:
+            assistant.run()
     
     except Exception as e:
         ColorText.error(f"Fatal error: {e}")
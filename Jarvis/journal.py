@@ -0,0 +1,125 @@
+"""Append-only JSON Lines journal for Jarvis AI Assistant."""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List
+from .storage import write_atomic
+
+
+class Journal:
+    """Stores records as one JSON object per line.
+
+    Appending writes only the new lines. Reading the most recent records
+    scans backwards from the end of the file, so load time depends on how
+    many records are wanted rather than on the file size. Once the file
+    grows past compact_bytes, and to twice the size the last compaction
+    left, it is rewritten with only the newest keep_records records; when
+    those alone exceed compact_bytes the file is not rewritten on every
+    append.
+    """
+
+    BLOCK_SIZE = 8192
+
+    def __init__(self, filepath: str, keep_records: int = 200, compact_bytes: int = 256 * 1024):
+        """Initialize journal (the file is created on first append)."""
+        self.filepath = filepath
+        self.keep_records = keep_records
+        self.compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        self._compacted_size = 0  # Bytes left by the last compaction
+
+    def append(self, *records: Dict[str, Any]) -> bool:
+        """Append records in a single write."""
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode('utf-8')
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+                with open(self.filepath, 'ab+') as f:
+                    size = f.seek(0, os.SEEK_END)
+                    if size:
+                        f.seek(size - 1)
+                        if f.read(1) != b"\n":
+                            # Terminate a torn line left by an interrupted write
+                            data = b"\n" + data
+                    f.write(data)
+                    size = f.tell()
+        except Exception as e:
+            print(f"Error appending to {self.filepath}: {e}")
+            return False
+        if size > self.compact_bytes and size >= 2 * self._compacted_size:
+            # The records are written; a failed compaction is retried on the next append
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"Error compacting {self.filepath}: {e}")
+        return True
+
+    def tail(self, count: int) -> List[Dict[str, Any]]:
+        """Return the last count records, oldest first."""
+        if count <= 0:
+            return []
+        with self._lock:
+            try:
+                # One extra line in case the last one is torn
+                lines = self._read_tail_lines(count + 1)
+            except FileNotFoundError:
+                return []
+            except Exception as e:
+                print(f"Error reading {self.filepath}: {e}")
+                return []
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # A torn line from an interrupted write is skipped
+                continue
+        return records[-count:]
+
+    def _read_tail_lines(self, count: int) -> List[bytes]:
+        """Read complete lines from the end of the file until count are found."""
+        with open(self.filepath, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            while position > 0 and data.count(b"\n") <= count:
+                step = min(self.BLOCK_SIZE, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        if position > 0:
+            # The first line may be cut off by the block boundary
+            lines = lines[1:]
+        return lines[-count:]
+
+    def compact(self):
+        """Rewrite the file keeping only the newest keep_records records."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the file atomically (lock must be held).
+
+        The new file is synced before it replaces the old one, so a crash
+        cannot leave the history truncated.
+        """
+        try:
+            lines = self._read_tail_lines(self.keep_records)
+        except FileNotFoundError:
+            self._compacted_size = 0
+            return
+        data = b"".join(line + b"\n" for line in lines)
+        write_atomic(self.filepath, data, durable=True)
+        self._compacted_size = len(data)
+
+    def clear(self):
+        """Remove all records."""
+        with self._lock:
+            self._compacted_size = 0
+            try:
+                os.remove(self.filepath)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,126 @@
+"""Shared HTTP connections and connection warm-up for Jarvis AI Assistant.
+
+The first request to a host pays for DNS, TCP and TLS before any data is
+sent. The weather and news handlers share one pooled requests session, and
+a background ConnectionWarmer opens the connections of every configured
+service at startup, then touches them periodically so the server does not
+close them as idle.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+from .config import config
+from .tracing import tracer
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Shared requests session whose connections are reused across requests."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def open_connection(url: str, timeout: float = 5.0):
+    """Make a cheap request so a pooled connection to url's host is open."""
+    # Any status (even 401 or 404) means the connection is up and pooled
+    get_session().head(url, timeout=timeout)
+
+
+class ConnectionWarmer:
+    """Opens connections in the background ahead of the first real request.
+
+    targets maps a name to a callable that makes a cheap request over the
+    connection to keep warm. They run once at start and then every interval
+    seconds; failures are ignored, since warm-up is only an optimization.
+    """
+
+    def __init__(self, targets: Dict[str, Callable[[], None]], interval: Optional[float] = 45.0):
+        """Initialize warmer; interval None or 0 warms once without keep-alive."""
+        self.targets = dict(targets)
+        self.interval = interval or None
+        self.last_results: Dict[str, Union[float, str]] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "ConnectionWarmer":
+        """Start warming on a daemon thread."""
+        if self._thread is None and self.targets:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jarvis-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the keep-alive loop."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def warm_once(self) -> Dict[str, Union[float, str]]:
+        """Touch every target; returns seconds taken or the error per target."""
+        results = {}
+        for name, target in self.targets.items():
+            if self._stop.is_set():
+                break
+            start = time.perf_counter()
+            try:
+                target()
+            except Exception as e:
+                results[name] = str(e) or type(e).__name__
+                continue
+            results[name] = time.perf_counter() - start
+            tracer.record(f'warmup.{name}', results[name])
+        self.last_results = results
+        return results
+
+    def _run(self):
+        """Warm at once, then keep connections alive until stopped."""
+        self.warm_once()
+        while self.interval and not self._stop.wait(self.interval):
+            self.warm_once()
+
+
+def default_targets() -> Dict[str, Callable[[], None]]:
+    """Warm-up targets for the configured AI providers and HTTP services."""
+    from .ai_engine import ai_engine
+
+    def warm_ai():
+        # Building the engine also moves the SDK imports off the first query
+        if ai_engine.providers:
+            for provider in ai_engine.providers.providers:
+                provider.warm_up()
+
+    targets = {'ai': warm_ai}
+    if config.get('features.offline_mode', False):
+        return targets
+
+    from .news_handler import news_handler
+    from .weather_handler import weather_handler
+
+    if config.has_api_key('openweather'):
+        targets['weather'] = lambda: open_connection(weather_handler.base_url)
+    if config.has_api_key('news'):
+        targets['news'] = lambda: open_connection(news_handler.base_url)
+    return targets
+
+
+def start_warmup() -> Optional[ConnectionWarmer]:
+    """Start the background warmer unless disabled in config."""
+    if not config.get('network.warmup', True):
+        return None
+    return ConnectionWarmer(default_targets(), interval=config.get('network.keepalive_seconds', 45)).start()
@@ -1,8 +1,11 @@
 """News fetching for Jarvis AI Assistant."""
 
-import requests
 from typing import List, Dict, Optional
+from .cancellation import CancellationToken, OperationCancelled, run_cancellable
 from .config import config
+from .network import get_session
+from .tracing import tracer
+from .utils import LazyObject
 
 
 class NewsHandler:
@@ -13,7 +16,17 @@ class NewsHandler:
         self.api_key = config.get_api_key('news')
         self.base_url = "https://newsapi.org/v2"
     
-    def get_top_headlines(self, category: Optional[str] = None, country: str = "us", max_results: int = 5) -> List[Dict]:
+    def _get_json(self, endpoint: str, params: Dict, token: Optional[CancellationToken] = None) -> Dict:
+        """Perform a GET request and return the decoded JSON body.
+        
+        Raises OperationCancelled as soon as token is cancelled.
+        """
+        with tracer.span('http.news'):
+            response = run_cancellable(get_session().get, endpoint, params=params, timeout=10, token=token)
+            response.raise_for_status()
+            return response.json()
+    
+    def get_top_headlines(self, category: Optional[str] = None, country: str = "us", max_results: int = 5, token: Optional[CancellationToken] = None) -> List[Dict]:
         """Get top headlines."""
         if not self.api_key:
             return []
@@ -29,18 +42,17 @@ class NewsHandler:
             if category:
                 params['category'] = category
             
-            response = requests.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(endpoint, params, token)
             if data.get('status') == 'ok':
                 return data.get('articles', [])
             return []
+        except OperationCancelled:
+            raise
         except Exception as e:
             print(f"Error fetching top headlines: {e}")
             return []
     
-    def get_news_by_query(self, query: str, max_results: int = 5) -> List[Dict]:
+    def get_news_by_query(self, query: str, max_results: int = 5, token: Optional[CancellationToken] = None) -> List[Dict]:
         """Search for news by query."""
         if not self.api_key:
             return []
@@ -54,18 +66,17 @@ class NewsHandler:
                 'sortBy': 'publishedAt'
             }
             
-            response = requests.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(endpoint, params, token)
             if data.get('status') == 'ok':
                 return data.get('articles', [])
             return []
+        except OperationCancelled:
+            raise
         except Exception as e:
             print(f"Error searching news: {e}")
             return []
     
-    def get_news_by_source(self, source: str, max_results: int = 5) -> List[Dict]:
+    def get_news_by_source(self, source: str, max_results: int = 5, token: Optional[CancellationToken] = None) -> List[Dict]:
         """Get news from a specific source."""
         if not self.api_key:
             return []
@@ -78,13 +89,12 @@ class NewsHandler:
                 'pageSize': max_results
             }
             
-            response = requests.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(endpoint, params, token)
             if data.get('status') == 'ok':
                 return data.get('articles', [])
             return []
+        except OperationCancelled:
+            raise
         except Exception as e:
             print(f"Error fetching news from source: {e}")
             return []
@@ -114,4 +124,4 @@ class NewsHandler:
 
 
 # Global news handler instance
-news_handler = NewsHandler()
+news_handler = LazyObject(NewsHandler)
@@ -0,0 +1,168 @@
+"""Concurrent voice pipeline for Jarvis AI Assistant.
+
+Listening, recognition, command dispatch and speech run as separate stages
+connected by bounded queues, so the microphone captures the next utterance
+while the previous answer is still being recognized, handled or spoken.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from .utils import ColorText
+
+
+class VoicePipeline:
+    """Runs JarvisAssistant as listen -> recognize -> dispatch -> speak stages."""
+
+    # Seconds a handler waits for a follow-up answer (e.g. "search what?")
+    FOLLOW_UP_TIMEOUT = 15
+
+    def __init__(self, assistant, queue_size: int = 2, speech_queue_size: int = 8):
+        """Initialize pipeline around an assistant instance."""
+        self.assistant = assistant
+        self.queue_size = queue_size
+        self.speech_queue_size = speech_queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        # (time asked, future) while a handler waits for a follow-up answer
+        self._follow_up: Optional[Tuple[float, asyncio.Future]] = None
+
+        # One thread per stage: blocking I/O in one stage never stalls another,
+        # and the TTS engine is always driven from the same thread.
+        self._listen_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-listen")
+        self._recognize_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-recognize")
+        self._dispatch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-dispatch")
+        self._speech_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-speech")
+
+    async def run(self):
+        """Run all stages until the assistant stops."""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._audio_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._query_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._speech_queue = asyncio.Queue(maxsize=self.speech_queue_size)
+
+        saved_sink = self.assistant.speech_sink
+        saved_source = self.assistant.command_source
+        self.assistant.speech_sink = self._enqueue_speech
+        self.assistant.command_source = self._next_follow_up
+
+        listener = asyncio.create_task(self._listen_stage())
+        workers = [
+            asyncio.create_task(self._recognize_stage()),
+            asyncio.create_task(self._dispatch_stage()),
+        ]
+        speaker = asyncio.create_task(self._speak_stage())
+        try:
+            await self._stopping.wait()
+        finally:
+            listener.cancel()
+            for task in workers:
+                task.cancel()
+            if self._follow_up:
+                # Nothing will be recognized any more
+                self._follow_up[1].cancel()
+            try:
+                # A command still being handled may queue more speech; let it
+                # finish, then let queued answers play before tearing down
+                await self._loop.run_in_executor(None, self._dispatch_executor.shutdown)
+                await self._speech_queue.put(None)
+                await speaker
+            finally:
+                self.assistant.speech_sink = saved_sink
+                self.assistant.command_source = saved_source
+                await self._loop.run_in_executor(None, self._shutdown_executors)
+
+    def stop(self):
+        """Request the pipeline to stop (thread-safe)."""
+        if self._loop and self._stopping:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    async def _listen_stage(self):
+        """Capture utterances continuously, independent of later stages."""
+        while self.assistant.running:
+            audio = await self._loop.run_in_executor(self._listen_executor, self.assistant.listen)
+            if audio is not None:
+                await self._audio_queue.put((audio, time.monotonic()))
+
+    async def _recognize_stage(self):
+        """Turn captured audio into text queries, or the answer a handler waits for."""
+        while True:
+            audio, captured = await self._audio_queue.get()
+            query = await self._loop.run_in_executor(self._recognize_executor, self.assistant.recognize, audio)
+            if not query:
+                continue
+            follow_up = self._follow_up
+            # Speech captured before the question was asked is a command of its own
+            if follow_up and captured >= follow_up[0] and not follow_up[1].done():
+                follow_up[1].set_result(query)
+            else:
+                await self._query_queue.put(query)
+
+    async def _dispatch_stage(self):
+        """Route queries to handlers one at a time."""
+        while self.assistant.running:
+            query = await self._query_queue.get()
+            try:
+                await self._loop.run_in_executor(self._dispatch_executor, self.assistant.process_command, query)
+            except Exception as e:
+                ColorText.error(f"Error processing command: {e}")
+        self._stopping.set()
+
+    async def _speak_stage(self):
+        """Speak queued responses in order."""
+        from .voice_manager import voice_manager
+
+        while True:
+            item = await self._speech_queue.get()
+            if item is None:
+                return
+            text, token = item
+            await self._loop.run_in_executor(self._speech_executor, voice_manager.speak, text, token)
+
+    def _enqueue_speech(self, text: str) -> None:
+        """Speech sink used by handlers; blocks when the speech queue is full.
+        
+        The command's cancellation token is queued along with the text so a
+        barge-in also silences sentences that are still waiting to be spoken.
+        """
+        print(f"🤖 {self.assistant.assistant_name}: {text}")
+        item = (text, self.assistant.cancel_token)
+        future = asyncio.run_coroutine_threadsafe(self._speech_queue.put(item), self._loop)
+        future.result()
+
+    def _next_follow_up(self) -> str:
+        """Command source for handlers that ask a follow-up question.
+        
+        Only speech captured after the question counts as the answer;
+        commands already queued are dispatched once the handler is done.
+        """
+        asked = time.monotonic()
+        future = asyncio.run_coroutine_threadsafe(self._wait_for_follow_up(asked), self._loop)
+        try:
+            return future.result(timeout=self.FOLLOW_UP_TIMEOUT)
+        except Exception:
+            future.cancel()
+            return ""
+
+    async def _wait_for_follow_up(self, asked: float) -> str:
+        """Wait for the recognize stage to hand over the next answer."""
+        self._follow_up = (asked, self._loop.create_future())
+        try:
+            return await self._follow_up[1]
+        finally:
+            self._follow_up = None
+
+    def _shutdown_executors(self):
+        """Wait for work in flight, so nothing runs on after the assistant shuts down.
+        
+        The microphone stream is stopped first, so a listen in progress
+        returns at once instead of waiting for its timeout.
+        """
+        audio_input = getattr(self.assistant, 'audio_input', None)
+        if audio_input:
+            audio_input.stop()
+        for executor in (self._listen_executor, self._recognize_executor,
+                         self._dispatch_executor, self._speech_executor):
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,423 @@
+"""AI provider clients with failover for Jarvis AI Assistant.
+
+Every provider takes the same chat-style message list ({'role', 'content'}
+dicts, system messages first). ProviderPool tries providers in order and
+skips any whose circuit breaker is open. When configured, it also starts a
+hedged request on the next provider if the current one has not answered
+within a latency threshold; whichever answers first wins. A cancellation
+token abandons the request and closes any open response stream. Providers
+may carry a token-bucket rate limiter that every request must pass first.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .cancellation import CancellationToken, OperationCancelled
+from .tracing import tracer
+
+
+class ProviderError(Exception):
+    """Raised when no provider could produce a response."""
+
+
+class CircuitBreaker:
+    """Stops calling a provider after repeated failures.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests are refused for reset_timeout seconds. Then a single trial
+    request is let through (half-open); its outcome closes the circuit or
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """Initialize breaker in the closed state."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout has passed."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_running = False
+            return self._state
+
+    def is_available(self) -> bool:
+        """Check if a request would be allowed, without claiming the half-open trial."""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._trial_running)
+
+    def allow_request(self) -> bool:
+        """Claim permission for one request."""
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit."""
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._trial_running = False
+
+    def record_failure(self):
+        """Count a failure and open the circuit when the threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class TokenBucket:
+    """Rate limiter allowing rate requests per second with bursts of up to capacity."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Initialize limiter with a full bucket."""
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def try_acquire(self) -> bool:
+        """Take a token without waiting."""
+        return self._take() == 0.0
+
+    def acquire(self, token: Optional[CancellationToken] = None) -> float:
+        """Wait for a token and return the seconds waited.
+
+        Raises OperationCancelled if token is cancelled while waiting.
+        """
+        start = time.monotonic()
+        while True:
+            delay = self._take()
+            if not delay:
+                return time.monotonic() - start
+            if token:
+                token.wait(delay)
+                token.raise_if_cancelled()
+            else:
+                time.sleep(delay)
+
+
+class AIProvider:
+    """Base class for AI providers."""
+
+    name = "base"
+
+    def __init__(self, breaker: Optional[CircuitBreaker] = None):
+        """Initialize provider with its circuit breaker and no rate limit."""
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter: Optional[TokenBucket] = None
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> str:
+        """Return the full response text."""
+        raise NotImplementedError
+
+    def stream(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+               token: Optional[CancellationToken] = None) -> Iterator[str]:
+        """Yield response text chunks as they are generated, stopping when token is cancelled."""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Open the connection to the service ahead of the first request."""
+
+
+class OpenAIProvider(AIProvider):
+    """OpenAI chat completions (or any server exposing the same API)."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", base_url: Optional[str] = None,
+                 timeout: float = 20.0, breaker: Optional[CircuitBreaker] = None):
+        """Initialize provider; raises ImportError if the SDK is missing."""
+        super().__init__(breaker)
+        from openai import OpenAI
+
+        # Retries are left to the provider pool, which can fail over instead
+        self.client = OpenAI(api_key=api_key, base_url=base_url or None, timeout=timeout, max_retries=0)
+        self.model = model
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> str:
+        """Return the full response text."""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content.strip()
+
+    def warm_up(self):
+        """Fetch the model's metadata, which opens a pooled connection."""
+        from openai import APIStatusError
+
+        try:
+            self.client.models.retrieve(self.model)
+        except APIStatusError:
+            # Servers without the models endpoint still leave the connection open
+            pass
+
+    def stream(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+               token: Optional[CancellationToken] = None) -> Iterator[str]:
+        """Yield text deltas from a streamed completion."""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        # Closing the connection unblocks a read that is waiting for the next chunk
+        unregister = token.on_cancel(response.close) if token else None
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception:
+            if token:
+                token.raise_if_cancelled()
+            raise
+        finally:
+            if unregister:
+                unregister()
+            response.close()
+
+
+class LocalProvider(OpenAIProvider):
+    """Local OpenAI-compatible server such as llama.cpp's server or Ollama."""
+
+    name = "local"
+
+    def __init__(self, base_url: str = "http://127.0.0.1:8080/v1", model: str = "local",
+                 api_key: str = "", timeout: float = 60.0, breaker: Optional[CircuitBreaker] = None):
+        """Initialize provider; local servers ignore the API key but the client needs one."""
+        super().__init__(api_key or "local", model=model, base_url=base_url, timeout=timeout, breaker=breaker)
+
+
+class GeminiProvider(AIProvider):
+    """Google Gemini through the google-generativeai SDK."""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model: str = "gemini-pro", endpoint: Optional[str] = None,
+                 timeout: float = 20.0, breaker: Optional[CircuitBreaker] = None):
+        """Initialize provider; raises ImportError if the SDK is missing."""
+        super().__init__(breaker)
+        import google.generativeai as genai
+
+        if endpoint:
+            genai.configure(api_key=api_key, transport='rest', client_options={'api_endpoint': endpoint})
+        else:
+            genai.configure(api_key=api_key)
+        self.client = genai.GenerativeModel(model)
+        self.model = model
+        self.timeout = timeout
+
+    def warm_up(self):
+        """Fetch the model's metadata, which opens the connection."""
+        import google.generativeai as genai
+
+        name = self.model if self.model.startswith('models/') else f"models/{self.model}"
+        genai.get_model(name, request_options={'timeout': self.timeout})
+
+    @staticmethod
+    def build_prompt(messages: List[Dict[str, str]]) -> str:
+        """Flatten chat messages into a single prompt with context."""
+        prompt = "".join(msg['content'] + "\n\n" for msg in messages if msg['role'] == 'system')
+        turns = [msg for msg in messages if msg['role'] != 'system']
+        for msg in turns[:-1]:
+            role = "User" if msg['role'] == 'user' else "Assistant"
+            prompt += f"{role}: {msg['content']}\n"
+        if turns:
+            prompt += f"User: {turns[-1]['content']}\nAssistant:"
+        return prompt
+
+    def _generate(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float, stream: bool):
+        """Call generate_content with the shared options."""
+        return self.client.generate_content(
+            self.build_prompt(messages),
+            generation_config={'max_output_tokens': max_tokens, 'temperature': temperature},
+            request_options={'timeout': self.timeout},
+            stream=stream
+        )
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> str:
+        """Return the full response text."""
+        return self._generate(messages, max_tokens, temperature, stream=False).text.strip()
+
+    def stream(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+               token: Optional[CancellationToken] = None) -> Iterator[str]:
+        """Yield text chunks as they are generated."""
+        for chunk in self._generate(messages, max_tokens, temperature, stream=True):
+            if token:
+                token.raise_if_cancelled()
+            if chunk.text:
+                yield chunk.text
+
+
+class ProviderPool:
+    """Runs requests against providers with failover, hedging and circuit breakers."""
+
+    def __init__(self, providers: List[AIProvider], hedge_after: Optional[float] = None,
+                 max_workers: int = 32):
+        """Initialize pool; hedge_after is in seconds (None or 0 disables hedging).
+
+        max_workers bounds the requests in flight across concurrent callers;
+        threads are only started as they are needed.
+        """
+        self.providers = list(providers)
+        self.hedge_after = hedge_after or None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jarvis-ai")
+
+    @property
+    def primary(self) -> Optional[AIProvider]:
+        """First provider whose circuit is not open."""
+        for provider in self.providers:
+            if provider.breaker.is_available():
+                return provider
+        return self.providers[0] if self.providers else None
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                 token: Optional[CancellationToken] = None) -> Tuple[AIProvider, str]:
+        """Return (provider, text) from the first provider to answer.
+
+        Raises OperationCancelled as soon as token is cancelled; the abandoned
+        request finishes in the background.
+        """
+        return self._race(lambda provider: provider.complete(messages, max_tokens, temperature), token=token)
+
+    def stream(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+               token: Optional[CancellationToken] = None) -> Iterator[str]:
+        """Yield chunks from the first provider to start answering.
+
+        Failover and hedging apply until the first chunk arrives. An error
+        after that ends the stream, since another provider's answer cannot
+        be spliced onto a partial one.
+        """
+        def start(provider):
+            chunks = provider.stream(messages, max_tokens, temperature, token)
+            try:
+                return chunks, next(chunks)
+            except StopIteration:
+                return iter(()), ""
+
+        provider, (chunks, first) = self._race(start, cleanup=lambda result: result[0].close()
+                                               if hasattr(result[0], 'close') else None, token=token)
+        if first:
+            yield first
+        yield from chunks
+
+    def _race(self, call: Callable, cleanup: Optional[Callable] = None,
+              token: Optional[CancellationToken] = None) -> Tuple[AIProvider, object]:
+        """Run call against providers in order until one succeeds."""
+        if token:
+            token.raise_if_cancelled()
+        queue = [provider for provider in self.providers if provider.breaker.is_available()]
+        if not queue:
+            raise ProviderError("No AI provider available (all circuits are open)")
+
+        pending = {}
+        errors = []
+        # Completed by the token so that waiting for providers also wakes up on cancel
+        cancelled = Future()
+        unregister = token.on_cancel(lambda: cancelled.set_result(None)) if token else None
+
+        def launch() -> bool:
+            while queue:
+                provider = queue.pop(0)
+                if provider.breaker.allow_request():
+                    pending[self._executor.submit(self._timed, provider, call, token)] = provider
+                    return True
+            return False
+
+        launch()
+        try:
+            while pending:
+                timeout = self.hedge_after if queue else None
+                done, _ = wait([cancelled, *pending], timeout=timeout, return_when=FIRST_COMPLETED)
+                if cancelled in done:
+                    raise OperationCancelled()
+                if not done:
+                    # Slow answer: hedge with the next provider and take whichever is first
+                    launch()
+                    continue
+                for future in done:
+                    provider = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except OperationCancelled:
+                        raise
+                    except Exception as e:
+                        provider.breaker.record_failure()
+                        errors.append(f"{provider.name}: {e}")
+                        if not pending:
+                            launch()
+                        continue
+                    provider.breaker.record_success()
+                    return provider, result
+        finally:
+            if unregister:
+                unregister()
+            for future, provider in pending.items():
+                future.add_done_callback(self._settle(provider, cleanup))
+
+        raise ProviderError("; ".join(errors) or "No AI provider available")
+
+    @staticmethod
+    def _settle(provider: AIProvider, cleanup: Optional[Callable]) -> Callable:
+        """Callback recording the outcome of a request that lost the race."""
+        def settle(future):
+            try:
+                result = future.result()
+            except OperationCancelled:
+                # Stopped on purpose, which says nothing about the provider's health
+                return
+            except Exception:
+                provider.breaker.record_failure()
+                return
+            provider.breaker.record_success()
+            if cleanup:
+                cleanup(result)
+        return settle
+
+    @staticmethod
+    def _timed(provider: AIProvider, call: Callable, token: Optional[CancellationToken] = None):
+        """Wait for the provider's rate limit, then run call and trace its latency."""
+        if provider.limiter:
+            tracer.record(f'ai.ratelimit.{provider.name}', provider.limiter.acquire(token))
+        with tracer.span(f'ai.provider.{provider.name}'):
+            return call(provider)
+
+    def status(self) -> Dict[str, str]:
+        """Circuit state per provider."""
+        return {provider.name: provider.breaker.state for provider in self.providers}
@@ -1,15 +1,200 @@
 """Reminder and scheduling manager for Jarvis AI Assistant."""
 
+import heapq
+import itertools
 import os
 import json
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.date import DateTrigger
-from apscheduler.triggers.cron import CronTrigger
+from typing import Callable, Iterable, List, Dict, Optional
+from .database import get_database
 from .utils import load_json, save_json
 
 
+class ReminderStore:
+    """In-memory reminders indexed by id, by active state and by due time.
+
+    Lookups by id are O(1) and the next one-time reminders due come off a
+    heap, so thousands of reminders cost no more per operation than a
+    handful. Heap entries are not removed when a reminder is deactivated,
+    deleted or rescheduled; stale entries are skipped when met and the heap
+    is rebuilt once they make up most of it. Recurring reminders fire again
+    every day, so their stored time (the first occurrence) cannot order
+    them; they are kept apart and ordered by next_due() on request.
+
+    Reminders must be changed through the store (set_active, reschedule) so
+    the indexes stay in step; times are ISO strings, which sort in time order.
+    The store is safe to use from several threads (the scheduler's and the
+    main loop).
+    """
+
+    def __init__(self, reminders: Iterable[Dict] = ()):
+        """Initialize store with reminders in the order they were added."""
+        self._lock = threading.RLock()
+        self._by_id: Dict[str, Dict] = {}
+        self._active: Dict[str, None] = {}  # Insertion-ordered set
+        self._recurring: Dict[str, None] = {}  # Active recurring reminders, not on the heap
+        self._heap: List[tuple] = []
+        self._heap_entry: Dict[str, int] = {}  # id -> sequence number of its live heap entry
+        self._sequence = itertools.count()
+        for reminder in reminders:
+            self._by_id[reminder['id']] = reminder
+            if reminder.get('active', True):
+                self._active[reminder['id']] = None
+                if reminder.get('recurring'):
+                    self._recurring[reminder['id']] = None
+        self._rebuild_heap()
+
+    def _push(self, reminder: Dict):
+        """Index an active reminder, superseding any older heap entry."""
+        if reminder.get('recurring'):
+            self._recurring[reminder['id']] = None
+            return
+        sequence = next(self._sequence)
+        self._heap_entry[reminder['id']] = sequence
+        heapq.heappush(self._heap, (reminder['time'], sequence, reminder['id']))
+
+    def _rebuild_heap(self):
+        """Recreate the heap from the active reminders alone."""
+        self._heap_entry = {}
+        self._heap = []
+        for reminder_id in self._active:
+            if reminder_id in self._recurring:
+                continue
+            sequence = next(self._sequence)
+            self._heap_entry[reminder_id] = sequence
+            self._heap.append((self._by_id[reminder_id]['time'], sequence, reminder_id))
+        heapq.heapify(self._heap)
+
+    def _is_live(self, entry: tuple) -> bool:
+        """Check if a heap entry still stands for an active reminder's time."""
+        return self._heap_entry.get(entry[2]) == entry[1]
+
+    def _drop(self, reminder_id: str):
+        """Forget a reminder's heap entry."""
+        if reminder_id in self._recurring:
+            del self._recurring[reminder_id]
+            return
+        self._heap_entry.pop(reminder_id, None)
+        self._compact_heap()
+
+    def _compact_heap(self):
+        """Rebuild the heap once stale entries outnumber live ones."""
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._heap_entry):
+            self._rebuild_heap()
+
+    def add(self, reminder: Dict):
+        """Add (or replace) a reminder."""
+        reminder_id = reminder['id']
+        with self._lock:
+            if reminder_id in self._by_id:
+                self.remove(reminder_id)
+            self._by_id[reminder_id] = reminder
+            if reminder.get('active', True):
+                self._active[reminder_id] = None
+                self._push(reminder)
+
+    def get(self, reminder_id: str) -> Optional[Dict]:
+        """Reminder with this id, or None."""
+        return self._by_id.get(reminder_id)
+
+    def remove(self, reminder_id: str) -> Optional[Dict]:
+        """Delete a reminder; returns it, or None if there was none."""
+        with self._lock:
+            reminder = self._by_id.pop(reminder_id, None)
+            if reminder_id in self._active:
+                del self._active[reminder_id]
+                self._drop(reminder_id)
+            return reminder
+
+    def set_active(self, reminder_id: str, active: bool) -> Optional[Dict]:
+        """Activate or deactivate a reminder; returns it, or None if unknown."""
+        with self._lock:
+            reminder = self._by_id.get(reminder_id)
+            if reminder is None:
+                return None
+            reminder['active'] = active
+            if active and reminder_id not in self._active:
+                self._active[reminder_id] = None
+                self._push(reminder)
+            elif not active and reminder_id in self._active:
+                del self._active[reminder_id]
+                self._drop(reminder_id)
+            return reminder
+
+    def reschedule(self, reminder_id: str, time: str) -> Optional[Dict]:
+        """Move a reminder to a new ISO time; returns it, or None if unknown."""
+        with self._lock:
+            reminder = self._by_id.get(reminder_id)
+            if reminder is None:
+                return None
+            reminder['time'] = time
+            if reminder_id in self._active:
+                # The old entry goes stale
+                self._push(reminder)
+                self._compact_heap()
+            return reminder
+
+    def all(self) -> List[Dict]:
+        """Every reminder, in the order they were added."""
+        with self._lock:
+            return list(self._by_id.values())
+
+    def active(self) -> List[Dict]:
+        """Active reminders, in the order they were added (or last reactivated)."""
+        with self._lock:
+            by_id = self._by_id
+            return [by_id[reminder_id] for reminder_id in self._active]
+
+    def active_count(self) -> int:
+        """Number of active reminders."""
+        return len(self._active)
+
+    def next_due(self, count: int, next_time: Optional[Callable[[Dict], str]] = None) -> List[Dict]:
+        """The count active reminders due soonest, soonest first.
+
+        next_time(reminder) gives a recurring reminder's next occurrence as
+        an ISO string; by default it is worked out from the reminder's
+        daily time of day.
+        """
+        with self._lock:
+            heap = self._heap
+            found = []
+            while heap and len(found) < count:
+                entry = heapq.heappop(heap)
+                if self._is_live(entry):
+                    found.append(entry)
+            for entry in found:
+                heapq.heappush(heap, entry)
+            upcoming = [(entry[0], self._by_id[entry[2]]) for entry in found]
+            recurring = [self._by_id[reminder_id] for reminder_id in self._recurring]
+        if recurring:
+            # Outside the lock: next_time may take the scheduler's own lock
+            next_time = next_time or next_daily_occurrence
+            upcoming.extend((next_time(reminder), reminder) for reminder in recurring)
+            upcoming.sort(key=lambda item: item[0])
+        return [reminder for _, reminder in upcoming[:count]]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, reminder_id: str) -> bool:
+        return reminder_id in self._by_id
+
+
+def next_daily_occurrence(reminder: Dict, now: Optional[datetime] = None) -> str:
+    """ISO time a daily reminder goes off next: its first time, or its time of day after now."""
+    now = now or datetime.now()
+    first = datetime.fromisoformat(reminder['time'])
+    if first > now:
+        return reminder['time']
+    # Same trigger as the scheduler's: every day at the hour and minute
+    occurrence = now.replace(hour=first.hour, minute=first.minute, second=0, microsecond=0)
+    if occurrence <= now:
+        occurrence += timedelta(days=1)
+    return occurrence.isoformat()
+
+
 class ReminderManager:
     """Manages reminders and scheduled tasks."""
     
@@ -17,36 +202,73 @@ class ReminderManager:
     
     def __init__(self, voice_callback=None):
         """Initialize reminder manager."""
+        from apscheduler.schedulers.background import BackgroundScheduler
+        
         self.scheduler = BackgroundScheduler()
         self.scheduler.start()
         self.voice_callback = voice_callback
-        self.reminders = self._load_reminders()
+        self.database = get_database()
+        self._save_lock = threading.Lock()
+        self.store = ReminderStore(self._load_reminders())
         self._restore_reminders()
     
+    @property
+    def reminders(self) -> List[Dict]:
+        """Every reminder, in the order they were added."""
+        return self.store.all()
+    
+    @classmethod
+    def has_active_reminders(cls) -> bool:
+        """Check the reminders file for pending reminders without starting a scheduler."""
+        database = get_database()
+        if database is not None:
+            return database.has_active_reminders()
+        return any(reminder.get('active', True) for reminder in load_json(cls.REMINDERS_FILE, []))
+    
     def _load_reminders(self) -> List[Dict]:
-        """Load reminders from file."""
+        """Load reminders from file (or the database)."""
+        if self.database is not None:
+            return self.database.load_reminders()
         return load_json(self.REMINDERS_FILE, [])
     
     def _save_reminders(self):
         """Save reminders to file."""
-        save_json(self.REMINDERS_FILE, self.reminders)
+        # Scheduler threads save too; the last snapshot taken must be the last written
+        with self._save_lock:
+            save_json(self.REMINDERS_FILE, self.store.all(), durable=True)
+    
+    def _save_reminder(self, reminder: Dict):
+        """Save an added or changed reminder (only its row with the database)."""
+        if self.database is not None:
+            self.database.save_reminder(reminder)
+        else:
+            self._save_reminders()
+    
+    def _remove_saved_reminder(self, reminder_id: str):
+        """Remove a deleted reminder from file (or the database)."""
+        if self.database is not None:
+            self.database.delete_reminder(reminder_id)
+        else:
+            self._save_reminders()
     
     def _restore_reminders(self):
         """Restore active reminders to scheduler."""
-        for reminder in self.reminders:
-            if reminder.get('active', True):
-                try:
-                    self._schedule_reminder(reminder)
-                except Exception as e:
-                    print(f"Error restoring reminder: {e}")
+        for reminder in self.store.active():
+            try:
+                self._schedule_reminder(reminder)
+            except Exception as e:
+                print(f"Error restoring reminder: {e}")
     
     def _schedule_reminder(self, reminder: Dict):
         """Schedule a reminder in the scheduler."""
+        from apscheduler.triggers.date import DateTrigger
+        from apscheduler.triggers.cron import CronTrigger
+        
         reminder_id = reminder['id']
         reminder_time = datetime.fromisoformat(reminder['time'])
         
-        # Only schedule future reminders
-        if reminder_time > datetime.now():
+        # Only schedule future reminders; recurring ones go off every day
+        if reminder.get('recurring') or reminder_time > datetime.now():
             if reminder.get('recurring'):
                 # For recurring reminders, use cron trigger
                 trigger = CronTrigger(
@@ -93,8 +315,8 @@ class ReminderManager:
                 'created_at': datetime.now().isoformat()
             }
             
-            self.reminders.append(reminder)
-            self._save_reminders()
+            self.store.add(reminder)
+            self._save_reminder(reminder)
             self._schedule_reminder(reminder)
             
             return reminder_id
@@ -104,16 +326,28 @@ class ReminderManager:
     
     def get_reminder(self, reminder_id: str) -> Optional[Dict]:
         """Get a reminder by ID."""
-        for reminder in self.reminders:
-            if reminder['id'] == reminder_id:
-                return reminder
-        return None
+        return self.store.get(reminder_id)
     
     def list_reminders(self, active_only: bool = True) -> List[Dict]:
         """List all reminders."""
         if active_only:
-            return [r for r in self.reminders if r.get('active', True)]
-        return self.reminders
+            return self.store.active()
+        return self.store.all()
+    
+    def upcoming_reminders(self, count: int = 5) -> List[Dict]:
+        """The next count active reminders, soonest first."""
+        return self.store.next_due(count, self._next_run_time)
+    
+    def _next_run_time(self, reminder: Dict) -> str:
+        """When the scheduler fires a recurring reminder next, as a local ISO time."""
+        job = self.scheduler.get_job(str(reminder['id']))
+        if job is None or job.next_run_time is None:
+            return next_daily_occurrence(reminder)
+        return job.next_run_time.replace(tzinfo=None).isoformat()
+    
+    def active_count(self) -> int:
+        """Number of active reminders."""
+        return self.store.active_count()
     
     def delete_reminder(self, reminder_id: str) -> bool:
         """Delete a reminder."""
@@ -124,9 +358,9 @@ class ReminderManager:
             except:
                 pass
             
-            # Remove from list
-            self.reminders = [r for r in self.reminders if r['id'] != reminder_id]
-            self._save_reminders()
+            if self.store.remove(reminder_id) is None:
+                return False
+            self._remove_saved_reminder(reminder_id)
             return True
         except Exception as e:
             print(f"Error deleting reminder: {e}")
@@ -135,19 +369,18 @@ class ReminderManager:
     def deactivate_reminder(self, reminder_id: str) -> bool:
         """Deactivate a reminder."""
         try:
-            for reminder in self.reminders:
-                if reminder['id'] == reminder_id:
-                    reminder['active'] = False
-                    
-                    # Remove from scheduler
-                    try:
-                        self.scheduler.remove_job(str(reminder_id))
-                    except:
-                        pass
-                    
-                    self._save_reminders()
-                    return True
-            return False
+            reminder = self.store.set_active(reminder_id, False)
+            if reminder is None:
+                return False
+            
+            # Remove from scheduler
+            try:
+                self.scheduler.remove_job(str(reminder_id))
+            except:
+                pass
+            
+            self._save_reminder(reminder)
+            return True
         except Exception as e:
             print(f"Error deactivating reminder: {e}")
             return False
@@ -155,11 +388,12 @@ class ReminderManager:
     def snooze_reminder(self, reminder_id: str, minutes: int = 10) -> bool:
         """Snooze a reminder for specified minutes."""
         try:
-            reminder = self.get_reminder(reminder_id)
+            new_time = datetime.now() + timedelta(minutes=minutes)
+            reminder = self.store.reschedule(reminder_id, new_time.isoformat())
             if reminder:
-                new_time = datetime.now() + timedelta(minutes=minutes)
-                reminder['time'] = new_time.isoformat()
-                self._save_reminders()
+                # A reminder that already went off is pending again
+                self.store.set_active(reminder_id, True)
+                self._save_reminder(reminder)
                 self._schedule_reminder(reminder)
                 return True
             return False
@@ -0,0 +1,233 @@
+"""Response cache for repeated AI queries.
+
+Queries are normalized (case, punctuation, contractions) and looked up
+exactly first. Failing that, near-duplicates are found with MinHash
+signatures over word shingles bucketed by locality-sensitive hashing, and
+the best candidate is accepted if its Jaccard similarity reaches the
+configured threshold. Entries the underlying cache evicts or expires are
+dropped from the index when a lookup finds them gone, and by a sweep once
+the index holds PRUNE_SLACK more keys than the cache.
+"""
+
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+from .cache import open_cache
+from .config import config
+
+CONTRACTIONS = {
+    "what's": "what is", "who's": "who is", "where's": "where is", "when's": "when is",
+    "how's": "how is", "it's": "it is", "that's": "that is", "there's": "there is",
+    "what're": "what are", "who're": "who are", "i'm": "i am", "you're": "you are",
+    "can't": "cannot", "don't": "do not", "doesn't": "does not", "isn't": "is not",
+}
+
+# Filler that changes the phrasing but not the question
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "of", "to", "in", "on", "for", "and",
+    "what", "who", "me", "tell", "please", "jarvis", "can", "could", "would", "you",
+    "do", "does", "i", "want", "know", "about", "hey", "give", "say",
+}
+
+# Follow-ups only make sense with the conversation so far and are never cached
+CONTEXT_WORDS = {"it", "that", "this", "he", "she", "they", "them", "his", "her", "their",
+                 "those", "these", "more", "again", "else", "previous", "last"}
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case, expand contractions and strip punctuation."""
+    words = []
+    for word in re.findall(r"[\w']+", query.lower()):
+        words.append(CONTRACTIONS.get(word, word.replace("'", "")))
+    return " ".join(words)
+
+
+def shingles(normalized: str) -> Set[str]:
+    """Content-word unigrams and bigrams of a normalized query."""
+    words = normalized.split()
+    content = [word for word in words if word not in STOPWORDS] or words
+    result = set(content)
+    result.update(f"{a} {b}" for a, b in zip(content, content[1:]))
+    return result
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """Computes MinHash signatures that are stable across processes.
+
+    Each of the num_perm hash functions is CRC-32 started from a different
+    seed, which keeps signatures in C speed instead of Python arithmetic.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        """Initialize hasher with num_perm seeded hash functions."""
+        self.num_perm = num_perm
+        self._seeds: List[int] = []
+        state = seed
+        for _ in range(num_perm):
+            # Small LCG so the seeds do not depend on the random module's state
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            self._seeds.append(state >> 32)
+
+    def signature(self, items: Set[str]) -> List[int]:
+        """MinHash signature of a set of shingles."""
+        encoded = [item.encode('utf-8') for item in items] or [b""]
+        crc32 = zlib.crc32
+        return [min(crc32(item, seed) for item in encoded) for seed in self._seeds]
+
+
+class ResponseCache:
+    """Caches AI responses by query with near-duplicate matching."""
+
+    CACHE_FILE = os.path.join(os.path.dirname(__file__), "data", "response_cache.json")
+    PRUNE_SLACK = 32  # Evicted keys tolerated in the index before a sweep
+
+    def __init__(self, filepath: Optional[str] = None, threshold: float = 0.8,
+                 ttl: Optional[float] = 86400, max_entries: int = 1000,
+                 num_perm: int = 64, bands: int = 16):
+        """Initialize cache; ttl is in seconds."""
+        self.threshold = threshold
+        self.store = open_cache(filepath or self.CACHE_FILE, max_entries=max_entries, ttl=ttl)
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._buckets: Optional[Dict[Tuple, Set[str]]] = None
+        self._shingles: Dict[str, Set[str]] = {}
+        self._signatures: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple]:
+        """LSH bucket keys: one per band of the signature."""
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for band in range(self.bands)]
+
+    def _index(self) -> Dict[Tuple, Set[str]]:
+        """Build the LSH index from stored entries on first use (lock must be held)."""
+        if self._buckets is None:
+            self._buckets = {}
+            self._shingles = {}
+            self._signatures = {}
+            for key in self.store.keys():
+                entry = self.store.peek(key)
+                if entry:
+                    self._add_to_index(key, entry['signature'])
+        return self._buckets
+
+    def _add_to_index(self, key: str, signature: List[int]):
+        """Put a normalized query into its LSH buckets (lock must be held)."""
+        self._shingles[key] = shingles(key)
+        self._signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def _remove_from_index(self, key: str):
+        """Take a normalized query out of its LSH buckets (lock must be held)."""
+        self._shingles.pop(key, None)
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _prune_index(self):
+        """Drop keys the underlying cache has evicted (lock must be held)."""
+        if len(self._signatures) <= len(self.store) + self.PRUNE_SLACK:
+            return
+        for key in set(self._signatures).difference(self.store.keys()):
+            self._remove_from_index(key)
+
+    @staticmethod
+    def is_cacheable(query: str) -> bool:
+        """Check that a query does not depend on the earlier conversation."""
+        words = set(normalize_query(query).split())
+        return bool(words) and words.isdisjoint(CONTEXT_WORDS)
+
+    def get(self, query: str) -> Optional[str]:
+        """Return a cached response for the query or a near-duplicate of it."""
+        key = normalize_query(query)
+        with self._lock:
+            entry = self.store.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry['response']
+
+            query_shingles = shingles(key)
+            candidates = set()
+            for band_key in self._band_keys(self.hasher.signature(query_shingles)):
+                candidates.update(self._index().get(band_key, ()))
+
+            best_key, best_score = None, self.threshold
+            for candidate in candidates:
+                score = jaccard(query_shingles, self._shingles[candidate])
+                if score < best_score:
+                    continue
+                if self.store.peek(candidate) is None:
+                    # Evicted or expired since it was indexed
+                    self._remove_from_index(candidate)
+                else:
+                    best_key, best_score = candidate, score
+
+            entry = self.store.get(best_key) if best_key else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.near_hits += 1
+            return entry['response']
+
+    def set(self, query: str, response: str):
+        """Cache a response."""
+        key = normalize_query(query)
+        if not key or not response:
+            return
+        # The signature is stored with the response so the index rebuilds without rehashing
+        signature = self.hasher.signature(shingles(key))
+        with self._lock:
+            self._index()
+            self.store.set(key, {'response': response, 'signature': signature})
+            self._add_to_index(key, signature)
+            self._prune_index()
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self.store.clear()
+            self._buckets = {}
+            self._shingles = {}
+            self._signatures = {}
+
+    def stats(self) -> Dict[str, float]:
+        """Hit and miss counters."""
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            'hits': self.hits,
+            'near_hits': self.near_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.near_hits) / lookups if lookups else 0.0,
+            'entries': len(self.store),
+        }
+
+
+def create_response_cache() -> Optional[ResponseCache]:
+    """Create the response cache from config, or None when disabled."""
+    if not config.get('response_cache.enabled', True):
+        return None
+    return ResponseCache(
+        threshold=config.get('response_cache.similarity_threshold', 0.8),
+        ttl=config.get('response_cache.ttl_hours', 24) * 3600,
+        max_entries=config.get('response_cache.max_entries', 1000)
+    )
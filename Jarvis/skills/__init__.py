@@ -0,0 +1,6 @@
+"""Built-in Jarvis skills.
+
+Each module holds the voice-facing handlers for one capability. They are
+imported by the handler registry the first time one of their intents is
+routed to, so unused capabilities cost nothing at startup.
+"""
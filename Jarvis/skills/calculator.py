@@ -0,0 +1,12 @@
+"""Calculator skill for Jarvis AI Assistant."""
+
+from ..calculator import calculator
+
+
+def handle_calculation(assistant, query: str):
+    """Perform calculations."""
+    result = calculator.parse_calculation(query)
+    if result:
+        assistant.speak(f"The answer is {result}")
+    else:
+        assistant.speak("I couldn't understand that calculation. Please try again.")
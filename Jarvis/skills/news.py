@@ -0,0 +1,24 @@
+"""News skill for Jarvis AI Assistant."""
+
+from ..news_handler import news_handler
+
+CATEGORIES = ["technology", "sports", "business", "health", "science", "entertainment"]
+
+
+def handle_news(assistant, query: str):
+    """Get news updates."""
+    if not news_handler.is_available():
+        assistant.speak("News API key not configured. Please add your NewsAPI key to the .env file")
+        return
+    
+    category = next((name for name in CATEGORIES if name in query), None)
+    
+    assistant.speak("Fetching latest news...")
+    articles = news_handler.get_top_headlines(category=category, max_results=5, token=assistant.cancel_token)
+    
+    if articles:
+        news_text = news_handler.format_news(articles, max_articles=3)
+        assistant.speak("Here are the top headlines:")
+        assistant.speak(news_text)
+    else:
+        assistant.speak("Unable to fetch news at the moment")
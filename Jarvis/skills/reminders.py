@@ -0,0 +1,55 @@
+"""Reminder skill for Jarvis AI Assistant."""
+
+import datetime
+from ..utils import ColorText
+
+
+def handle_reminder(assistant, query: str):
+    """Set a reminder."""
+    # Extract reminder message and time
+    if "to" in query:
+        parts = query.split("to", 1)
+        if len(parts) > 1:
+            remainder = parts[1].strip()
+    
+            # Try to split by time indicators
+            time_indicators = ["at", "in", "tomorrow"]
+            message = remainder
+            time_str = ""
+    
+            for indicator in time_indicators:
+                if indicator in remainder:
+                    parts = remainder.split(indicator, 1)
+                    message = parts[0].strip()
+                    time_str = indicator + " " + parts[1].strip()
+                    break
+    
+            if not time_str:
+                # Default to 1 hour if no time specified
+                time_str = "in 1 hour"
+    
+            reminder_time = assistant.reminder_manager.parse_reminder_time(time_str)
+            if reminder_time:
+                reminder_id = assistant.reminder_manager.add_reminder(message, reminder_time)
+                if reminder_id:
+                    time_desc = reminder_time.strftime("%I:%M %p on %B %d")
+                    assistant.speak(f"Reminder set: {message} at {time_desc}")
+                    ColorText.success(f"Reminder created: {reminder_id}")
+                else:
+                    assistant.speak("Failed to set reminder")
+            else:
+                assistant.speak("I couldn't understand the time. Please try again")
+    else:
+        assistant.speak("Please tell me what you want to be reminded about and when")
+
+
+def handle_list_reminders(assistant):
+    """Announce the active reminders, soonest first."""
+    count = assistant.reminder_manager.active_count()
+    if count:
+        assistant.speak(f"You have {count} active reminders:")
+        for i, reminder in enumerate(assistant.reminder_manager.upcoming_reminders(5), 1):
+            time = datetime.datetime.fromisoformat(reminder['time'])
+            assistant.speak(f"{i}. {reminder['message']} at {time.strftime('%I:%M %p')}")
+    else:
+        assistant.speak("You have no active reminders")
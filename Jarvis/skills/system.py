@@ -0,0 +1,171 @@
+"""System control skill for Jarvis AI Assistant."""
+
+from ..system_control import system_control
+from ..utils import ColorText, extract_number, extract_percentage
+
+
+def handle_battery(assistant):
+    """Check battery status."""
+    battery = system_control.get_battery_status()
+    if battery:
+        percentage = battery['percentage']
+        charging = "charging" if battery['charging'] else "not charging"
+        assistant.speak(f"Battery is at {percentage}% and {charging}")
+    
+        if battery['time_remaining']:
+            hours = battery['time_remaining'] // 3600
+            minutes = (battery['time_remaining'] % 3600) // 60
+            if hours > 0:
+                assistant.speak(f"Approximately {hours} hours and {minutes} minutes remaining")
+            else:
+                assistant.speak(f"Approximately {minutes} minutes remaining")
+    else:
+        assistant.speak("Unable to get battery information")
+
+
+def handle_cpu(assistant):
+    """Check CPU usage."""
+    cpu = system_control.get_cpu_usage()
+    if cpu:
+        assistant.speak(f"CPU usage is at {cpu['total']}%")
+        assistant.speak(f"Your system has {cpu['cores']} cores and {cpu['threads']} threads")
+
+
+def handle_memory(assistant):
+    """Check RAM usage."""
+    memory = system_control.get_memory_usage()
+    if memory:
+        assistant.speak(f"RAM usage is at {memory['percentage']}%")
+        assistant.speak(f"{memory['used']} used out of {memory['total']} total memory")
+
+
+def handle_internet(assistant):
+    """Check internet connection."""
+    if system_control.check_internet_connection():
+        assistant.speak("Internet connection is active")
+    else:
+        assistant.speak("No internet connection detected")
+
+
+def handle_volume(assistant, query: str):
+    """Control system volume."""
+    try:
+        from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+        from comtypes import CLSCTX_ALL
+    
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        volume = interface.QueryInterface(IAudioEndpointVolume)
+    
+        if "mute" in query:
+            volume.SetMute(1, None)
+            assistant.speak("Volume muted")
+        elif "unmute" in query:
+            volume.SetMute(0, None)
+            assistant.speak("Volume unmuted")
+        elif "set" in query or "to" in query:
+            level = extract_percentage(query)
+            if level is not None:
+                volume.SetMasterVolumeLevelScalar(level / 100, None)
+                assistant.speak(f"Volume set to {level}%")
+        elif "increase" in query or "up" in query:
+            current = volume.GetMasterVolumeLevelScalar() * 100
+            new_level = min(100, current + 10)
+            volume.SetMasterVolumeLevelScalar(new_level / 100, None)
+            assistant.speak(f"Volume increased to {int(new_level)}%")
+        elif "decrease" in query or "down" in query:
+            current = volume.GetMasterVolumeLevelScalar() * 100
+            new_level = max(0, current - 10)
+            volume.SetMasterVolumeLevelScalar(new_level / 100, None)
+            assistant.speak(f"Volume decreased to {int(new_level)}%")
+        else:
+            current = int(volume.GetMasterVolumeLevelScalar() * 100)
+            assistant.speak(f"Current volume is {current}%")
+    except Exception as e:
+        ColorText.error(f"Error controlling volume: {e}")
+        assistant.speak("Unable to control volume")
+
+
+def handle_brightness(assistant, query: str):
+    """Control screen brightness."""
+    try:
+        import screen_brightness_control as sbc
+    
+        if "set" in query or "to" in query:
+            level = extract_percentage(query)
+            if level is not None:
+                sbc.set_brightness(level)
+                assistant.speak(f"Brightness set to {level}%")
+        elif "increase" in query or "up" in query:
+            current = sbc.get_brightness()[0]
+            new_level = min(100, current + 10)
+            sbc.set_brightness(new_level)
+            assistant.speak(f"Brightness increased to {int(new_level)}%")
+        elif "decrease" in query or "down" in query:
+            current = sbc.get_brightness()[0]
+            new_level = max(0, current - 10)
+            sbc.set_brightness(new_level)
+            assistant.speak(f"Brightness decreased to {int(new_level)}%")
+        else:
+            current = int(sbc.get_brightness()[0])
+            assistant.speak(f"Current brightness is {current}%")
+    except Exception as e:
+        ColorText.error(f"Error controlling brightness: {e}")
+        assistant.speak("Unable to control brightness")
+
+
+def handle_open_app(assistant, query: str):
+    """Open an application."""
+    app_name = query.replace("open", "").replace("launch", "").replace("start", "").strip()
+    if app_name:
+        if system_control.open_application(app_name):
+            assistant.speak(f"Opening {app_name}")
+        else:
+            assistant.speak(f"Unable to open {app_name}")
+
+
+def handle_close_app(assistant, query: str):
+    """Close an application."""
+    app_name = query.replace("close", "").replace("exit", "").replace("quit", "").strip()
+    if app_name:
+        if system_control.close_application(app_name):
+            assistant.speak(f"Closing {app_name}")
+        else:
+            assistant.speak(f"Unable to close {app_name}")
+
+
+def handle_shutdown(assistant, query: str):
+    """Shutdown the system."""
+    delay = extract_number(query)
+    if delay:
+        assistant.speak(f"Shutting down in {delay} minutes")
+        system_control.shutdown(delay * 60)
+    else:
+        assistant.speak("Shutting down now. Goodbye!")
+        system_control.shutdown(5)
+    assistant.running = False
+
+
+def handle_restart(assistant, query: str):
+    """Restart the system."""
+    delay = extract_number(query)
+    if delay:
+        assistant.speak(f"Restarting in {delay} minutes")
+        system_control.restart(delay * 60)
+    else:
+        assistant.speak("Restarting now. See you soon!")
+        system_control.restart(5)
+    assistant.running = False
+
+
+def handle_sleep(assistant):
+    """Put system to sleep."""
+    assistant.speak("Putting system to sleep. Goodbye!")
+    system_control.sleep()
+    assistant.running = False
+
+
+def handle_lock(assistant):
+    """Lock the screen."""
+    assistant.speak("Locking screen")
+    system_control.lock_screen()
@@ -0,0 +1,25 @@
+"""Weather skill for Jarvis AI Assistant."""
+
+from ..weather_handler import weather_handler
+
+
+def handle_weather(assistant, query: str):
+    """Get weather information."""
+    if not weather_handler.is_available():
+        assistant.speak("Weather API key not configured. Please add your OpenWeatherMap API key to the .env file")
+        return
+    
+    # Extract city name
+    city = query.replace("weather", "").replace("in", "").replace("at", "").replace("for", "").strip()
+    
+    if not city:
+        city = "London"  # Default city
+    
+    assistant.speak(f"Checking weather for {city}")
+    weather = weather_handler.get_current_weather(city, token=assistant.cancel_token)
+    
+    if weather:
+        weather_text = weather_handler.format_weather(weather)
+        assistant.speak(weather_text)
+    else:
+        assistant.speak(f"Unable to fetch weather information for {city}")
@@ -0,0 +1,40 @@
+"""WhatsApp skill for Jarvis AI Assistant."""
+
+import re
+from ..whatsapp_handler import whatsapp_handler
+
+
+def _extract_phone_number(text: str) -> str:
+    """Pull a phone number out of spoken text ("plus 91 98765 43210")."""
+    text = text.replace("plus", "+")
+    match = re.search(r"\+?[\d\s-]{7,}", text)
+    if not match:
+        return ""
+    return re.sub(r"[^\d+]", "", match.group())
+
+
+def handle_whatsapp(assistant, query: str):
+    """Send a WhatsApp message, asking for the number and text if needed."""
+    phone_number = _extract_phone_number(query)
+    if not phone_number:
+        assistant.speak("What number should I send it to? Please include the country code")
+        phone_number = _extract_phone_number(assistant.take_command())
+        if not phone_number:
+            assistant.speak("I didn't catch a phone number")
+            return
+    
+    message = ""
+    if "saying" in query:
+        message = query.split("saying", 1)[1].strip()
+    if not message:
+        assistant.speak("What should the message say?")
+        message = assistant.take_command()
+        if not message:
+            assistant.speak("Message cancelled")
+            return
+    
+    assistant.speak("Sending your WhatsApp message")
+    if whatsapp_handler.send_message_instantly(phone_number, message):
+        assistant.speak("Message sent")
+    else:
+        assistant.speak("Unable to send the WhatsApp message")
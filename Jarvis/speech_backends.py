@@ -0,0 +1,172 @@
+"""Speech recognition backends for Jarvis AI Assistant.
+
+Every backend turns an sr.AudioData into text and follows the
+SpeechRecognition conventions: sr.UnknownValueError when nothing could be
+understood and sr.RequestError when the engine itself is unavailable.
+"""
+
+import json
+import threading
+from typing import List
+import speech_recognition as sr
+
+
+class RecognizerBackend:
+    """Base class for speech recognition backends."""
+
+    name = "base"
+    offline = False
+
+    def is_configured(self) -> bool:
+        """Check if the backend has everything it needs to run."""
+        return True
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Transcribe audio to text."""
+        raise NotImplementedError
+
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API (needs network access)."""
+
+    name = "google"
+    offline = False
+
+    def __init__(self, recognizer: sr.Recognizer, language: str = "en-in", **options):
+        """Initialize backend with the shared recognizer."""
+        self.recognizer = recognizer
+        self.language = language
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Transcribe audio with Google."""
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class VoskBackend(RecognizerBackend):
+    """Local Kaldi-based recognition using a Vosk model directory."""
+
+    name = "vosk"
+    offline = True
+    SAMPLE_RATE = 16000
+
+    def __init__(self, recognizer: sr.Recognizer = None, vosk_model_path: str = "", **options):
+        """Initialize backend; the model is loaded on first use and kept."""
+        self.model_path = vosk_model_path
+        self._model = None
+        self._lock = threading.Lock()
+
+    def is_configured(self) -> bool:
+        """Check if a model directory has been configured."""
+        return bool(self.model_path)
+
+    def _get_model(self):
+        """Load the Vosk model once."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        from vosk import Model, SetLogLevel
+                    except ImportError:
+                        raise sr.RequestError("Vosk not installed. Install with: pip install vosk")
+                    if not self.model_path:
+                        raise sr.RequestError("No Vosk model configured (speech.vosk_model_path)")
+                    SetLogLevel(-1)
+                    try:
+                        self._model = Model(self.model_path)
+                    except Exception as e:
+                        raise sr.RequestError(f"Could not load Vosk model: {e}")
+        return self._model
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Transcribe audio with Vosk."""
+        model = self._get_model()
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(model, self.SAMPLE_RATE)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get('text', '').strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class WhisperCppBackend(RecognizerBackend):
+    """Local whisper.cpp recognition through the pywhispercpp bindings."""
+
+    name = "whisper_cpp"
+    offline = True
+    SAMPLE_RATE = 16000
+
+    def __init__(self, recognizer: sr.Recognizer = None, whisper_model: str = "base.en",
+                 language: str = "en", **options):
+        """Initialize backend; the model is loaded on first use and kept."""
+        self.model_name = whisper_model
+        self.language = language.split('-')[0]
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        """Load the whisper.cpp model once."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        from pywhispercpp.model import Model
+                    except ImportError:
+                        raise sr.RequestError("pywhispercpp not installed. Install with: pip install pywhispercpp")
+                    try:
+                        self._model = Model(self.model_name, print_realtime=False, print_progress=False)
+                    except Exception as e:
+                        raise sr.RequestError(f"Could not load whisper.cpp model: {e}")
+        return self._model
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Transcribe audio with whisper.cpp."""
+        import numpy as np
+
+        model = self._get_model()
+        raw = audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2)
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        segments = model.transcribe(samples, language=self.language)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    VoskBackend.name: VoskBackend,
+    WhisperCppBackend.name: WhisperCppBackend,
+}
+
+
+def create_backend(name: str, recognizer: sr.Recognizer, **options) -> RecognizerBackend:
+    """Create a backend by name, passing backend-specific options through."""
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown speech recognizer '{name}'. Available: {', '.join(BACKENDS)}")
+    return backend_class(recognizer, **options)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance between two transcripts, divided by reference length."""
+    ref = normalize_transcript(reference)
+    hyp = normalize_transcript(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            substitution = previous[j - 1] + (ref_word != hyp_word)
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, substitution)
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def normalize_transcript(text: str) -> List[str]:
+    """Lower-case a transcript and strip punctuation for scoring."""
+    cleaned = "".join(ch if ch.isalnum() or ch in " '" else " " for ch in text.lower())
+    return cleaned.split()
@@ -0,0 +1,144 @@
+"""Durable JSON file storage for Jarvis AI Assistant.
+
+Files are written to a temporary name in the same directory and renamed
+over the target, so a crash mid-write leaves the previous version intact.
+orjson is used for encoding and decoding when installed. Files only Jarvis
+reads (caches, summaries) can be written compactly, without indentation.
+
+The storage.fsync setting decides when data is forced to disk before the
+rename: "always", "durable" (only writes flagged durable, the default) or
+"never". Parsed files are kept in memory until the file's modification
+time, size or inode changes; the cache holds a marshal snapshot, which
+rebuilds an independent copy for each caller faster than reparsing.
+"""
+
+import json
+import marshal
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+from . import config as config_module
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_cache: Dict[str, Tuple[Tuple[int, int, int], bytes]] = {}
+_cache_lock = threading.Lock()
+
+
+def _setting(key: str, default: Any) -> Any:
+    """Read a storage setting; the default applies while the config itself is loading."""
+    config = getattr(config_module, 'config', None)
+    return default if config is None else config.get(key, default)
+
+
+def _fast_json() -> bool:
+    """Check if orjson is installed and enabled in config."""
+    return orjson is not None and _setting('storage.fast_json', True)
+
+
+def dumps(data: Any, compact: bool = False) -> bytes:
+    """Encode data as UTF-8 JSON, indented unless compact."""
+    if _fast_json():
+        try:
+            return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+        except TypeError:
+            # Non-string keys, huge integers etc.; the json module copes with those
+            pass
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=4)
+    return text.encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Decode UTF-8 JSON."""
+    if _fast_json():
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _should_fsync(durable: bool) -> bool:
+    """Apply the configured fsync policy to a write."""
+    policy = _setting('storage.fsync', 'durable')
+    if policy == 'always':
+        return True
+    if policy == 'never':
+        return False
+    return durable
+
+
+def write_atomic(path: str, data: bytes, durable: bool = False):
+    """Replace path's contents with data in a single rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    sync = _should_fsync(durable)
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        forget(path)
+    if sync and hasattr(os, 'O_DIRECTORY'):
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_json(path: str, data: Any, compact: bool = False, durable: bool = False):
+    """Encode data and write it atomically."""
+    write_atomic(path, dumps(data, compact), durable)
+
+
+def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    """Modification time, size and inode; a change in any means a new version."""
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def read_json(path: str, cached: bool = True) -> Any:
+    """Read and decode a JSON file; raises OSError or ValueError on failure.
+
+    With cached, an unchanged file is not parsed again; every call still
+    returns its own copy of the data.
+    """
+    key = os.path.abspath(path)
+    if cached:
+        signature = _signature(os.stat(key))
+        with _cache_lock:
+            entry = _cache.get(key)
+        if entry is not None and entry[0] == signature:
+            return marshal.loads(entry[1])
+
+    with open(key, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = loads(f.read())
+    if cached:
+        with _cache_lock:
+            _cache[key] = (_signature(stat), marshal.dumps(data))
+    return data
+
+
+def forget(path: Optional[str] = None):
+    """Drop path (or every file) from the read cache."""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
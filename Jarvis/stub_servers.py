@@ -0,0 +1,163 @@
+"""Local stub AI servers for testing Jarvis without network access.
+
+StubAIServer speaks just enough of the OpenAI chat completions API and the
+Gemini REST API for the provider clients: plain and streamed responses,
+plus knobs for latency and errors.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubAIServer:
+    """Threaded HTTP server answering OpenAI- and Gemini-style requests.
+
+    Use as a context manager. ``reply`` is the response text, ``delay``
+    seconds are waited before answering, ``fail_status`` (e.g. 500) makes
+    every request fail, and ``requests`` counts the completion requests
+    received.
+    """
+
+    def __init__(self, reply: str = "Hello from the stub server. How can I help?",
+                 delay: float = 0.0, fail_status: int = 0):
+        """Initialize server (it listens once started)."""
+        self.reply = reply
+        self.delay = delay
+        self.fail_status = fail_status
+        self.requests = 0
+        self.last_body = None
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        """Base URL to pass to the OpenAI client."""
+        return self.url + "/v1"
+
+    def start(self) -> "StubAIServer":
+        """Start serving on a free local port."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like the real services; without Nagle's algorithm the
+            # header and body writes are not held back waiting for an ACK
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if self.path.startswith('/v1/models'):
+                    model = self.path[len('/v1/models/'):] or 'stub'
+                    self._send_json(200, {'id': model, 'object': 'model', 'created': 0, 'owned_by': 'stub'})
+                else:
+                    self._send_json(404, {'error': {'message': f'unknown path {self.path}'}})
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                    stub.last_body = body
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if stub.fail_status:
+                    self._send_json(stub.fail_status, {'error': {'message': 'stub failure', 'code': stub.fail_status}})
+                elif self.path.startswith('/v1/chat/completions'):
+                    stub._answer_openai(self, body)
+                elif ':streamGenerateContent' in self.path:
+                    stub._answer_gemini(self, stream=True)
+                elif ':generateContent' in self.path:
+                    stub._answer_gemini(self, stream=False)
+                else:
+                    self._send_json(404, {'error': {'message': f'unknown path {self.path}'}})
+
+            def _send_json(self, status, payload):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            def handle_error(self, request, client_address):
+                # Clients hanging up early (cancelled or losing hedged requests) is expected
+                if not isinstance(sys.exc_info()[1], ConnectionError):
+                    super().handle_error(request, client_address)
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-ai-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubAIServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _chunks(self):
+        """Split the reply into word-sized streaming chunks."""
+        words = self.reply.split(" ")
+        return [word + (" " if i < len(words) - 1 else "") for i, word in enumerate(words)]
+
+    def _answer_openai(self, handler, body):
+        """Answer a chat completion request."""
+        if not body.get('stream'):
+            handler._send_json(200, {
+                'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': int(time.time()),
+                'model': body.get('model', 'stub'),
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': self.reply}}],
+            })
+            return
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/event-stream')
+        # The event stream has no length, so it ends when the connection closes
+        handler.send_header('Connection', 'close')
+        handler.close_connection = True
+        handler.end_headers()
+        for chunk in self._chunks():
+            event = {
+                'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                'model': body.get('model', 'stub'),
+                'choices': [{'index': 0, 'delta': {'content': chunk}, 'finish_reason': None}],
+            }
+            handler.wfile.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+            handler.wfile.flush()
+        handler.wfile.write(b"data: [DONE]\n\n")
+
+    def _answer_gemini(self, handler, stream: bool):
+        """Answer a generateContent or streamGenerateContent request."""
+        def candidate(text):
+            return {'candidates': [{'index': 0, 'content': {'role': 'model', 'parts': [{'text': text}]}}]}
+
+        if not stream:
+            handler._send_json(200, candidate(self.reply))
+        else:
+            # The REST transport streams a JSON array of responses
+            handler._send_json(200, [candidate(chunk) for chunk in self._chunks()])
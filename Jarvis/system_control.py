@@ -2,10 +2,12 @@
 
 import os
 import subprocess
-import psutil
 import platform
 from typing import List, Dict, Optional, Tuple
-from .utils import format_bytes, is_windows
+from .utils import format_bytes, is_windows, LazyObject
+
+# psutil is imported on first use to keep startup fast
+psutil = LazyObject(lambda: __import__('psutil'))
 
 
 class SystemControl:
@@ -294,4 +296,4 @@ class SystemControl:
 
 
 # Global system control instance
-system_control = SystemControl()
+system_control = LazyObject(SystemControl)
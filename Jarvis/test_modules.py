@@ -7,6 +7,8 @@ import os
 
 # Add Jarvis directory to path
 sys.path.insert(0, os.path.dirname(__file__))
+# ...and its parent, for tests that import the Jarvis package
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 def test_imports():
     """Test that all modules can be imported."""
@@ -83,7 +85,7 @@ def test_config():
     print("\nTesting configuration...")
     
     try:
-        from config import config
+        from Jarvis.config import config
         
         # Test get
         name = config.get('assistant_name', 'Jarvis')
@@ -95,6 +97,76 @@ def test_config():
         assert value == 'test_value', "Config set/get failed"
         print("✓ Config set/get works")
         
+        # Test write-behind: rapid changes are saved together, atomically
+        import json
+        import tempfile
+        import time
+        from Jarvis.config import Config
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            class TestConfig(Config):
+                CONFIG_FILE = os.path.join(data_dir, "config.json")
+                SAVE_DELAY = 0.2
+            
+            test_config = TestConfig()
+            for rate in range(100, 200):
+                test_config.set('voice.rate', rate)
+            with open(TestConfig.CONFIG_FILE) as f:
+                assert json.load(f)['voice']['rate'] != 199, "Config saved synchronously"
+            time.sleep(0.5)
+            with open(TestConfig.CONFIG_FILE) as f:
+                assert json.load(f)['voice']['rate'] == 199, "Config change not written"
+            test_config.set('voice.volume', 0.5)
+            assert test_config.flush()
+            with open(TestConfig.CONFIG_FILE) as f:
+                assert json.load(f)['voice']['volume'] == 0.5, "Config flush failed"
+            assert os.listdir(data_dir) == ["config.json"]
+            print("✓ Config changes are coalesced and flushed")
+            
+            # A config that cannot be encoded leaves the saved file and no temp file
+            assert not test_config.save_config({'bad': object()})
+            assert os.listdir(data_dir) == ["config.json"]
+            with open(TestConfig.CONFIG_FILE) as f:
+                assert json.load(f)['voice']['volume'] == 0.5
+            print("✓ Failed save keeps the previous config")
+            
+            # Test snapshot and change subscriptions
+            changes = []
+            unsubscribe = test_config.subscribe(changes.append, 'voice')
+            test_config.set('voice.rate', 180)
+            test_config.set('preferences.time_format', '24h')
+            assert changes == [{'voice.rate'}], changes
+            assert test_config.snapshot.voice.rate == 180
+            assert test_config.snapshot.preferences.time_format == '24h'
+            unsubscribe()
+            test_config.set('voice.rate', 160)
+            assert len(changes) == 1
+            print("✓ Config snapshot and subscriptions work")
+            
+            # Test hot reload: only the edited keys are reported
+            test_config.flush()
+            from file_watcher import FileWatcher
+            for use_inotify in (True, False):
+                changes = []
+                unsubscribe = test_config.subscribe(changes.append)
+                watcher = FileWatcher(TestConfig.CONFIG_FILE, test_config.reload, poll_interval=0.1,
+                                      use_inotify=use_inotify).start()
+                with open(TestConfig.CONFIG_FILE) as f:
+                    edited = json.load(f)
+                edited['voice']['rate'] += 10
+                edited['ai_settings']['model'] = "model-" + watcher.mode
+                with open(TestConfig.CONFIG_FILE, 'w') as f:
+                    json.dump(edited, f)
+                for _ in range(30):
+                    if changes:
+                        break
+                    time.sleep(0.1)
+                watcher.stop()
+                unsubscribe()
+                assert changes == [{'voice.rate', 'ai_settings.model'}], changes
+                assert test_config.snapshot.ai_settings.model == "model-" + watcher.mode
+                print(f"✓ Config file edit reloaded ({watcher.mode})")
+        
         return True
     except Exception as e:
         print(f"✗ Config test failed: {e}")
@@ -126,6 +198,159 @@ def test_utils():
         return False
 
 
+def test_streaming_utils():
+    """Test sentence re-chunking and background iteration of streamed replies."""
+    print("\nTesting streaming utilities...")
+    
+    try:
+        import threading
+        import time
+        from Jarvis.cancellation import CancellationToken, OperationCancelled
+        from Jarvis.utils import iter_in_background, iter_sentences
+        
+        text = 'Dr. Smith is in. There is no. Next one! Really? "Yes." Done\nNew line e.g. this'
+        chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+        assert list(iter_sentences(chunks)) == [
+            "Dr. Smith is in.", "There is no.", "Next one!", "Really?", '"Yes."', "Done",
+            "New line e.g. this",
+        ], list(iter_sentences(chunks))
+        assert list(iter_sentences(["Version 2.5 is out. ", "Ok"])) == ["Version 2.5 is out.", "Ok"]
+        assert list(iter_sentences([])) == [] and list(iter_sentences(["  "])) == []
+        print("✓ Sentences split across chunks, abbreviations kept")
+        
+        def slow(items, delay=0.02):
+            for item in items:
+                time.sleep(delay)
+                yield item
+        
+        start = time.perf_counter()
+        consumed = []
+        for item in iter_in_background(slow(range(10)), maxsize=2):
+            time.sleep(0.02)  # Work on the item while the next one is produced
+            consumed.append(item)
+        assert consumed == list(range(10)), consumed
+        assert time.perf_counter() - start < 0.35, "producer and consumer did not overlap"
+        
+        def failing():
+            yield 1
+            raise ValueError("stream broke")
+        
+        received = []
+        try:
+            for item in iter_in_background(failing()):
+                received.append(item)
+            raise AssertionError("error not re-raised")
+        except ValueError:
+            assert received == [1]
+        print("✓ Background iteration keeps order, overlaps work and re-raises errors")
+        
+        token = CancellationToken()
+        iterator = iter_in_background(slow(range(10), delay=1.0), token=token)
+        threading.Timer(0.05, token.cancel).start()
+        start = time.perf_counter()
+        try:
+            next(iterator)
+            raise AssertionError("not cancelled")
+        except OperationCancelled:
+            assert time.perf_counter() - start < 0.5, "cancel waited for the producer"
+        
+        token = CancellationToken()
+        assert list(iter_in_background(iter([1, 2]), token=token)) == [1, 2]
+        assert not token._callbacks, "on_cancel callback left registered"
+        print("✓ Cancellation interrupts a blocked producer; callback unregistered")
+        
+        closed = threading.Event()
+        
+        def endless():
+            try:
+                n = 0
+                while True:
+                    yield n
+                    n += 1
+            finally:
+                closed.set()
+        
+        # With a full bounded queue, cancelling neither blocks nor lets the producer run on
+        token = CancellationToken()
+        iterator = iter_in_background(endless(), maxsize=1, token=token)
+        assert next(iterator) == 0
+        time.sleep(0.05)
+        canceller = threading.Thread(target=token.cancel, daemon=True)
+        canceller.start()
+        canceller.join(0.5)
+        assert not canceller.is_alive(), "cancel blocked on the full queue"
+        try:
+            next(iterator)
+            raise AssertionError("not cancelled")
+        except OperationCancelled:
+            pass
+        assert closed.wait(1.0), "producer kept draining the stream"
+        
+        closed.clear()
+        iterator = iter_in_background(endless(), maxsize=1)
+        assert next(iterator) == 0
+        iterator.close()
+        assert closed.wait(1.0), "producer kept running after the caller stopped"
+        print("✓ Bounded queue: cancel returns at once and the producer stops")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Streaming utilities test failed: {e}")
+        return False
+
+
+def test_tracing():
+    """Test span recording and latency percentiles."""
+    print("\nTesting tracing...")
+    
+    try:
+        from Jarvis.tracing import RollingHistogram, Tracer
+        from Jarvis.utils import percentile
+        
+        assert percentile([], 50) == 0.0
+        assert percentile([4, 1, 3, 2], 50) == 2.5
+        assert percentile(list(range(101)), 90) == 90 and percentile([7], 99) == 7
+        
+        histogram = RollingHistogram(window=100)
+        for ms in range(1, 201):
+            histogram.add(ms / 1000)
+        stats = histogram.summary()
+        # Count, mean and max cover every sample; percentiles the last 100 (101-200 ms)
+        assert stats['count'] == 200 and abs(stats['mean'] - 100.5) < 1e-9
+        assert abs(stats['p50'] - 150.5) < 1e-9 and abs(stats['p99'] - 199.01) < 1e-9
+        assert abs(stats['max'] - 200) < 1e-9
+        print("✓ Rolling percentiles over the sample window")
+        
+        tracer = Tracer(window=10)
+        with tracer.span('stage.listen'):
+            pass
+        try:
+            with tracer.span('handler.weather'):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        tracer.record('handler.news', 0.25)
+        assert set(tracer.summary()) == {'stage.listen', 'handler.weather', 'handler.news'}
+        assert set(tracer.summary('handler.')) == {'handler.weather', 'handler.news'}
+        assert tracer.summary()['handler.news']['p50'] == 250
+        report = tracer.report('handler.')
+        assert report.splitlines()[0].startswith("span") and "handler.news" in report
+        assert "stage.listen" not in report
+        print("✓ Spans recorded (failed ones too) and filtered by prefix")
+        
+        disabled = Tracer(enabled=False)
+        with disabled.span('stage.speak'):
+            pass
+        disabled.record('stage.speak', 1.0)
+        assert disabled.summary() == {} and disabled.report() == "No spans recorded."
+        print("✓ Disabled tracer records nothing")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Tracing test failed: {e}")
+        return False
+
+
 def test_calculator():
     """Test calculator functionality."""
     print("\nTesting calculator...")
@@ -153,6 +378,1289 @@ def test_calculator():
         return False
 
 
+def test_intent_router():
+    """Test intent routing priorities."""
+    print("\nTesting intent router...")
+    
+    try:
+        from intent_router import IntentRouter, DEFAULT_INTENTS
+        
+        router = IntentRouter(DEFAULT_INTENTS)
+        expected = {
+            "what time is it": "time",
+            "what time is the news on": "news",
+            "what is 5 times 3": "calculation",
+            "list my reminders": "list_reminders",
+            "remind me to call mom at 3 pm": "reminder",
+            "open google": "website",
+            "open notepad": "open_app",
+            "goodbye": "exit",
+        }
+        for query, name in expected.items():
+            intent = router.route(query)
+            assert intent and intent.name == name, f"{query!r} routed to {intent}"
+            print(f"✓ {query!r} -> {name}")
+        
+        assert router.route("tell me about rome") is None, "Unmatched query should fall through"
+        print("✓ Unmatched queries fall through to AI")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Intent router test failed: {e}")
+        return False
+
+
+def test_handler_registry():
+    """Test intent registration, dispatch and lazy handler loading."""
+    print("\nTesting handler registry...")
+    
+    try:
+        import tempfile
+        import textwrap
+        from Jarvis.handler_registry import HandlerRegistry
+        from Jarvis.intent_router import Intent
+        
+        class Assistant:
+            def __init__(self):
+                self.calls = []
+            def tell_time(self):
+                self.calls.append("time")
+        
+        with tempfile.TemporaryDirectory() as plugin_dir:
+            with open(os.path.join(plugin_dir, "jarvis_test_skill.py"), 'w') as f:
+                f.write(textwrap.dedent('''
+                    def handle_joke(assistant, query):
+                        assistant.calls.append(("joke", query))
+                '''))
+            with open(os.path.join(plugin_dir, "jarvis_test_plugin.py"), 'w') as f:
+                f.write(textwrap.dedent('''
+                    from Jarvis.intent_router import Intent
+                    
+                    def register(registry):
+                        registry.register(Intent("coin", "jarvis_test_skill:handle_joke", ["flip a coin"]))
+                '''))
+            sys.path.insert(0, plugin_dir)
+            try:
+                registry = HandlerRegistry([
+                    Intent("time", "tell_time", ["time"], pass_query=False),
+                    Intent("joke", "jarvis_test_skill:handle_joke", ["joke"]),
+                ])
+                assistant = Assistant()
+                intent = registry.route("what time is it")
+                registry.get_handler(intent, assistant)()
+                
+                intent = registry.route("tell me a joke")
+                assert intent.name == "joke" and "jarvis_test_skill" not in sys.modules
+                assert registry.loaded_modules() == []
+                handler = registry.get_handler(intent, assistant)
+                assert "jarvis_test_skill" in sys.modules
+                assert registry.loaded_modules() == ["jarvis_test_skill"]
+                handler("tell me a joke")
+                assert assistant.calls == ["time", ("joke", "tell me a joke")], assistant.calls
+                print("✓ Methods and module targets dispatched; module imported on first use")
+                
+                try:
+                    registry.register(Intent("joke", "tell_time", ["joke"]))
+                    raise AssertionError("duplicate intent accepted")
+                except ValueError:
+                    pass
+                registry.register(Intent("joke", "tell_time", ["joke"], pass_query=False), replace=True)
+                assert registry.route("tell me a joke").handler == "tell_time"
+                registry.unregister("joke")
+                assert registry.route("tell me a joke") is None
+                print("✓ Register, replace and unregister rebuild the router")
+                
+                registry.load_plugins(["jarvis_test_plugin", "jarvis_missing_plugin"])
+                registry.load_plugins(["jarvis_test_plugin"])
+                assert [i.name for i in registry.intents] == ["time", "coin"]
+                assert registry.route("flip a coin").name == "coin"
+                print("✓ Plugins register once; a broken plugin is skipped")
+            finally:
+                sys.path.remove(plugin_dir)
+                for name in ("jarvis_test_skill", "jarvis_test_plugin"):
+                    sys.modules.pop(name, None)
+        
+        from Jarvis.skills.whatsapp import _extract_phone_number
+        expected = {
+            "send a whatsapp to plus 91 98765 43210 saying hi": "+919876543210",
+            "message 98765-43210 saying meet at 5": "9876543210",
+            "whatsapp +44 20 7946 0958": "+442079460958",
+            "send a whatsapp message": "",
+            "call 123": "",
+        }
+        for text, number in expected.items():
+            assert _extract_phone_number(text) == number, (text, _extract_phone_number(text))
+        print("✓ Phone numbers extracted from spoken text")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Handler registry test failed: {e}")
+        return False
+
+
+def test_ai_failover():
+    """Test provider failover, circuit breaker and hedging against stub servers."""
+    print("\nTesting AI provider failover...")
+    
+    try:
+        import time
+        from Jarvis.providers import CircuitBreaker, GeminiProvider, OpenAIProvider, ProviderPool
+        from Jarvis.stub_servers import StubAIServer
+    except ImportError as e:
+        print(f"○ Skipped (AI SDKs not installed: {e})")
+        return True
+    
+    try:
+        with StubAIServer(reply="OpenAI here. All good.") as openai_server, \
+                StubAIServer(reply="Gemini here. All good.") as gemini_server:
+            openai = OpenAIProvider("test-key", base_url=openai_server.openai_base_url, timeout=5,
+                                    breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.5))
+            gemini = GeminiProvider("test-key", endpoint=gemini_server.url, timeout=5)
+            pool = ProviderPool([openai, gemini])
+            messages = [{'role': 'system', 'content': 'Be brief.'}, {'role': 'user', 'content': 'hello'}]
+            
+            provider, text = pool.complete(messages, 50, 0.7)
+            assert (provider.name, text) == ("openai", "OpenAI here. All good."), text
+            print("✓ Primary provider answers")
+            
+            openai_server.fail_status = 500
+            provider, text = pool.complete(messages, 50, 0.7)
+            assert provider.name == "gemini" and text == "Gemini here. All good.", text
+            print("✓ Fails over to Gemini when OpenAI errors")
+            
+            assert "".join(pool.stream(messages, 50, 0.7)) == "Gemini here. All good."
+            assert pool.status()["openai"] == CircuitBreaker.OPEN
+            requests_when_opened = openai_server.requests
+            pool.complete(messages, 50, 0.7)
+            assert openai_server.requests == requests_when_opened, "open circuit should skip OpenAI"
+            print("✓ Streams fail over and the circuit opens after repeated errors")
+            
+            openai_server.fail_status = 0
+            time.sleep(0.6)
+            provider, _ = pool.complete(messages, 50, 0.7)
+            assert provider.name == "openai" and pool.status()["openai"] == CircuitBreaker.CLOSED
+            print("✓ Half-open trial closes the circuit once OpenAI recovers")
+            
+            openai_server.delay = 1.0
+            pool.hedge_after = 0.1
+            start = time.perf_counter()
+            provider, _ = pool.complete(messages, 50, 0.7)
+            elapsed = time.perf_counter() - start
+            assert provider.name == "gemini" and elapsed < 0.8, f"{provider.name} after {elapsed:.2f}s"
+            print(f"✓ Hedged request answered in {elapsed * 1000:.0f} ms while OpenAI stalled")
+        
+        return True
+    except Exception as e:
+        print(f"✗ AI failover test failed: {e}")
+        return False
+
+
+def test_local_llm():
+    """Test the local LLM backend against a stub OpenAI-compatible server."""
+    print("\nTesting local LLM backend...")
+    
+    try:
+        import tempfile
+        from Jarvis.ai_engine import AIEngine
+        from Jarvis.config import config
+        from Jarvis.stub_servers import StubAIServer
+        import openai  # noqa: F401 (the local backend uses the OpenAI client)
+    except ImportError as e:
+        print(f"○ Skipped (AI SDKs not installed: {e})")
+        return True
+    
+    saved_features = dict(config.config['features'])
+    saved_ai = dict(config.config['ai_settings'])
+    saved_cache = dict(config.config['response_cache'])
+    try:
+        with StubAIServer(reply="Local model here.") as local_server, \
+                tempfile.TemporaryDirectory() as data_dir:
+            class TestEngine(AIEngine):
+                HISTORY_FILE = os.path.join(data_dir, "history.jsonl")
+                SUMMARY_FILE = os.path.join(data_dir, "summary.json")
+            
+            config.config['response_cache']['enabled'] = False
+            config.config['features']['offline_mode'] = False
+            config.config['ai_settings'].update(providers=["local"], local_base_url="")
+            engine = TestEngine()
+            assert engine.providers is None and not engine.is_available()
+            config.config['features']['offline_mode'] = True
+            engine = TestEngine()
+            assert str(engine.providers.providers[0].client.base_url).startswith("http://127.0.0.1:8080")
+            print("✓ Local server only used when configured or in offline mode")
+            
+            config.config['ai_settings'].update(local_base_url=local_server.openai_base_url, local_model="stub")
+            
+            config.config['features']['offline_mode'] = True
+            engine = TestEngine()
+            assert engine.ai_type == "local", engine.ai_type
+            assert engine.get_ai_response("hello") == "Local model here."
+            print("✓ Offline mode uses only the local server")
+            
+            # A cloud provider that cannot be reached fails over to the local server
+            config.config['features']['offline_mode'] = False
+            config.config['ai_settings'].update(providers=["openai", "local"], openai_base_url="http://127.0.0.1:9/v1")
+            if not config.has_api_key('openai'):
+                config.config['api_keys']['openai_api_key'] = "test-key"
+            engine = TestEngine()
+            assert [p.name for p in engine.providers.providers] == ["openai", "local"]
+            assert " ".join(engine.stream_ai_response("hello again")) == "Local model here."
+            print("✓ Unreachable cloud provider falls back to the local server")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Local LLM test failed: {e}")
+        return False
+    finally:
+        config.config['features'] = saved_features
+        config.config['ai_settings'] = saved_ai
+        config.config['response_cache'] = saved_cache
+        config.config['api_keys']['openai_api_key'] = os.getenv("OPENAI_API_KEY", "")
+
+
+def test_barge_in():
+    """Test that cancelling a command aborts slow AI and network requests."""
+    print("\nTesting barge-in cancellation...")
+    
+    try:
+        import tempfile
+        import threading
+        import time
+        from Jarvis.ai_engine import AIEngine
+        from Jarvis.cancellation import CancellationToken, OperationCancelled, run_cancellable
+        from Jarvis.config import config
+        from Jarvis.stub_servers import StubAIServer
+        import openai  # noqa: F401 (the local backend uses the OpenAI client)
+    except ImportError as e:
+        print(f"○ Skipped (AI SDKs not installed: {e})")
+        return True
+    
+    def cancel_soon():
+        token = CancellationToken()
+        threading.Timer(0.2, token.cancel).start()
+        return token
+    
+    def assert_cancelled(call):
+        start = time.perf_counter()
+        try:
+            call()
+        except OperationCancelled:
+            return time.perf_counter() - start
+        raise AssertionError("request was not cancelled")
+    
+    saved_features = dict(config.config['features'])
+    saved_ai = dict(config.config['ai_settings'])
+    try:
+        elapsed = assert_cancelled(lambda: run_cancellable(time.sleep, 3, token=cancel_soon()))
+        assert elapsed < 1, elapsed
+        print("✓ Blocking network call abandoned on cancel")
+        
+        with StubAIServer(reply="Too late.", delay=3) as server, tempfile.TemporaryDirectory() as data_dir:
+            class TestEngine(AIEngine):
+                HISTORY_FILE = os.path.join(data_dir, "history.jsonl")
+                SUMMARY_FILE = os.path.join(data_dir, "summary.json")
+            
+            config.config['features']['offline_mode'] = True
+            config.config['ai_settings'].update(local_base_url=server.openai_base_url)
+            engine = TestEngine()
+            engine.response_cache = None
+            
+            elapsed = assert_cancelled(lambda: engine.get_ai_response("slow question", token=cancel_soon()))
+            assert elapsed < 1, elapsed
+            elapsed = assert_cancelled(lambda: list(engine.stream_ai_response("slow question", token=cancel_soon())))
+            assert elapsed < 1, elapsed
+            assert not engine.conversation_history
+            print(f"✓ AI request aborted {elapsed * 1000:.0f} ms after the call, nothing added to history")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Barge-in test failed: {e}")
+        return False
+    finally:
+        config.config['features'] = saved_features
+        config.config['ai_settings'] = saved_ai
+
+
+def test_speech_backends():
+    """Test speech backend selection and transcript scoring."""
+    print("\nTesting speech backends...")
+    
+    try:
+        import speech_recognition as sr
+        from Jarvis.config import config
+        from Jarvis.jarvis import JarvisAssistant
+        from Jarvis.speech_backends import word_error_rate
+    except ImportError as e:
+        print(f"○ Skipped ({e})")
+        return True
+    
+    try:
+        assert word_error_rate("Open YouTube.", "open youtube") == 0.0
+        assert word_error_rate("what time is it", "what time is") == 0.25
+        assert word_error_rate("play some music", "play sam music now") == 2 / 3
+        assert word_error_rate("", "") == 0.0 and word_error_rate("", "hello") == 1.0
+        print("✓ Word error rate")
+    except Exception as e:
+        print(f"✗ Word error rate test failed: {e}")
+        return False
+    
+    saved_features = dict(config.config['features'])
+    saved_speech = dict(config.config['speech'])
+    try:
+        assistant = JarvisAssistant.__new__(JarvisAssistant)
+        assistant.recognizer = sr.Recognizer()
+        config.config['features']['offline_mode'] = True
+        config.config['speech'].update(recognizer="google", offline_recognizer="sphinx", vosk_model_path="")
+        backend, fallback = assistant._load_speech_backends()
+        assert backend.name == "vosk" and not backend.is_configured() and fallback is None
+        assistant.speech_backend, assistant.fallback_backend = backend, fallback
+        assert assistant._recognize(sr.AudioData(b"\0\0" * 1600, 16000, 2)) == ""
+        print("✓ Unknown offline recognizer falls back to vosk; missing model reported at startup")
+        
+        config.config['features']['offline_mode'] = False
+        config.config['speech'].update(offline_recognizer="google")
+        backend, fallback = assistant._load_speech_backends()
+        assert backend.name == "google" and fallback is None
+        print("✓ Online recognizer rejected as offline fallback")
+        return True
+    except Exception as e:
+        print(f"✗ Speech backend test failed: {e}")
+        return False
+    finally:
+        config.config['features'] = saved_features
+        config.config['speech'] = saved_speech
+
+
+def test_continuous_listener():
+    """Test microphone energy, noise-floor tracking and capture failure."""
+    print("\nTesting continuous listener...")
+    
+    try:
+        import random
+        import struct
+        import threading
+        import time
+        import speech_recognition as sr
+        from Jarvis.audio_input import ContinuousListener, rms
+    except ImportError as e:
+        print(f"○ Skipped ({e})")
+        return True
+    
+    class FakeSource:
+        """Microphone source with constant-level audio that can fail after some reads."""
+        CHUNK, SAMPLE_RATE, SAMPLE_WIDTH = 1024, 16000, 2
+        def __init__(self, amplitude, fail_after=None):
+            self.amplitude = amplitude
+            self.fail_after = fail_after
+            self.reads = 0
+            self.stream = self
+        def read(self, size):
+            time.sleep(0.001)
+            self.reads += 1
+            if self.fail_after is not None and self.reads > self.fail_after:
+                raise OSError("Stream closed")
+            return struct.pack('<h', self.amplitude) * size
+    
+    def run(listener, source, reads):
+        thread = threading.Thread(target=listener._capture_loop, args=(source,), daemon=True)
+        thread.start()
+        while source.reads < reads and thread.is_alive():
+            time.sleep(0.005)
+        listener._stop.set()
+        thread.join(timeout=1)
+    
+    try:
+        assert rms(b"", 2) == 0
+        assert rms(struct.pack('<4h', 3, -4, 3, -4), 2) == 3
+        assert rms(struct.pack('<2i', -1000, 1000), 4) == 1000
+        assert rms((-300).to_bytes(3, 'little', signed=True) * 2, 3) == 300
+        try:
+            import warnings
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                import audioop
+        except ImportError:
+            audioop = None
+        if audioop:
+            rng = random.Random(5)
+            for width in (1, 2, 3, 4):
+                buffer = bytes(rng.randrange(256) for _ in range(width * 500))
+                assert rms(buffer, width) == audioop.rms(buffer, width), width
+        print("✓ RMS energy without audioop" + (" (matches audioop)" if audioop else ""))
+        
+        for dynamic in (True, False):
+            recognizer = sr.Recognizer()
+            recognizer.energy_threshold = 300
+            recognizer.dynamic_energy_threshold = dynamic
+            run(ContinuousListener(recognizer), FakeSource(50), 50)
+            assert (recognizer.energy_threshold < 300) == dynamic, recognizer.energy_threshold
+        print("✓ Noise floor tracked only with dynamic_energy_threshold")
+        
+        listener = ContinuousListener(sr.Recognizer())
+        listener._thread = threading.Thread(target=listener._capture_loop, args=(FakeSource(50, fail_after=5),),
+                                            daemon=True)
+        listener._thread.start()
+        start = time.perf_counter()
+        assert listener.get_audio(timeout=5) is None
+        assert time.perf_counter() - start < 1.5 and not listener.is_running()
+        assert isinstance(listener.error, OSError)
+        print("✓ Capture failure ends the thread and get_audio() returns early")
+        
+        from Jarvis.jarvis import JarvisAssistant
+        assistant = JarvisAssistant.__new__(JarvisAssistant)
+        assistant.audio_input = listener
+        assistant._audio_input_failed = False
+        assert assistant._get_audio_input() is None
+        assert assistant.audio_input is None and assistant._audio_input_failed
+        print("✓ Assistant falls back to per-command microphone")
+        return True
+    except Exception as e:
+        print(f"✗ Continuous listener test failed: {e}")
+        return False
+
+
+def test_barge_in_onset():
+    """Test that speech onset cancels the command and stops playback, but echo does not."""
+    print("\nTesting barge-in onset...")
+    
+    try:
+        import struct
+        import threading
+        import time
+        import speech_recognition as sr
+        from Jarvis.audio_input import ContinuousListener
+        from Jarvis.cancellation import CancellationToken
+        from Jarvis.voice_manager import VoiceManager
+    except ImportError as e:
+        print(f"○ Skipped ({e})")
+        return True
+    
+    class FakeEngine:
+        """pyttsx3 engine that 'speaks' one word every 50 ms."""
+        def __init__(self):
+            self.callbacks = {}
+            self.spoken = []
+            self.stopped = False
+        def say(self, text):
+            self.text = text
+        def connect(self, name, callback):
+            self.callbacks[name] = callback
+            return name
+        def disconnect(self, name):
+            self.callbacks.pop(name, None)
+        def stop(self):
+            self.stopped = True
+        def runAndWait(self):
+            for i, word in enumerate(self.text.split()):
+                self.callbacks.get('started-word', lambda *args: None)(None, i, len(word))
+                if self.stopped:
+                    return
+                self.spoken.append(word)
+                time.sleep(0.05)
+    
+    class FakeSource:
+        """Microphone source: echo-level audio first, then the user talking."""
+        CHUNK, SAMPLE_RATE, SAMPLE_WIDTH = 1024, 16000, 2
+        def __init__(self, plan):
+            self.plan = plan
+            self.reads = 0
+            self.stream = self
+        def read(self, size):
+            time.sleep(0.01)
+            self.reads += 1
+            amplitude = 2000 if self.reads > self.plan['echo_buffers'] else 600
+            return struct.pack('<h', amplitude) * size
+    
+    try:
+        voice = VoiceManager.__new__(VoiceManager)
+        voice.engine = FakeEngine()
+        voice.is_speaking = False
+        voice._settings_changed = threading.Event()
+        token = CancellationToken()
+        onsets = []
+        
+        def on_speech_start():
+            onsets.append(source.reads)
+            token.cancel()
+        
+        recognizer = sr.Recognizer()
+        recognizer.energy_threshold = 300
+        source = FakeSource({'echo_buffers': 20})
+        listener = ContinuousListener(recognizer, on_speech_start=on_speech_start,
+                                      is_playing=lambda: voice.is_speaking, playback_factor=3.0)
+        speaker = threading.Thread(target=voice.speak, args=(" ".join(["word"] * 100), token))
+        speaker.start()
+        while not voice.is_speaking:
+            time.sleep(0.001)
+        capture = threading.Thread(target=listener._capture_loop, args=(source,), daemon=True)
+        capture.start()
+        speaker.join(timeout=3)
+        listener._stop.set()
+        capture.join(timeout=1)
+        
+        assert not speaker.is_alive(), "speech did not stop"
+        assert token.cancelled and len(onsets) == 1, onsets
+        assert onsets[0] > 20, "echo of our own voice triggered barge-in"
+        assert recognizer.energy_threshold == 300, "noise floor adapted to our own voice"
+        assert 0 < len(voice.engine.spoken) < 100 and voice.engine.stopped
+        print(f"✓ Echo ignored; onset cancelled the command and speech stopped after "
+              f"{len(voice.engine.spoken)} of 100 words")
+        return True
+    except Exception as e:
+        print(f"✗ Barge-in onset test failed: {e}")
+        return False
+
+
+def test_voice_pipeline():
+    """Test follow-up answers and shutdown of the concurrent voice pipeline."""
+    print("\nTesting voice pipeline...")
+    
+    try:
+        import asyncio
+        import threading
+        import time
+        from Jarvis.pipeline import VoicePipeline
+    except ImportError as e:
+        print(f"○ Skipped ({e})")
+        return True
+    
+    class ScriptedAssistant:
+        """Assistant whose microphone plays a script of (delay, utterance) pairs."""
+        assistant_name = "Jarvis"
+        cancel_token = None
+        
+        def __init__(self, script):
+            self.script = list(script)
+            self.running = True
+            self.speech_sink = None
+            self.command_source = None
+            self.handled = []
+            self.answers = []
+        
+        def listen(self):
+            if not self.script:
+                time.sleep(0.02)
+                return None
+            delay, utterance = self.script.pop(0)
+            time.sleep(delay)
+            return utterance
+        
+        def recognize(self, audio):
+            return audio
+        
+        def process_command(self, query):
+            self.handled.append(query)
+            if query == "search":
+                time.sleep(0.1)  # Asking "search what?"
+                self.answers.append(self.command_source())
+            elif query == "slow":
+                time.sleep(0.3)
+                self.handled.append("slow done")
+            elif query == "exit":
+                self.running = False
+    
+    try:
+        # "open youtube" was said before the question: it is not the answer
+        assistant = ScriptedAssistant([(0, "search"), (0, "open youtube"), (0.3, "cats"), (0.1, "exit")])
+        asyncio.run(asyncio.wait_for(VoicePipeline(assistant).run(), timeout=5))
+        assert assistant.answers == ["cats"], assistant.answers
+        assert assistant.handled == ["search", "open youtube", "exit"], assistant.handled
+        assert assistant.command_source is None and assistant.speech_sink is None
+        print("✓ Follow-up answered by new speech; earlier command dispatched after")
+        
+        assistant = ScriptedAssistant([(0, "slow")])
+        pipeline = VoicePipeline(assistant)
+        threading.Timer(0.1, pipeline.stop).start()
+        asyncio.run(asyncio.wait_for(pipeline.run(), timeout=5))
+        assert assistant.handled == ["slow", "slow done"], assistant.handled
+        assert pipeline._dispatch_executor._shutdown
+        print("✓ stop() waits for the command in flight")
+        return True
+    except Exception as e:
+        print(f"✗ Voice pipeline test failed: {e!r}")
+        return False
+
+
+def test_connection_warmer():
+    """Test background connection warm-up and keep-alive."""
+    print("\nTesting connection warm-up...")
+    
+    try:
+        import time
+        from Jarvis.network import ConnectionWarmer, get_session, open_connection
+        from Jarvis.stub_servers import StubAIServer
+    except ImportError as e:
+        print(f"○ Skipped ({e})")
+        return True
+    
+    try:
+        calls = {'ok': 0, 'bad': 0}
+        
+        def ok():
+            calls['ok'] += 1
+        
+        def bad():
+            calls['bad'] += 1
+            raise ConnectionError("refused")
+        
+        warmer = ConnectionWarmer({'ok': ok, 'bad': bad}, interval=0.1).start()
+        time.sleep(0.35)
+        warmer.stop()
+        stopped_at = dict(calls)
+        assert 3 <= calls['ok'] <= 5 and calls['bad'] == calls['ok'], calls
+        assert isinstance(warmer.last_results['ok'], float) and warmer.last_results['bad'] == "refused"
+        time.sleep(0.25)
+        assert calls == stopped_at, "targets touched after stop()"
+        print(f"✓ Warmed at start, kept alive {calls['ok'] - 1} times, failures recorded, stopped cleanly")
+        
+        once = ConnectionWarmer({'ok': ok}, interval=0).start()
+        time.sleep(0.1)
+        assert once._thread is not None and not once._thread.is_alive()
+        once.stop()
+        print("✓ Interval 0 warms once without keep-alive")
+        
+        with StubAIServer() as server:
+            open_connection(server.url)
+            start = time.perf_counter()
+            response = get_session().get(server.url + "/v1/models/stub", timeout=5)
+            assert response.status_code == 200
+            print(f"✓ Request on the warmed session took {(time.perf_counter() - start) * 1000:.1f} ms")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Connection warm-up test failed: {e}")
+        return False
+
+
+def test_bulk_ai():
+    """Test concurrent bulk prompts with a rate-limited provider."""
+    print("\nTesting bulk AI prompts...")
+    
+    try:
+        import tempfile
+        import time
+        from Jarvis.ai_engine import AIEngine
+        from Jarvis.providers import AIProvider, ProviderPool, TokenBucket
+        
+        class EchoProvider(AIProvider):
+            name = "echo"
+            
+            def complete(self, messages, max_tokens, temperature):
+                time.sleep(0.1)
+                prompt = messages[-1]['content']
+                if "fail" in prompt:
+                    raise RuntimeError("bad prompt")
+                return prompt.upper()
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            class TestEngine(AIEngine):
+                HISTORY_FILE = os.path.join(data_dir, "history.jsonl")
+                SUMMARY_FILE = os.path.join(data_dir, "summary.json")
+            
+            engine = TestEngine()
+            provider = EchoProvider()
+            engine.providers = ProviderPool([provider])
+            prompts = [f"prompt {i}" for i in range(20)] + ["please fail"]
+            
+            start = time.perf_counter()
+            results = engine.get_bulk_responses(prompts, max_workers=10)
+            elapsed = time.perf_counter() - start
+            assert [r['response'] for r in results[:20]] == [p.upper() for p in prompts[:20]]
+            assert results[20]['response'] is None and "bad prompt" in results[20]['error']
+            assert not engine.conversation_history
+            assert elapsed < 1.0, elapsed
+            print(f"✓ {len(prompts)} prompts in {elapsed * 1000:.0f} ms, ordered, one per-item error")
+            
+            # 10 requests/second with a burst of 2: 12 prompts need about 1s
+            provider.breaker.record_success()
+            provider.limiter = TokenBucket(10, 2)
+            start = time.perf_counter()
+            results = engine.get_bulk_responses(prompts[:12], max_workers=12)
+            elapsed = time.perf_counter() - start
+            assert all(r['error'] is None for r in results)
+            assert 0.9 < elapsed < 1.6, elapsed
+            print(f"✓ Rate limit held: 12 prompts at 10/s took {elapsed:.2f}s")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Bulk AI test failed: {e}")
+        return False
+
+
+def test_conversation_summary():
+    """Test that turns leaving the context survive a failed summary."""
+    print("\nTesting conversation summary...")
+    
+    try:
+        import tempfile
+        import time
+        from Jarvis.ai_engine import AIEngine
+        from Jarvis.config import config
+        from Jarvis.providers import AIProvider, ProviderPool
+        
+        class SummaryProvider(AIProvider):
+            name = "summary"
+            fail = True
+            
+            def complete(self, messages, max_tokens, temperature):
+                if self.fail:
+                    raise RuntimeError("summary unavailable")
+                return "Summary: " + messages[-1]['content'].replace("\n", " | ")
+        
+        def wait_idle(engine):
+            for _ in range(200):
+                with engine._summary_lock:
+                    if not engine._summarizing:
+                        return
+                time.sleep(0.01)
+            raise AssertionError("summary thread still running")
+        
+        saved_ai = dict(config.config['ai_settings'])
+        try:
+            config.config['ai_settings']['context_tokens'] = 40
+            with tempfile.TemporaryDirectory() as data_dir:
+                class TestEngine(AIEngine):
+                    HISTORY_FILE = os.path.join(data_dir, "history.jsonl")
+                    SUMMARY_FILE = os.path.join(data_dir, "summary.json")
+                
+                engine = TestEngine()
+                provider = SummaryProvider()
+                engine.providers = ProviderPool([provider])
+                for i in range(3):
+                    engine.add_exchange(f"question number {i} about the weather today",
+                                        f"answer number {i} is sunny and warm")
+                    time.sleep(0.002)  # Distinct timestamps per exchange
+                wait_idle(engine)
+                assert not engine.summary['text']
+                pending = [msg['content'] for msg in engine._pending_summary]
+                assert pending and pending[0] == "question number 0 about the weather today", pending
+                print(f"✓ {len(pending)} turns kept pending after a failed summary")
+                
+                provider.fail = False
+                engine.add_exchange("question number 3 about the weather today", "answer number 3 is rain")
+                wait_idle(engine)
+                assert not engine._pending_summary
+                assert "question number 0" in engine.summary['text'], engine.summary
+                print("✓ Retried with the next overflow and folded into the summary")
+        finally:
+            config.config['ai_settings'] = saved_ai
+        
+        return True
+    except Exception as e:
+        print(f"✗ Conversation summary test failed: {e}")
+        return False
+
+
+def test_persistent_cache():
+    """Test LRU eviction, expiry and batched writes of the JSON cache."""
+    print("\nTesting persistent cache...")
+    
+    try:
+        import tempfile
+        import time
+        from Jarvis.cache import PersistentCache
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = os.path.join(data_dir, "cache.json")
+            
+            class TestCache(PersistentCache):
+                SAVE_DELAY = 0.2
+            
+            cache = TestCache(path, max_entries=3)
+            for key in "abc":
+                cache.set(key, key.upper())
+            assert cache.get("a") == "A"  # "a" is now the most recently used
+            assert cache.peek("b") == "B"  # peek does not refresh "b"
+            cache.set("d", "D")
+            assert cache.keys() == ["c", "a", "d"], cache.keys()
+            assert cache.get("b") is None and (cache.hits, cache.misses) == (1, 1)
+            print("✓ Least recently used entry evicted")
+            
+            assert not os.path.exists(path), "written synchronously"
+            time.sleep(0.4)
+            assert PersistentCache(path, max_entries=3).keys() == ["c", "a", "d"]
+            cache.delete("c")
+            assert cache.flush()
+            assert PersistentCache(path, max_entries=3).keys() == ["a", "d"]
+            print("✓ Changes batched and written in LRU order; flush() writes at once")
+            
+            expiring = TestCache(os.path.join(data_dir, "expiring.json"), ttl=0.2)
+            expiring.set("old", 1)
+            time.sleep(0.3)
+            expiring.set("new", 2)
+            assert expiring.peek("old") is None and expiring.get("old") is None
+            assert expiring.get("new") == 2
+            expiring.flush()
+            time.sleep(0.3)
+            assert PersistentCache(expiring.filepath, ttl=0.2).keys() == []
+            print("✓ Expired entries missed and dropped on load")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Persistent cache test failed: {e}")
+        return False
+
+
+def test_response_cache():
+    """Test exact and near-duplicate response cache hits."""
+    print("\nTesting response cache...")
+    
+    try:
+        import tempfile
+        import time
+        from Jarvis.response_cache import ResponseCache
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            cache = ResponseCache(os.path.join(data_dir, "responses.json"), threshold=0.8, ttl=0.5)
+            cache.set("How many moons does Jupiter have in total?", "95 known moons.")
+            assert cache.get("how many moons does jupiter have in total") == "95 known moons."
+            # 9 of the 11 shingles shared: similarity 0.82
+            assert cache.get("How many moons does Jupiter have?") == "95 known moons."
+            assert cache.get("How many moons does Saturn have?") is None
+            assert cache.stats()['hits'] == 1 and cache.stats()['near_hits'] == 1
+            assert cache.stats()['misses'] == 1
+            print("✓ Exact and near-duplicate hits; dissimilar query missed")
+            
+            strict = ResponseCache(os.path.join(data_dir, "strict.json"), threshold=0.9)
+            strict.set("How many moons does Jupiter have in total?", "95 known moons.")
+            assert strict.get("How many moons does Jupiter have?") is None
+            print("✓ Similarity threshold respected")
+            
+            time.sleep(0.6)
+            assert cache.get("How many moons does Jupiter have?") is None
+            assert not cache._signatures and not cache._buckets
+            print("✓ Expired entries missed and dropped from the index")
+            
+            class SmallCache(ResponseCache):
+                PRUNE_SLACK = 0
+            
+            small = SmallCache(os.path.join(data_dir, "small.json"), max_entries=5)
+            for i in range(20):
+                small.set(f"what is the population of city number {i}", f"{i} million")
+            assert len(small._signatures) == len(small.store) == 5
+            assert sum(len(bucket) for bucket in small._buckets.values()) == 5 * small.bands
+            assert small.get("what is the population of city number 19") == "19 million"
+            print("✓ Evicted entries pruned from the index")
+            for response_cache in (cache, strict, small):
+                response_cache.store.flush()
+        
+        return True
+    except Exception as e:
+        print(f"✗ Response cache test failed: {e}")
+        return False
+
+
+def test_storage():
+    """Test atomic JSON storage and its read cache."""
+    print("\nTesting storage...")
+    
+    try:
+        import json
+        import tempfile
+        from Jarvis import storage
+        from Jarvis.utils import load_json, save_json
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = os.path.join(data_dir, "nested", "items.json")
+            data = {"items": [{"id": i, "text": f"item {i} é"} for i in range(100)]}
+            assert save_json(path, data, durable=True)
+            assert load_json(path) == data
+            assert os.listdir(os.path.dirname(path)) == ["items.json"], "temp file left behind"
+            with open(path, encoding='utf-8') as f:
+                assert json.load(f) == data
+            print("✓ Atomic write, readable by the json module")
+            
+            # Callers get their own copy; an unchanged file is not reparsed
+            first = load_json(path)
+            first["items"].clear()
+            assert load_json(path) == data
+            assert storage.read_json(path) is not storage.read_json(path)
+            print("✓ Read cache returns independent copies")
+            
+            # Another writer replacing the file is noticed
+            with open(path, 'w') as f:
+                json.dump({"items": []}, f)
+            assert load_json(path) == {"items": []}
+            print("✓ Cache invalidated by external change")
+            
+            compact_path = os.path.join(data_dir, "cache.json")
+            save_json(compact_path, data, compact=True)
+            assert os.path.getsize(compact_path) < len(storage.dumps(data))
+            with open(compact_path, encoding='utf-8') as f:
+                assert "\n" not in f.read()
+            assert load_json(compact_path) == data
+            print("✓ Compact encoding")
+            
+            # A failed encode leaves the old file intact
+            assert not save_json(compact_path, {"bad": object()})
+            assert load_json(compact_path) == data
+            assert sorted(os.listdir(data_dir)) == ["cache.json", "nested"]
+            print("✓ Failed write keeps previous contents")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Storage test failed: {e}")
+        return False
+
+
+def test_journal():
+    """Test the append-only conversation journal."""
+    print("\nTesting journal...")
+    
+    try:
+        import tempfile
+        from Jarvis.journal import Journal
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = os.path.join(data_dir, "history", "turns.jsonl")
+            journal = Journal(path, keep_records=50, compact_bytes=4096)
+            assert journal.tail(5) == []
+            assert journal.append({'n': 0, 'text': "héllo"}, {'n': 1, 'text': "world"})
+            assert journal.tail(5) == [{'n': 0, 'text': "héllo"}, {'n': 1, 'text': "world"}]
+            
+            # An interrupted write leaves a torn line; it is skipped and terminated
+            with open(path, 'ab') as f:
+                f.write(b'{"n": 2, "te')
+            assert [r['n'] for r in journal.tail(5)] == [0, 1]
+            assert journal.append({'n': 3})
+            assert [r['n'] for r in journal.tail(5)] == [0, 1, 3]
+            print("✓ Records appended and read back; torn line skipped")
+            
+            for n in range(4, 400):
+                assert journal.append({'n': n, 'text': "x" * 20})
+            assert os.path.getsize(path) <= 4096 + 100
+            records = journal.tail(100)
+            assert [r['n'] for r in records][-1] == 399 and len(records) <= 100
+            assert sorted(os.listdir(os.path.dirname(path))) == ["turns.jsonl"]
+            print(f"✓ Compacted to the newest records ({os.path.getsize(path)} bytes)")
+            
+            class CountingJournal(Journal):
+                compactions = 0
+                
+                def _compact(self):
+                    CountingJournal.compactions += 1
+                    super()._compact()
+            
+            # The newest 50 records alone exceed compact_bytes
+            big_path = os.path.join(data_dir, "big.jsonl")
+            big = CountingJournal(big_path, keep_records=50, compact_bytes=4096)
+            for n in range(400):
+                assert big.append({'n': n, 'text': "y" * 200})
+            kept = len(big.tail(1000))
+            assert CountingJournal.compactions <= 12, CountingJournal.compactions
+            assert 50 <= kept <= 100 and big.tail(1) == [{'n': 399, 'text': "y" * 200}], kept
+            print(f"✓ Oversized records compacted {CountingJournal.compactions} times in 400 appends")
+            
+            class BrokenJournal(Journal):
+                def _compact(self):
+                    raise OSError("disk full")
+            
+            broken = BrokenJournal(path, keep_records=50, compact_bytes=10)
+            assert broken.append({'n': 400}), "append failed although the record was written"
+            assert journal.tail(1) == [{'n': 400}]
+            print("✓ Failed compaction does not fail the append")
+            
+            journal.clear()
+            assert journal.tail(5) == [] and not os.path.exists(path)
+        
+        return True
+    except Exception as e:
+        print(f"✗ Journal test failed: {e}")
+        return False
+
+
+def test_database():
+    """Test the SQLite backend and the JSON migration."""
+    print("\nTesting SQLite storage...")
+    
+    try:
+        import json
+        import tempfile
+        import time
+        from Jarvis.database import Database
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            reminders = [{'id': str(i), 'message': f'task {i}', 'time': f'2030-01-01T10:{i:02d}:00',
+                          'recurring': False, 'active': i % 2 == 0} for i in range(10)]
+            with open(os.path.join(data_dir, "reminders.json"), 'w') as f:
+                json.dump(reminders, f)
+            with open(os.path.join(data_dir, "conversation_history.jsonl"), 'w') as f:
+                for i in range(6):
+                    f.write(json.dumps({'role': 'user', 'content': f'hi {i}', 'timestamp': f'2030-01-01T00:00:0{i}'}) + "\n")
+                f.write('{"role": "user", "con')  # torn last line
+            with open(os.path.join(data_dir, "response_cache.json"), 'w') as f:
+                json.dump({'q': {'value': {'response': 'a'}, 'created': time.time(), 'used': time.time()}}, f)
+            
+            database = Database(os.path.join(data_dir, "jarvis.db"))
+            counts = database.migrate_json(data_dir)
+            assert counts == {'reminders': 10, 'turns': 6, 'cache_entries': 1}, counts
+            assert database.migrate_json(data_dir) == {}, "migration ran twice"
+            assert os.path.exists(os.path.join(data_dir, "reminders.json.migrated"))
+            assert database.query("PRAGMA journal_mode")[0][0] == 'wal'
+            assert database.load_reminders() == reminders
+            print(f"✓ Migrated JSON files once: {counts}")
+            
+            reminders[3]['active'] = True
+            database.save_reminder(reminders[3])
+            database.delete_reminder('0')
+            assert database.load_reminders() == reminders[1:]
+            assert database.has_active_reminders()
+            print("✓ Reminder rows updated in place, order kept")
+            
+            turns = database.turns(keep_records=8)
+            assert [t['content'] for t in turns.tail(2)] == ['hi 4', 'hi 5']
+            turns.append(*({'role': 'assistant', 'content': f'reply {i}', 'timestamp': ''} for i in range(4)))
+            assert len(turns.tail(100)) == 8 and turns.tail(1)[0]['content'] == 'reply 3'
+            print("✓ Conversation turns appended and pruned")
+            
+            cache = database.cache('response_cache', max_entries=2, ttl=60)
+            assert cache.get('q') == {'response': 'a'}
+            cache.set('r', 1)
+            cache.set('s', 2)
+            assert cache.keys() == ['r', 's'] and len(cache) == 2, cache.keys()
+            database.execute("UPDATE cache_entries SET created = 0 WHERE key = 's'")
+            assert cache.get('s') is None and cache.misses == 1 and len(cache) == 1
+            print("✓ Cache LRU eviction and expiry")
+            database.close()
+        
+        return True
+    except Exception as e:
+        print(f"✗ SQLite storage test failed: {e}")
+        return False
+
+
+def test_voice_catalog():
+    """Test the cached voice catalog and its indexes."""
+    print("\nTesting voice catalog...")
+    
+    try:
+        import json
+        import tempfile
+        from types import SimpleNamespace
+        from Jarvis.voice_catalog import VoiceCatalog
+        
+        engine_voices = [
+            SimpleNamespace(id="v0", name="Microsoft David - English (United States)", languages=["en_US"], gender="Male"),
+            SimpleNamespace(id="v1", name="Zira female", languages=[b"\x05en-gb"]),
+            SimpleNamespace(id="v2", name="Hortense male", languages=["fr_FR"]),
+            SimpleNamespace(id="v3", name="Anna female", languages=["de"]),
+        ]
+        enumerations = []
+        
+        def enumerate_voices():
+            enumerations.append(1)
+            return engine_voices
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = os.path.join(data_dir, "voice_catalog.json")
+            catalog = VoiceCatalog.load(enumerate_voices, driver="test", path=path)
+            assert catalog.by_gender == {'male': [0, 2], 'female': [1, 3]}, catalog.by_gender
+            assert catalog.for_language("en") == [0, 1] and catalog.for_language("en_GB") == [1]
+            assert catalog.for_gender("male", "fr") == [2, 0]
+            print("✓ Gender and language indexes built")
+            
+            again = VoiceCatalog.load(enumerate_voices, driver="test", path=path)
+            assert len(enumerations) == 1, "voices enumerated again"
+            assert again.voices == catalog.voices and again.by_language == catalog.by_language
+            print("✓ Saved catalog reused without enumerating")
+            
+            # No fingerprint for this driver, so age decides
+            with open(path) as f:
+                stored = json.load(f)
+            stored['created'] -= VoiceCatalog.MAX_AGE + 1
+            with open(path, 'w') as f:
+                json.dump(stored, f)
+            VoiceCatalog.load(enumerate_voices, driver="test", path=path)
+            VoiceCatalog.load(enumerate_voices, driver="other", path=path)
+            assert len(enumerations) == 3
+            print("✓ Stale or other-driver catalog enumerated again")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Voice catalog test failed: {e}")
+        return False
+
+
+def test_reminder_store():
+    """Test the indexed reminder store against a plain list."""
+    print("\nTesting reminder store...")
+    
+    try:
+        import random
+        from Jarvis.reminder_manager import ReminderStore
+        
+        rng = random.Random(7)
+        
+        def random_time():
+            return f"2030-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+        
+        reminders = [{'id': str(i), 'message': f'task {i}', 'time': random_time(), 'active': i % 3 != 0}
+                     for i in range(300)]
+        store = ReminderStore(dict(r) for r in reminders)
+        expected = {r['id']: dict(r) for r in reminders}
+        
+        def check():
+            active = [r for r in expected.values() if r['active']]
+            # Reactivated reminders move to the end of the active set
+            assert sorted(store.active(), key=lambda r: r['id']) == sorted(active, key=lambda r: r['id'])
+            assert store.active_count() == len(active)
+            soonest = sorted(active, key=lambda r: r['time'])[:10]
+            assert [r['time'] for r in store.next_due(10)] == [r['time'] for r in soonest]
+        
+        check()
+        assert store.get('5') == expected['5'] and store.get('missing') is None
+        print(f"✓ Indexed {len(store)} reminders")
+        
+        # Random changes, checked against the plain list after each one
+        for step in range(2000):
+            reminder_id = str(rng.randrange(400))
+            action = rng.random()
+            if action < 0.3:
+                reminder = {'id': reminder_id, 'message': 'new', 'time': random_time(), 'active': True}
+                expected.pop(reminder_id, None)
+                expected[reminder_id] = dict(reminder)
+                store.add(reminder)
+            elif action < 0.55:
+                active = rng.random() < 0.5
+                assert (store.set_active(reminder_id, active) is None) == (reminder_id not in expected)
+                if reminder_id in expected:
+                    expected[reminder_id]['active'] = active
+            elif action < 0.85:
+                new_time = random_time()
+                store.reschedule(reminder_id, new_time)
+                if reminder_id in expected:
+                    expected[reminder_id]['time'] = new_time
+            else:
+                assert (store.remove(reminder_id) is None) == (expected.pop(reminder_id, None) is None)
+            if step % 50 == 0:
+                check()
+        check()
+        assert len(store._heap) <= max(64, 2 * store.active_count()) + 1, "stale heap entries pile up"
+        print("✓ 2000 random changes match a plain list")
+        
+        # Recurring reminders are ordered by their next occurrence, not their first
+        from datetime import datetime, timedelta
+        now = datetime.now().replace(second=0, microsecond=0)
+        daily = {'id': 'daily', 'message': 'stretch', 'recurring': True, 'active': True,
+                 'time': (now + timedelta(hours=1) - timedelta(days=3)).isoformat()}
+        store = ReminderStore([
+            {'id': 'later', 'message': 'call', 'time': (now + timedelta(hours=30)).isoformat()},
+            {'id': 'soon', 'message': 'tea', 'time': (now + timedelta(hours=2)).isoformat()},
+            daily,
+        ])
+        assert [r['id'] for r in store.next_due(3)] == ['daily', 'soon', 'later']
+        assert [r['id'] for r in store.next_due(2, lambda r: (now + timedelta(hours=40)).isoformat())] == \
+            ['soon', 'later']
+        store.set_active('daily', False)
+        assert [r['id'] for r in store.next_due(3)] == ['soon', 'later']
+        print("✓ Recurring reminders ordered by next occurrence")
+        
+        # Scheduler threads change reminders while the main thread reads them
+        import threading
+        store = ReminderStore(dict(r) for r in reminders)
+        errors = []
+        
+        def writer(seed):
+            writer_rng = random.Random(seed)
+            try:
+                for _ in range(3000):
+                    reminder_id = str(writer_rng.randrange(300))
+                    if writer_rng.random() < 0.5:
+                        store.set_active(reminder_id, writer_rng.random() < 0.5)
+                    else:
+                        store.reschedule(reminder_id, random_time())
+            except Exception as e:
+                errors.append(e)
+        
+        writers = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+        for thread in writers:
+            thread.start()
+        while any(thread.is_alive() for thread in writers):
+            store.active()
+            store.next_due(5)
+        for thread in writers:
+            thread.join()
+        assert not errors, errors
+        assert store.active_count() == sum(1 for r in store.all() if r['active'])
+        print("✓ Concurrent changes and reads")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Reminder store test failed: {e}")
+        return False
+
+
+def test_voice_settings():
+    """Test that voice setting changes reach the engine on the speaking thread only."""
+    print("\nTesting voice settings...")
+    
+    try:
+        import threading
+        from Jarvis.config import config
+        from Jarvis.voice_catalog import VoiceCatalog
+        from Jarvis.voice_manager import VoiceManager
+    except ImportError as e:
+        print(f"○ Skipped ({e})")
+        return True
+    
+    class RecordingEngine:
+        """pyttsx3 engine recording which thread sets each property."""
+        def __init__(self):
+            self.calls = []
+        def setProperty(self, name, value):
+            self.calls.append((name, value, threading.current_thread().name))
+        def say(self, text):
+            pass
+        def runAndWait(self):
+            pass
+    
+    saved_voice = dict(config.config['voice'])
+    unsubscribe = None
+    try:
+        voice = VoiceManager.__new__(VoiceManager)
+        voice.engine = RecordingEngine()
+        voice.is_speaking = False
+        voice.catalog = VoiceCatalog([
+            {'id': i, 'voice': f"voice-{i}", 'name': f"Voice {i}", 'languages': ['en-us'], 'gender': 'female'}
+            for i in range(2)
+        ], {'driver': 'test', 'voice_set': None})
+        voice._settings_changed = threading.Event()
+        unsubscribe = config.subscribe(voice._on_config_change, 'voice')
+        
+        # A config file edit is reported on the file watcher's thread
+        config.config['voice'].update(rate=123, voice_id=0)
+        watcher = threading.Thread(target=config._notify, args=(['voice.rate', 'voice.voice_id'],),
+                                   name="jarvis-config-watcher")
+        watcher.start()
+        watcher.join()
+        assert not voice.engine.calls, "engine touched from the watcher thread"
+        voice.speak("hello")
+        main = threading.current_thread().name
+        assert ('rate', 123, main) in voice.engine.calls
+        assert ('voice', 'voice-0', main) in voice.engine.calls
+        print("✓ Reloaded settings applied by speak(), not the watcher thread")
+        
+        voice.engine.calls.clear()
+        assert voice.set_rate(140) and voice.set_volume(1.5)
+        assert not voice.engine.calls
+        voice.speak("hello")
+        assert [call[:2] for call in voice.engine.calls if call[0] == 'rate'] == [('rate', 140)]
+        assert ('volume', 1.0, main) in voice.engine.calls
+        voice.engine.calls.clear()
+        voice.speak("hello")
+        assert not voice.engine.calls, "unchanged settings applied again"
+        print("✓ set_rate/set_volume set each property once, before the next utterance")
+        return True
+    except Exception as e:
+        print(f"✗ Voice settings test failed: {e}")
+        return False
+    finally:
+        if unsubscribe:
+            unsubscribe()
+        for key, value in saved_voice.items():
+            config.set(f'voice.{key}', value)
+
+
 def test_system_control():
     """Test system control (read-only operations)."""
     print("\nTesting system control...")
@@ -216,9 +1724,31 @@ def main():
     results.append(("Imports", test_imports()))
     results.append(("Configuration", test_config()))
     results.append(("Utilities", test_utils()))
+    results.append(("Streaming Utilities", test_streaming_utils()))
+    results.append(("Tracing", test_tracing()))
     results.append(("Calculator", test_calculator()))
+    results.append(("Intent Router", test_intent_router()))
+    results.append(("Handler Registry", test_handler_registry()))
+    results.append(("AI Failover", test_ai_failover()))
+    results.append(("Local LLM", test_local_llm()))
+    results.append(("Barge-in", test_barge_in()))
+    results.append(("Speech Backends", test_speech_backends()))
+    results.append(("Continuous Listener", test_continuous_listener()))
+    results.append(("Barge-in Onset", test_barge_in_onset()))
+    results.append(("Voice Pipeline", test_voice_pipeline()))
+    results.append(("Bulk AI", test_bulk_ai()))
+    results.append(("Conversation Summary", test_conversation_summary()))
+    results.append(("Persistent Cache", test_persistent_cache()))
+    results.append(("Response Cache", test_response_cache()))
+    results.append(("Connection Warm-up", test_connection_warmer()))
+    results.append(("Storage", test_storage()))
+    results.append(("Journal", test_journal()))
+    results.append(("SQLite Storage", test_database()))
+    results.append(("Voice Catalog", test_voice_catalog()))
+    results.append(("Reminder Store", test_reminder_store()))
     results.append(("System Control", test_system_control()))
     results.append(("Voice Manager", test_voice_manager()))
+    results.append(("Voice Settings", test_voice_settings()))
     
     # Print summary
     print("\n" + "=" * 60)
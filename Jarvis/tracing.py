@@ -0,0 +1,115 @@
+"""Lightweight latency tracing for Jarvis AI Assistant."""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+from .config import config
+from .utils import percentile
+
+
+class RollingHistogram:
+    """Keeps the most recent samples of a duration plus lifetime totals."""
+
+    def __init__(self, window: int = 500):
+        """Initialize histogram with a sample window size."""
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        """Record one duration."""
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize the window in milliseconds (count and mean are lifetime)."""
+        window = [s * 1000 for s in self.samples]
+        return {
+            'count': self.count,
+            'mean': self.total / self.count * 1000 if self.count else 0.0,
+            'p50': percentile(window, 50),
+            'p90': percentile(window, 90),
+            'p99': percentile(window, 99),
+            'max': self.max * 1000,
+        }
+
+
+class Tracer:
+    """Collects named spans into rolling histograms.
+
+    Span names are dotted, e.g. ``stage.listen``, ``handler.weather`` or
+    ``http.news``, so a report can be grouped by prefix.
+    """
+
+    def __init__(self, window: int = 500, enabled: bool = True):
+        """Initialize tracer."""
+        self.window = window
+        self.enabled = enabled
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        """Record a duration for a span name."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram(self.window)
+            histogram.add(seconds)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block under the given name."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def summary(self, prefix: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Get per-span summaries, optionally filtered by name prefix."""
+        with self._lock:
+            items = list(self._histograms.items())
+        return {
+            name: histogram.summary()
+            for name, histogram in sorted(items)
+            if prefix is None or name.startswith(prefix)
+        }
+
+    def report(self, prefix: Optional[str] = None) -> str:
+        """Format the summaries as a table."""
+        summary = self.summary(prefix)
+        if not summary:
+            return "No spans recorded."
+        width = max(len(name) for name in summary) + 2
+        lines = [
+            f"{'span':<{width}}{'count':>7}{'mean ms':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+            "-" * (width + 57),
+        ]
+        for name, stats in summary.items():
+            lines.append(
+                f"{name:<{width}}{stats['count']:>7}{stats['mean']:>10.1f}{stats['p50']:>10.1f}"
+                f"{stats['p90']:>10.1f}{stats['p99']:>10.1f}{stats['max']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, prefix: Optional[str] = None):
+        """Print the report."""
+        print("\n" + self.report(prefix) + "\n")
+
+
+# Global tracer instance
+tracer = Tracer(
+    window=config.get('tracing.window', 500),
+    enabled=config.get('tracing.enabled', True)
+)
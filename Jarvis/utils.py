@@ -1,10 +1,11 @@
 """Utility functions for Jarvis AI Assistant."""
 
 import os
-import json
 import datetime
 import re
-from typing import Dict, List, Any, Optional
+import queue
+import threading
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator
 
 
 def get_greeting() -> str:
@@ -54,23 +55,27 @@ def sanitize_filename(filename: str) -> str:
 
 
 def load_json(filepath: str, default: Any = None) -> Any:
-    """Load JSON data from file."""
+    """Load JSON data from file (unchanged files are served from memory)."""
+    from .storage import read_json
     try:
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                return json.load(f)
+            return read_json(filepath)
         return default if default is not None else {}
     except Exception as e:
         print(f"Error loading {filepath}: {e}")
         return default if default is not None else {}
 
 
-def save_json(filepath: str, data: Any) -> bool:
-    """Save JSON data to file."""
+def save_json(filepath: str, data: Any, compact: bool = False, durable: bool = False) -> bool:
+    """Save JSON data to file atomically.
+
+    compact drops indentation for files people don't read; durable asks
+    for the data to be on disk before returning (see the storage.fsync
+    setting).
+    """
+    from .storage import write_json
     try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=4)
+        write_json(filepath, data, compact=compact, durable=durable)
         return True
     except Exception as e:
         print(f"Error saving {filepath}: {e}")
@@ -86,6 +91,17 @@ def format_bytes(bytes_val: int) -> str:
     return f"{bytes_val:.2f} PB"
 
 
+def percentile(values: List[float], pct: float) -> float:
+    """Get the pct-th percentile of values using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
 def parse_duration(text: str) -> Optional[int]:
     """Parse duration from text (e.g., '5 minutes', '2 hours')."""
     text = text.lower()
@@ -123,6 +139,94 @@ def truncate_text(text: str, max_length: int = 100) -> str:
     return text[:max_length - 3] + "..."
 
 
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*(?=\s)|\n+')
+_ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'prof', 'st', 'vs', 'etc', 'e.g', 'i.e', 'approx'}
+
+
+def iter_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-chunk streamed text into complete sentences as soon as each one ends."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        for match in _SENTENCE_END.finditer(buffer):
+            candidate = buffer[start:match.end()]
+            words = candidate.rstrip('.!?"\')] \n').split()
+            if match.group().startswith('.') and words and words[-1].lower() in _ABBREVIATIONS:
+                continue
+            sentence = candidate.strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def iter_in_background(iterable: Iterable, maxsize: int = 0, token=None) -> Iterator:
+    """Consume an iterable on a worker thread so the caller can work on earlier items.
+    
+    Exceptions raised by the iterable are re-raised in the caller. Cancelling
+    token (a CancellationToken) raises OperationCancelled in the caller at
+    once, even while the worker is still blocked waiting for the next item.
+    Once cancelled, or once the caller stops iterating, the worker stops
+    after its current item and closes the iterable.
+    """
+    items = queue.Queue(maxsize=maxsize)
+    done = object()
+    stopped = threading.Event()
+    
+    def on_cancel():
+        stopped.set()
+        try:
+            # Wake a caller blocked on an empty queue; a full one wakes it anyway
+            items.put_nowait((done, None))
+        except queue.Full:
+            pass
+    
+    unregister = token.on_cancel(on_cancel) if token else None
+    
+    def put(entry) -> bool:
+        """Queue an entry unless the caller has stopped; never blocks for good."""
+        while not stopped.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    break
+            else:
+                put((done, None))
+        except BaseException as e:
+            put((done, e))
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close:
+                close()
+    
+    threading.Thread(target=produce, name="jarvis-prefetch", daemon=True).start()
+    try:
+        while True:
+            item, error = items.get()
+            if stopped.is_set() and token:
+                token.raise_if_cancelled()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+        if unregister:
+            unregister()
+
+
 def get_platform() -> str:
     """Get the current platform."""
     import platform
@@ -144,6 +248,44 @@ def is_mac() -> bool:
     return get_platform() == "darwin"
 
 
+class LazyObject:
+    """Proxy that builds the wrapped object on first attribute access.
+    
+    Used for module-level singletons whose construction is slow (TTS engine
+    setup, API clients, heavy third-party imports), so importing Jarvis stays
+    fast and each component is only paid for when it is actually used.
+    """
+    
+    def __init__(self, factory: Callable[[], Any]):
+        """Initialize proxy with a zero-argument factory."""
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+    
+    def _get_instance(self) -> Any:
+        """Create the wrapped object if needed and return it."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    object.__setattr__(self, '_instance', self._factory())
+        return self._instance
+    
+    def is_loaded(self) -> bool:
+        """Check if the wrapped object has been created."""
+        return self._instance is not None
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_instance(), name)
+    
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._get_instance(), name, value)
+    
+    def __repr__(self) -> str:
+        if self.is_loaded():
+            return repr(self._instance)
+        return f"<LazyObject {self._factory!r} (not loaded)>"
+
+
 class ColorText:
     """ANSI color codes for terminal output."""
     RED = '\033[91m'
@@ -0,0 +1,193 @@
+"""Cached catalog of text-to-speech voices for Jarvis AI Assistant.
+
+Asking pyttsx3 for its voices can take seconds on some drivers, so the list
+is saved under Jarvis/data with gender and language indexes. The catalog is
+keyed by the TTS driver and a cheap fingerprint of the installed voices
+(registry keys on Windows, voice directories elsewhere); voices are only
+enumerated again when either changes, or, where no fingerprint is
+available, once the catalog is older than MAX_AGE.
+"""
+
+import hashlib
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .tracing import tracer
+from .utils import load_json, save_json
+
+# Where each pyttsx3 driver finds its voices
+_VOICE_DIRS = {
+    'nsss': ["/System/Library/Speech/Voices", "/Library/Speech/Voices",
+             os.path.expanduser("~/Library/Speech/Voices")],
+    'espeak': ["/usr/share/espeak-ng-data", "/usr/lib/x86_64-linux-gnu/espeak-ng-data",
+               "/usr/lib/aarch64-linux-gnu/espeak-ng-data", "/usr/local/share/espeak-ng-data",
+               "/usr/share/espeak-data"],
+}
+_SAPI_TOKENS = r"SOFTWARE\Microsoft\Speech\Voices\Tokens"
+
+
+def default_driver() -> str:
+    """Name of the driver pyttsx3.init() picks on this platform."""
+    if sys.platform == 'win32':
+        return 'sapi5'
+    if sys.platform == 'darwin':
+        return 'nsss'
+    return 'espeak'
+
+
+def voice_set_fingerprint(driver: str) -> Optional[str]:
+    """Hash of the installed voices without asking the TTS engine, or None."""
+    entries = []
+    if driver == 'sapi5':
+        try:
+            import winreg
+
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, _SAPI_TOKENS) as key:
+                count = winreg.QueryInfoKey(key)[0]
+                entries = sorted(winreg.EnumKey(key, i) for i in range(count))
+        except (ImportError, OSError):
+            return None
+    else:
+        # Adding or removing a voice changes the modification time of its directory
+        for root in _VOICE_DIRS.get(driver, []):
+            for directory, _, _ in os.walk(root):
+                try:
+                    entries.append(f"{directory}:{os.stat(directory).st_mtime_ns}")
+                except OSError:
+                    continue
+        if not entries:
+            return None
+    return hashlib.sha1("\n".join(entries).encode('utf-8')).hexdigest()
+
+
+def normalize_language(language: Any) -> str:
+    """Language tag as lowercase 'en-us' (espeak reports bytes like b'\\x05en-us')."""
+    if isinstance(language, bytes):
+        language = language.decode('utf-8', 'ignore')
+    language = "".join(ch for ch in str(language) if ch.isprintable())
+    return language.strip().lower().replace('_', '-')
+
+
+def voice_gender(name: str, gender: Optional[str] = None) -> str:
+    """Gender reported by the driver, else guessed from the voice name."""
+    if gender and str(gender).lower() in ('male', 'female'):
+        return str(gender).lower()
+    name = name.lower()
+    # Check "female" first: "male" is a substring of it
+    if 'female' in name:
+        return 'female'
+    if 'male' in name:
+        return 'male'
+    return 'female'
+
+
+class VoiceCatalog:
+    """Installed voices with indexes by gender and language.
+
+    voices[i] is {'id': i, 'voice': engine voice id, 'name', 'languages',
+    'gender'}; the position is the voice_id stored in config.
+    """
+
+    CATALOG_FILE = os.path.join(os.path.dirname(__file__), "data", "voice_catalog.json")
+    MAX_AGE = 7 * 86400  # Seconds, when the voice set cannot be fingerprinted
+
+    def __init__(self, voices: List[Dict[str, Any]], key: Dict[str, Optional[str]],
+                 created: Optional[float] = None, by_gender: Optional[Dict[str, List[int]]] = None,
+                 by_language: Optional[Dict[str, List[int]]] = None):
+        """Initialize catalog, building the indexes unless they are given."""
+        self.voices = voices
+        self.key = key
+        self.created = time.time() if created is None else created
+        if by_gender is None or by_language is None:
+            by_gender, by_language = self._build_indexes(voices)
+        self.by_gender = by_gender
+        self.by_language = by_language
+
+    @staticmethod
+    def _build_indexes(voices: List[Dict[str, Any]]):
+        """Voice ids by gender and by language tag."""
+        by_gender: Dict[str, List[int]] = {}
+        by_language: Dict[str, List[int]] = {}
+        for voice in voices:
+            by_gender.setdefault(voice['gender'], []).append(voice['id'])
+            tags = set()
+            for language in voice['languages']:
+                # Index "en-us" under "en" as well
+                tags.update((language, language.split('-')[0]))
+            for tag in sorted(tags):
+                by_language.setdefault(tag, []).append(voice['id'])
+        return by_gender, by_language
+
+    @classmethod
+    def from_engine_voices(cls, engine_voices: Iterable, key: Dict[str, Optional[str]]) -> "VoiceCatalog":
+        """Build a catalog from pyttsx3 Voice objects."""
+        voices = []
+        for i, voice in enumerate(engine_voices):
+            voices.append({
+                'id': i,
+                'voice': voice.id,
+                'name': voice.name,
+                'languages': [normalize_language(language) for language in (voice.languages or [])],
+                'gender': voice_gender(voice.name, getattr(voice, 'gender', None)),
+            })
+        return cls(voices, key)
+
+    @classmethod
+    def load(cls, enumerate_voices: Callable[[], Iterable], driver: Optional[str] = None,
+             path: Optional[str] = None, max_age: Optional[float] = None) -> "VoiceCatalog":
+        """Saved catalog if still current, otherwise enumerate_voices() and save the result."""
+        path = path or cls.CATALOG_FILE
+        driver = driver or default_driver()
+        key = {'driver': driver, 'voice_set': voice_set_fingerprint(driver)}
+        stored = load_json(path, {})
+        if cls._is_current(stored, key, cls.MAX_AGE if max_age is None else max_age):
+            return cls(stored['voices'], key, stored.get('created'), stored.get('by_gender'),
+                       stored.get('by_language'))
+        return cls.enumerate(enumerate_voices, key, path)
+
+    @classmethod
+    def enumerate(cls, enumerate_voices: Callable[[], Iterable], key: Dict[str, Optional[str]],
+                  path: Optional[str] = None) -> "VoiceCatalog":
+        """Ask the engine for its voices and save the new catalog."""
+        with tracer.span('voice.enumerate'):
+            catalog = cls.from_engine_voices(enumerate_voices() or [], key)
+        catalog.save(path or cls.CATALOG_FILE)
+        return catalog
+
+    @staticmethod
+    def _is_current(stored: Dict, key: Dict[str, Optional[str]], max_age: float) -> bool:
+        """Check a saved catalog against the current driver and voice set."""
+        if not stored.get('voices') or stored.get('key') != key:
+            return False
+        if key['voice_set'] is None:
+            return time.time() - stored.get('created', 0) < max_age
+        return True
+
+    def save(self, path: str):
+        """Write the catalog, indexes included, for the next start."""
+        save_json(path, {
+            'key': self.key,
+            'created': self.created,
+            'voices': self.voices,
+            'by_gender': self.by_gender,
+            'by_language': self.by_language,
+        }, compact=True)
+
+    def for_gender(self, gender: str, language: Optional[str] = None) -> List[int]:
+        """Voice ids of a gender, those speaking language first."""
+        ids = self.by_gender.get(gender.lower(), [])
+        if not language:
+            return list(ids)
+        preferred = set(self.for_language(language))
+        return [i for i in ids if i in preferred] + [i for i in ids if i not in preferred]
+
+    def for_language(self, language: str) -> List[int]:
+        """Voice ids speaking language ("en" or "en-us")."""
+        return list(self.by_language.get(normalize_language(language), []))
+
+    def __len__(self) -> int:
+        return len(self.voices)
+
+    def __getitem__(self, voice_id: int) -> Dict[str, Any]:
+        return self.voices[voice_id]
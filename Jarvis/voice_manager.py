@@ -1,8 +1,12 @@
 """Voice management for Jarvis AI Assistant."""
 
-import pyttsx3
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Set
+from .cancellation import CancellationToken
 from .config import config
+from .tracing import tracer
+from .utils import LazyObject
+from .voice_catalog import VoiceCatalog, default_driver
 
 
 class VoiceManager:
@@ -10,44 +14,89 @@ class VoiceManager:
     
     def __init__(self):
         """Initialize voice engine."""
+        import pyttsx3
+        
         self.engine = pyttsx3.init()
-        self.voices = self.engine.getProperty('voices')
+        self.is_speaking = False
+        # Saved voice list; the engine is only asked again when voices change
+        self.catalog = VoiceCatalog.load(self._enumerate_voices, default_driver())
+        self._settings_changed = threading.Event()
         self._load_voice_config()
+        config.subscribe(self._on_config_change, 'voice')
+    
+    def _on_config_change(self, changed: Set[str]):
+        """Mark the voice settings for reloading before the next utterance.
+        
+        Subscribers run on whichever thread changed the config (the file
+        watcher, a command handler); pyttsx3 engines are not thread-safe
+        (SAPI5 holds COM objects), so only speak() touches the engine.
+        """
+        self._settings_changed.set()
+    
+    def _enumerate_voices(self) -> list:
+        """Ask the engine for its voices (slow on some drivers)."""
+        return self.engine.getProperty('voices')
+    
+    def refresh_voices(self) -> int:
+        """Enumerate the installed voices again; returns how many there are."""
+        self.catalog = VoiceCatalog.enumerate(self._enumerate_voices, self.catalog.key)
+        return len(self.catalog)
     
     def _load_voice_config(self):
         """Load voice configuration."""
-        voice_id = config.get('voice.voice_id', 1)
-        rate = config.get('voice.rate', 150)
-        volume = config.get('voice.volume', 1.0)
+        settings = config.snapshot.voice
+        voice_id = settings.voice_id
+        rate = settings.rate
+        volume = settings.volume
         
         # Set voice
-        if 0 <= voice_id < len(self.voices):
-            self.engine.setProperty('voice', self.voices[voice_id].id)
+        if 0 <= voice_id < len(self.catalog):
+            self.engine.setProperty('voice', self.catalog[voice_id]['voice'])
         
         # Set rate and volume
         self.engine.setProperty('rate', rate)
         self.engine.setProperty('volume', volume)
     
-    def speak(self, text: str) -> None:
-        """Speak the given text."""
+    def _apply_voice_config(self):
+        """Load changed voice settings into the engine on the speaking thread."""
+        if self._settings_changed.is_set():
+            self._settings_changed.clear()
+            self._load_voice_config()
+    
+    def speak(self, text: str, token: Optional[CancellationToken] = None) -> None:
+        """Speak the given text, stopping mid-utterance if token is cancelled."""
+        if token and token.cancelled:
+            return
+        self.is_speaking = True
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
+            with tracer.span('stage.speak'):
+                self._apply_voice_config()
+                self.engine.say(text)
+                if token is None:
+                    self.engine.runAndWait()
+                    return
+                # The engine can only be stopped safely from its own callbacks,
+                # so the token is checked at every word boundary
+                def stop_if_cancelled(name=None, location=None, length=None):
+                    if token.cancelled:
+                        self.engine.stop()
+                
+                callback = self.engine.connect('started-word', stop_if_cancelled)
+                try:
+                    self.engine.runAndWait()
+                finally:
+                    self.engine.disconnect(callback)
         except Exception as e:
             print(f"Error speaking: {e}")
+        finally:
+            self.is_speaking = False
     
     def get_available_voices(self) -> List[Dict[str, str]]:
         """Get list of available voices."""
-        voice_list = []
-        for i, voice in enumerate(self.voices):
-            voice_info = {
-                'id': i,
-                'name': voice.name,
-                'languages': voice.languages,
-                'gender': 'male' if 'male' in voice.name.lower() else 'female'
-            }
-            voice_list.append(voice_info)
-        return voice_list
+        return [
+            {'id': voice['id'], 'name': voice['name'], 'languages': voice['languages'], 'gender': voice['gender']}
+            for voice in self.catalog.voices
+        ]
     
     def list_voices(self) -> str:
         """List all available voices."""
@@ -58,104 +107,74 @@ class VoiceManager:
         return result
     
     def set_voice(self, voice_id: int) -> bool:
-        """Set voice by ID."""
-        try:
-            if 0 <= voice_id < len(self.voices):
-                self.engine.setProperty('voice', self.voices[voice_id].id)
-                config.set('voice.voice_id', voice_id)
-                return True
-            return False
-        except Exception as e:
-            print(f"Error setting voice: {e}")
-            return False
+        """Set voice by ID; used from the next utterance on."""
+        if 0 <= voice_id < len(self.catalog):
+            return config.set('voice.voice_id', voice_id)
+        return False
     
     def set_voice_by_gender(self, gender: str) -> bool:
-        """Set voice by gender (male/female)."""
-        gender = gender.lower()
-        for i, voice in enumerate(self.voices):
-            voice_gender = 'male' if 'male' in voice.name.lower() else 'female'
-            if voice_gender == gender:
-                return self.set_voice(i)
-        return False
+        """Set voice by gender (male/female), preferring the configured language."""
+        voice_ids = self.catalog.for_gender(gender, config.snapshot.voice.language)
+        return self.set_voice(voice_ids[0]) if voice_ids else False
     
     def cycle_voice(self, gender: Optional[str] = None) -> int:
         """Cycle to next voice, optionally filtering by gender."""
-        current_voice_id = config.get('voice.voice_id', 0)
-        voices = self.get_available_voices()
+        current_voice_id = config.snapshot.voice.voice_id
+        if not len(self.catalog):
+            return current_voice_id
         
         if gender:
-            gender = gender.lower()
-            # Filter voices by gender
-            filtered_voices = [v for v in voices if v['gender'] == gender]
-            if not filtered_voices:
+            voice_ids = self.catalog.for_gender(gender)
+            if not voice_ids:
                 return current_voice_id
             
-            # Find current index in filtered list
-            current_idx = 0
-            for i, v in enumerate(filtered_voices):
-                if v['id'] == current_voice_id:
-                    current_idx = i
-                    break
-            
-            # Get next voice
-            next_idx = (current_idx + 1) % len(filtered_voices)
-            next_voice_id = filtered_voices[next_idx]['id']
+            # Next voice of that gender after the current one
+            current_idx = voice_ids.index(current_voice_id) if current_voice_id in voice_ids else -1
+            next_voice_id = voice_ids[(current_idx + 1) % len(voice_ids)]
         else:
             # Cycle through all voices
-            next_voice_id = (current_voice_id + 1) % len(voices)
+            next_voice_id = (current_voice_id + 1) % len(self.catalog)
         
         self.set_voice(next_voice_id)
         return next_voice_id
     
     def set_rate(self, rate: int) -> bool:
-        """Set speech rate."""
-        try:
-            self.engine.setProperty('rate', rate)
-            config.set('voice.rate', rate)
-            return True
-        except Exception as e:
-            print(f"Error setting rate: {e}")
-            return False
+        """Set speech rate; used from the next utterance on."""
+        return config.set('voice.rate', rate)
     
     def adjust_rate(self, adjustment: int) -> int:
         """Adjust speech rate by given amount."""
-        current_rate = config.get('voice.rate', 150)
+        current_rate = config.snapshot.voice.rate
         new_rate = max(50, min(300, current_rate + adjustment))
         self.set_rate(new_rate)
         return new_rate
     
     def set_volume(self, volume: float) -> bool:
-        """Set volume (0.0 to 1.0)."""
-        try:
-            volume = max(0.0, min(1.0, volume))
-            self.engine.setProperty('volume', volume)
-            config.set('voice.volume', volume)
-            return True
-        except Exception as e:
-            print(f"Error setting volume: {e}")
-            return False
+        """Set volume (0.0 to 1.0); used from the next utterance on."""
+        return config.set('voice.volume', max(0.0, min(1.0, volume)))
     
     def adjust_volume(self, adjustment: float) -> float:
         """Adjust volume by given amount."""
-        current_volume = config.get('voice.volume', 1.0)
+        current_volume = config.snapshot.voice.volume
         new_volume = max(0.0, min(1.0, current_volume + adjustment))
         self.set_volume(new_volume)
         return new_volume
     
     def get_current_voice_info(self) -> Dict[str, any]:
         """Get information about current voice."""
-        voice_id = config.get('voice.voice_id', 0)
-        if 0 <= voice_id < len(self.voices):
-            voice = self.voices[voice_id]
+        settings = config.snapshot.voice
+        voice_id = settings.voice_id
+        if 0 <= voice_id < len(self.catalog):
+            voice = self.catalog[voice_id]
             return {
                 'id': voice_id,
-                'name': voice.name,
-                'languages': voice.languages,
-                'rate': config.get('voice.rate', 150),
-                'volume': config.get('voice.volume', 1.0)
+                'name': voice['name'],
+                'languages': voice['languages'],
+                'rate': settings.rate,
+                'volume': settings.volume
             }
         return {}
 
 
-# Global voice manager instance
-voice_manager = VoiceManager()
+# Global voice manager instance (the TTS engine starts on first use)
+voice_manager = LazyObject(VoiceManager)
@@ -1,8 +1,11 @@
 """Weather module for Jarvis AI Assistant."""
 
-import requests
 from typing import Optional, Dict
+from .cancellation import CancellationToken, OperationCancelled, run_cancellable
 from .config import config
+from .network import get_session
+from .tracing import tracer
+from .utils import LazyObject
 
 
 class WeatherHandler:
@@ -13,7 +16,17 @@ class WeatherHandler:
         self.api_key = config.get_api_key('openweather')
         self.base_url = "https://api.openweathermap.org/data/2.5"
     
-    def get_current_weather(self, city: str, units: str = "metric") -> Optional[Dict]:
+    def _get_json(self, endpoint: str, params: Dict, token: Optional[CancellationToken] = None) -> Dict:
+        """Perform a GET request and return the decoded JSON body.
+        
+        Raises OperationCancelled as soon as token is cancelled.
+        """
+        with tracer.span('http.weather'):
+            response = run_cancellable(get_session().get, endpoint, params=params, timeout=10, token=token)
+            response.raise_for_status()
+            return response.json()
+    
+    def get_current_weather(self, city: str, units: str = "metric", token: Optional[CancellationToken] = None) -> Optional[Dict]:
         """Get current weather for a city."""
         if not self.api_key:
             return None
@@ -26,10 +39,7 @@ class WeatherHandler:
                 'units': units
             }
             
-            response = requests.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(endpoint, params, token)
             
             return {
                 'city': data.get('name'),
@@ -42,11 +52,13 @@ class WeatherHandler:
                 'wind_speed': data.get('wind', {}).get('speed'),
                 'clouds': data.get('clouds', {}).get('all')
             }
+        except OperationCancelled:
+            raise
         except Exception as e:
             print(f"Error fetching weather: {e}")
             return None
     
-    def get_forecast(self, city: str, days: int = 3, units: str = "metric") -> Optional[Dict]:
+    def get_forecast(self, city: str, days: int = 3, units: str = "metric", token: Optional[CancellationToken] = None) -> Optional[Dict]:
         """Get weather forecast for a city."""
         if not self.api_key:
             return None
@@ -60,10 +72,7 @@ class WeatherHandler:
                 'cnt': days * 8  # API returns data every 3 hours
             }
             
-            response = requests.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(endpoint, params, token)
             
             forecasts = []
             for item in data.get('list', [])[:days * 8:8]:  # Take one per day
@@ -79,6 +88,8 @@ class WeatherHandler:
                 'country': data.get('city', {}).get('country'),
                 'forecasts': forecasts
             }
+        except OperationCancelled:
+            raise
         except Exception as e:
             print(f"Error fetching forecast: {e}")
             return None
@@ -93,7 +104,7 @@ class WeatherHandler:
         description = weather.get('description', 'unknown')
         humidity = weather.get('humidity', 0)
         
-        units = config.get('preferences.temperature_unit', 'celsius')
+        units = config.snapshot.preferences.temperature_unit
         temp_unit = '°C' if units == 'celsius' else '°F'
         
         result = f"The weather in {city} is {description}. "
@@ -108,4 +119,4 @@ class WeatherHandler:
 
 
 # Global weather handler instance
-weather_handler = WeatherHandler()
+weather_handler = LazyObject(WeatherHandler)
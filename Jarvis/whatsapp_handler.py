@@ -1,9 +1,8 @@
 """WhatsApp automation for Jarvis AI Assistant."""
 
-import pywhatkit
 from datetime import datetime, timedelta
 from typing import Optional
-from .utils import extract_number
+from .utils import extract_number, LazyObject
 
 
 class WhatsAppHandler:
@@ -26,6 +25,8 @@ class WhatsAppHandler:
             if not phone_number.startswith('+'):
                 phone_number = '+' + phone_number
             
+            import pywhatkit
+            
             pywhatkit.sendwhatmsg(phone_number, message, hour, minute, wait_time=15, tab_close=True)
             return True
         except Exception as e:
@@ -39,6 +40,8 @@ class WhatsAppHandler:
             if not phone_number.startswith('+'):
                 phone_number = '+' + phone_number
             
+            import pywhatkit
+            
             pywhatkit.sendwhatmsg_instantly(phone_number, message, wait_time=15, tab_close=True)
             return True
         except Exception as e:
@@ -54,6 +57,8 @@ class WhatsAppHandler:
                 hour = now.hour
                 minute = now.minute
             
+            import pywhatkit
+            
             pywhatkit.sendwhatmsg_to_group(group_id, message, hour, minute, wait_time=15, tab_close=True)
             return True
         except Exception as e:
@@ -75,5 +80,5 @@ class WhatsAppHandler:
             return False
 
 
-# Global WhatsApp handler instance
-whatsapp_handler = WhatsAppHandler()
+# Global WhatsApp handler instance (pywhatkit opens a browser session on import)
+whatsapp_handler = LazyObject(WhatsAppHandler)
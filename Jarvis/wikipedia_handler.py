@@ -0,0 +1,71 @@
+"""Wikipedia lookups for Jarvis AI Assistant."""
+
+import os
+import re
+from typing import Dict, Optional
+from .cache import open_cache
+from .cancellation import CancellationToken, OperationCancelled, run_cancellable
+from .config import config
+from .tracing import tracer
+from .utils import LazyObject
+
+
+class WikipediaHandler:
+    """Fetches Wikipedia summaries through a persistent cache.
+
+    Results are cached by normalized query, including ambiguous queries, so
+    a repeated question is answered without touching the network.
+    """
+
+    CACHE_FILE = os.path.join(os.path.dirname(__file__), "data", "wikipedia_cache.json")
+
+    def __init__(self):
+        """Initialize Wikipedia handler."""
+        self.sentences = config.get('wikipedia.sentences', 2)
+        self.cache = open_cache(
+            self.CACHE_FILE,
+            max_entries=config.get('wikipedia.cache_size', 500),
+            ttl=config.get('wikipedia.cache_ttl_hours', 168) * 3600
+        )
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a query so trivially different phrasings share a cache entry."""
+        return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+    def get_summary(self, query: str, token: Optional[CancellationToken] = None) -> Dict:
+        """Look up a topic.
+
+        Returns {'type': 'summary', 'text': ...}, {'type': 'disambiguation',
+        'options': [...]} or {'type': 'error'} when the lookup failed. Raises
+        OperationCancelled if token is cancelled during the request.
+        """
+        key = self.normalize_query(query)
+        if not key:
+            return {'type': 'error'}
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        import wikipedia
+
+        try:
+            with tracer.span('http.wikipedia'):
+                text = run_cancellable(wikipedia.summary, query, sentences=self.sentences, token=token)
+                result = {'type': 'summary', 'text': text}
+        except wikipedia.exceptions.DisambiguationError as e:
+            result = {'type': 'disambiguation', 'options': list(e.options[:5])}
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            # Network and missing-page errors are not cached so they can be retried
+            print(f"Error searching Wikipedia: {e}")
+            return {'type': 'error'}
+
+        self.cache.set(key, result)
+        return result
+
+
+# Global Wikipedia handler instance
+wikipedia_handler = LazyObject(WikipediaHandler)